@@ -2,13 +2,17 @@ import os
 from flask import Flask, jsonify, request
 from .config import config
 from .extensions import db, jwt, cors, migrate, mail
+from .common.passwords import HashingBusy
 
-def create_app(config_name=None):
+def create_app(config_name=None, overrides=None):
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'default')
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    # Applied before the extensions read the config (benchmarks point testing at a file DB)
+    if overrides:
+        app.config.update(overrides)
     
     # Disable strict slashes to prevent redirects that break CORS preflight
     app.url_map.strict_slashes = False
@@ -25,10 +29,25 @@ def create_app(config_name=None):
     def invalid_token_callback(error):
         return jsonify({"message": "Signature verification failed", "error": "invalid_token"}), 401
 
+    @jwt.token_in_blocklist_loader
+    def check_token_version(jwt_header, jwt_payload):
+        from .common.auth import is_token_revoked
+        return is_token_revoked(jwt_payload)
+
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return jsonify({"message": "Token has been revoked", "error": "token_revoked"}), 401
+
     @jwt.unauthorized_loader
     def missing_token_callback(error):
         return jsonify({"message": "Request does not contain an access token", "error": "authorization_required"}), 401
     
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(error):
+        response = jsonify({"message": "Server busy, please retry shortly", "error": "server_busy"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     # CORS Configuration - Must be configured properly for preflight requests
     cors.init_app(app, 
         resources={
@@ -49,9 +68,13 @@ def create_app(config_name=None):
     from .modules.auth.routes import auth_bp
     from .modules.assets.routes import assets_bp
     from .modules.reports.routes import reports_bp
-    from .modules.work_orders.routes import work_orders_bp
+    from .modules.work_orders.routes import work_orders_bp, workload_cli
     from .modules.users.routes import users_bp
     from .modules.push.routes import push_bp
+    from .modules.dashboard.routes import dashboard_bp
+    from .modules.sync.routes import sync_bp, sync_cli
+    from .modules.search.routes import search_bp
+    from .modules.analytics.routes import analytics_bp, analytics_cli
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(assets_bp, url_prefix='/api/assets')
@@ -59,10 +82,27 @@ def create_app(config_name=None):
     app.register_blueprint(work_orders_bp, url_prefix='/api/work-orders')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(push_bp, url_prefix='/api/push')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.cli.add_command(sync_cli)
+    app.cli.add_command(workload_cli)
+    app.cli.add_command(analytics_cli)
+
+    # Notification outbox worker
+    from .modules.notifications.worker import init_app as init_notification_worker
+    init_notification_worker(app)
+
+    # Per-route latency, SQL and payload metrics
+    from .common.metrics import init_app as init_metrics
+    init_metrics(app, db)
+    from .common.query_guard import init_app as init_query_guard
+    init_query_guard(app, db)
 
     # Initialize SocketIO
-    from .socket_extensions import socketio
-    socketio.init_app(app)
+    from .socket_extensions import init_app as init_socketio
+    init_socketio(app)
 
     @app.route('/api/health')
     def health():
@@ -0,0 +1,83 @@
+"""
+Request-scoped access to the authenticated user
+Role and active status travel as signed JWT claims so authorization does not hit the database.
+Changing a user's role or active flag bumps users.token_version, which revokes older tokens.
+"""
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from app.common.cache import TTLCache
+from app.extensions import db
+from app.modules.users.models import User
+
+# user_id -> token_version. Entries are dropped locally on every bump and expire
+# after TOKEN_VERSION_CACHE_TTL so other worker processes converge quickly.
+_token_versions = TTLCache(ttl=60)
+
+
+def build_token_claims(user):
+    """Additional claims signed into every access token"""
+    return {
+        'role': user.role,
+        'active': bool(user.is_active),
+        'ver': user.token_version or 0
+    }
+
+
+def get_current_user_id():
+    return int(get_jwt_identity())
+
+
+def get_current_user():
+    """User for the current JWT, loaded at most once per request"""
+    user_id = get_current_user_id()
+    cached = g.get('_mafis_current_user')
+    if cached is None or cached[0] != user_id:
+        cached = (user_id, db.session.get(User, user_id))
+        g._mafis_current_user = cached
+    return cached[1]
+
+
+def get_current_role():
+    """Role of the current user, read from the token claims when present"""
+    claims = get_jwt()
+    if 'role' in claims:
+        return claims['role']
+
+    # Tokens issued before role claims existed
+    user = get_current_user()
+    return user.role if user else None
+
+
+def get_token_version(user_id):
+    """Current token version for a user, or None if the user no longer exists"""
+    return _token_versions.get_or_set(
+        user_id,
+        lambda: db.session.query(User.token_version).filter(User.id == user_id).scalar(),
+        ttl=current_app.config.get('TOKEN_VERSION_CACHE_TTL', 60)
+    )
+
+
+def bump_token_version(user):
+    """
+    Invalidate every token issued to user.
+    Caller commits the session and then calls forget_token_version(user.id).
+    """
+    user.token_version = (user.token_version or 0) + 1
+
+
+def forget_token_version(user_id):
+    """Drop the cached version so the next check reads the committed value"""
+    _token_versions.delete(user_id)
+
+
+def is_token_revoked(jwt_payload):
+    """Tokens are revoked once the user's version moves past the one they were signed with"""
+    if 'ver' not in jwt_payload:
+        # Tokens issued before version claims existed stay valid until they expire
+        return False
+
+    if not jwt_payload.get('active', True):
+        return True
+
+    current_version = get_token_version(int(jwt_payload['sub']))
+    return current_version is None or current_version != jwt_payload['ver']
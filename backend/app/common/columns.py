@@ -0,0 +1,7 @@
+"""Column types shared by the models"""
+from sqlalchemy.dialects import mysql
+from app.extensions import db
+
+# MySQL DATETIME keeps whole seconds; ETags and the sync cursor compare updated_at,
+# so two edits within one second must still store different values
+PRECISE_DATETIME = db.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
@@ -3,8 +3,7 @@ Common decorators for authorization and access control
 """
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import get_jwt_identity
-from app.modules.users.models import User
+from app.common.auth import get_current_role
 
 def admin_required(fn):
     """
@@ -13,13 +12,12 @@ def admin_required(fn):
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        role = get_current_role()
         
-        if not user:
+        if not role:
             return jsonify({'message': 'User not found'}), 404
             
-        if user.role != 'admin':
+        if role != 'admin':
             return jsonify({'message': 'Admin access required'}), 403
             
         return fn(*args, **kwargs)
@@ -34,15 +32,26 @@ def role_required(*allowed_roles):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            current_user_id = int(get_jwt_identity())
-            user = User.query.get(current_user_id)
+            role = get_current_role()
             
-            if not user:
+            if not role:
                 return jsonify({'message': 'User not found'}), 404
                 
-            if user.role not in allowed_roles:
+            if role not in allowed_roles:
                 return jsonify({'message': f'Access denied. Required roles: {", ".join(allowed_roles)}'}), 403
                 
             return fn(*args, **kwargs)
         return wrapper
     return decorator
+
+def query_budget(max_queries=None, allow_repeats=False):
+    """
+    Declare how many SQL statements a route may run per request.
+    Enforced by app.common.query_guard when QUERY_GUARD_ENABLED (always in testing).
+    Usage: @query_budget(3), or @query_budget(allow_repeats=True) for routes that
+    legitimately run one statement many times (chunked bulk writes).
+    """
+    def decorator(fn):
+        fn.query_budget = {'max_queries': max_queries, 'allow_repeats': allow_repeats}
+        return fn
+    return decorator
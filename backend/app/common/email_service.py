@@ -2,22 +2,144 @@
 Email notification service for MAFIS MVP
 Handles sending emails for various events in the system
 """
-from flask import current_app, render_template_string
+import queue
+import smtplib
+import threading
+from concurrent.futures import Future
+from flask import current_app
 from flask_mail import Message
 from app.extensions import mail
-from threading import Thread
+from app.common import email_templates as templates
 
 
-def send_async_email(app, msg):
-    """Send email asynchronously to avoid blocking the request"""
-    with app.app_context():
+class EmailSenderPool:
+    """
+    Bounded pool of sender threads that keep SMTP connections open between messages.
+
+    Each thread holds one mail.connect() session and sends every message it can pull
+    from the queue in a batch before waiting again, so a burst of N emails costs
+    `workers` TLS handshakes instead of N threads and N handshakes. Idle connections
+    are closed after MAIL_CONNECTION_IDLE_TIMEOUT seconds.
+    """
+
+    def __init__(self, app, workers=2, max_queue=1000, batch_size=20, idle_timeout=30):
+        self.app = app
+        self.workers = workers
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def submit(self, msg):
+        """
+        Queue a message and return a Future resolved once it is sent.
+        Raises queue.Full when the pool is saturated.
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put_nowait((msg, future))
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._run, name=f'email-sender-{len(self._threads)}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _next_batch(self):
+        """Block for one message, then take whatever else is already queued"""
+        batch = [self._queue.get(timeout=self.idle_timeout)]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        with self.app.app_context():
+            connection = None
+            while True:
+                try:
+                    batch = self._next_batch()
+                except queue.Empty:
+                    connection = self._close(connection)
+                    continue
+
+                for msg, future in batch:
+                    try:
+                        connection = self._send(connection, msg)
+                        future.set_result(True)
+                    except Exception as e:
+                        connection = self._close(connection)
+                        current_app.logger.error(f'Failed to send email: {str(e)}')
+                        future.set_exception(e)
+
+    def _send(self, connection, msg):
+        """Send on the open connection, reconnecting once if the server dropped it"""
+        if connection is None:
+            connection = self._open()
         try:
-            mail.send(msg)
-        except Exception as e:
-            current_app.logger.error(f'Failed to send email: {str(e)}')
+            connection.send(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._close(connection)
+            connection = self._open()
+            connection.send(msg)
+        return connection
+
+    def _open(self):
+        connection = mail.connect()
+        connection.__enter__()
+        return connection
+
+    def _close(self, connection):
+        if connection is not None:
+            try:
+                connection.__exit__(None, None, None)
+            except Exception:
+                pass
+        return None
+
+
+def get_sender_pool(app=None):
+    """Process-wide sender pool for the app, created on first use"""
+    app = app or current_app._get_current_object()
+    pool = app.extensions.get('email_sender_pool')
+    if pool is None:
+        pool = EmailSenderPool(
+            app,
+            workers=app.config.get('MAIL_SENDER_WORKERS', 2),
+            max_queue=app.config.get('MAIL_QUEUE_SIZE', 1000),
+            batch_size=app.config.get('MAIL_BATCH_SIZE', 20),
+            idle_timeout=app.config.get('MAIL_CONNECTION_IDLE_TIMEOUT', 30)
+        )
+        app.extensions['email_sender_pool'] = pool
+    return pool
+
+
+def get_email_queue_depth():
+    """Messages waiting for a sender connection"""
+    return get_sender_pool().queue_depth()
+
+
+def build_message(subject, recipients, text_body, html_body):
+    return Message(
+        subject=subject,
+        recipients=recipients if isinstance(recipients, list) else [recipients],
+        body=text_body,
+        html=html_body
+    )
 
 
-def send_email(subject, recipients, text_body, html_body):
+def send_email(subject, recipients, text_body, html_body, sync=False):
     """
     Send email with both text and HTML versions
     
@@ -26,17 +148,61 @@ def send_email(subject, recipients, text_body, html_body):
         recipients: List of recipient email addresses
         text_body: Plain text version
         html_body: HTML version
+        sync: Wait for delivery and raise on failure (outbox worker)
     """
-    msg = Message(
-        subject=subject,
-        recipients=recipients if isinstance(recipients, list) else [recipients],
-        body=text_body,
-        html=html_body
-    )
-    
-    # Send asynchronously
-    app = current_app._get_current_object()
-    Thread(target=send_async_email, args=(app, msg)).start()
+    send_messages([build_message(subject, recipients, text_body, html_body)], sync=sync)
+
+
+def send_rendered(rendered, recipients, sync=False):
+    """Send one RenderedEmail"""
+    send_email(rendered.subject, recipients, rendered.text, rendered.html, sync=sync)
+
+
+def send_messages(messages, sync=False):
+    """
+    Queue several messages at once; with sync, wait for all of them and
+    raise the first failure.
+    """
+    futures = []
+    for msg in messages:
+        try:
+            futures.append(get_sender_pool().submit(msg))
+        except queue.Full:
+            current_app.logger.error(f'Email queue full, dropping: {msg.subject}')
+            if sync:
+                raise
+
+    if sync:
+        timeout = current_app.config.get('MAIL_SEND_TIMEOUT', 60)
+        for future in futures:
+            future.result(timeout=timeout)
+
+
+def send_email_batch(messages):
+    """
+    Send several messages concurrently and wait for all of them.
+
+    Returns:
+        List of errors in input order; None where the message was sent.
+    """
+    timeout = current_app.config.get('MAIL_SEND_TIMEOUT', 60)
+    pending = []
+    for msg in messages:
+        try:
+            pending.append((get_sender_pool().submit(msg), None))
+        except queue.Full as e:
+            current_app.logger.error(f'Email queue full: {msg.subject}')
+            pending.append((None, e))
+
+    errors = []
+    for future, error in pending:
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                error = e
+        errors.append(error)
+    return errors
 
 
 # ============================================
@@ -45,133 +211,52 @@ def send_email(subject, recipients, text_body, html_body):
 
 def get_email_base_template(content):
     """Base HTML template for all emails"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 600px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f4f4f4;
-            }}
-            .container {{
-                background-color: white;
-                border-radius: 8px;
-                padding: 30px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .header {{
-                background: linear-gradient(135deg, #0066CC 0%, #00A651 100%);
-                color: white;
-                padding: 20px;
-                border-radius: 8px 8px 0 0;
-                text-align: center;
-                margin: -30px -30px 20px -30px;
-            }}
-            .header h1 {{
-                margin: 0;
-                font-size: 24px;
-            }}
-            .content {{
-                padding: 20px 0;
-            }}
-            .button {{
-                display: inline-block;
-                padding: 12px 24px;
-                background-color: #00A651;
-                color: white !important;
-                text-decoration: none;
-                border-radius: 4px;
-                margin: 20px 0;
-            }}
-            .footer {{
-                text-align: center;
-                margin-top: 30px;
-                padding-top: 20px;
-                border-top: 1px solid #eee;
-                color: #666;
-                font-size: 12px;
-            }}
-            .info-box {{
-                background-color: #f0f9ff;
-                border-left: 4px solid #0066CC;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-            .warning-box {{
-                background-color: #fef9c3;
-                border-left: 4px solid #f59e0b;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔧 MAFIS - SENA</h1>
-                <p style="margin: 5px 0 0 0; font-size: 14px;">Sistema de Gestión de Activos y Mantenimiento</p>
-            </div>
-            <div class="content">
-                {content}
-            </div>
-            <div class="footer">
-                <p>Este es un correo automático, por favor no responder.</p>
-                <p>© 2025 SENA - Centro de Formación. Todos los derechos reservados.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return templates.BASE_HEAD + content + templates.BASE_TAIL
 
 
 # ============================================
 # NOTIFICATION FUNCTIONS
 # ============================================
 
-def send_new_report_notification(report, requester):
-    """Notify admins when a new report is created"""
+def send_new_report_notification(report, requester, admins=None):
+    """
+    Notify admins (all active ones unless `admins` is given) when a new report
+    is created, one personalised email each, sent concurrently
+
+    Returns:
+        List of (admin, error) for the emails that failed, so the caller can retry them
+    """
     from app.modules.users.models import User
     
-    # Get all admin users who have email notifications enabled
-    admins = User.query.filter_by(role='admin', is_active=True).all()
-    admin_emails = [admin.email for admin in admins if getattr(admin, 'notify_email', True)]
+    if admins is None:
+        admins = User.query.filter_by(role='admin', is_active=True).all()
+    # Only admins with email notifications enabled
+    admins = [admin for admin in admins if admin.email and getattr(admin, 'notify_email', True)]
     
-    if not admin_emails:
-        return
+    if not admins:
+        return []
     
-    content = f"""
-        <h2>Nuevo Reporte de Falla</h2>
-        <p>Se ha creado un nuevo reporte en el sistema:</p>
-        
-        <div class="info-box">
-            <strong>ID del Reporte:</strong> #{report.id}<br>
-            <strong>Activo:</strong> {report.asset.name if report.asset else 'N/A'}<br>
-            <strong>Prioridad:</strong> <span style="color: {'#dc2626' if report.priority == 'HIGH' else '#f59e0b' if report.priority == 'MEDIUM' else '#6b7280'}">{report.priority}</span><br>
-            <strong>Solicitante:</strong> {requester.name} ({requester.email})<br>
-            <strong>Descripción:</strong> {report.description}
-        </div>
-        
-        <p>Por favor, revise el reporte y asigne un técnico lo antes posible.</p>
-        <a href="http://localhost:5173/dashboard/reports" class="button">Ver Reporte</a>
-    """
+    rendered = templates.NEW_REPORT.render_batch(
+        shared={
+            'report_id': report.id,
+            'asset_name': report.asset.name if report.asset else 'N/A',
+            'priority': report.priority,
+            'priority_color': templates.priority_color(report.priority),
+            'requester_name': requester.name,
+            'requester_email': requester.email,
+            'description': report.description
+        },
+        recipients=[{'recipient_name': admin.name} for admin in admins]
+    )
     
-    send_email(
-        subject=f'[MAFIS] Nuevo Reporte #{report.id} - Prioridad {report.priority}',
-        recipients=admin_emails,
-        text_body=f'Nuevo reporte #{report.id} creado por {requester.name}. Descripción: {report.description}',
-        html_body=get_email_base_template(content)
+    errors = send_email_batch(
+        build_message(email.subject, admin.email, email.text, email.html)
+        for admin, email in zip(admins, rendered)
     )
+    return [(admin, error) for admin, error in zip(admins, errors) if error is not None]
 
 
-def send_work_order_assigned_notification(work_order, technician):
+def send_work_order_assigned_notification(work_order, technician, sync=False):
     """Notify technician when a work order is assigned to them"""
     if not technician or not technician.email:
         return
@@ -180,34 +265,29 @@ def send_work_order_assigned_notification(work_order, technician):
     if not getattr(technician, 'notify_email', True):
         return
     
-    content = f"""
-        <h2>Nueva Orden de Trabajo Asignada</h2>
-        <p>Hola <strong>{technician.name}</strong>,</p>
-        <p>Se te ha asignado una nueva orden de trabajo:</p>
-        
-        <div class="info-box">
-            <strong>ID de la Orden:</strong> #{work_order.id}<br>
-            <strong>Reporte Relacionado:</strong> #{work_order.report_id}<br>
-            <strong>Descripción:</strong> {work_order.report.description if work_order.report else 'N/A'}<br>
-            <strong>Prioridad:</strong> {work_order.report.priority if work_order.report else 'N/A'}<br>
-            <strong>Estado:</strong> {work_order.status}
-        </div>
-        
-        {f'<div class="warning-box"><strong>Notas:</strong> {work_order.notes}</div>' if work_order.notes else ''}
-        
-        <p>Por favor, revisa la orden y actualiza su estado según el progreso.</p>
-        <a href="http://localhost:5173/dashboard/work-orders" class="button">Ver Orden de Trabajo</a>
-    """
-    
-    send_email(
-        subject=f'[MAFIS] Nueva Orden de Trabajo #{work_order.id} Asignada',
-        recipients=technician.email,
-        text_body=f'Se te ha asignado la orden de trabajo #{work_order.id}. Descripción: {work_order.report.description if work_order.report else "N/A"}',
-        html_body=get_email_base_template(content)
+    report = work_order.report
+    rendered = templates.WORK_ORDER_ASSIGNED.render(
+        recipient_name=technician.name,
+        work_order_id=work_order.id,
+        report_id=work_order.report_id,
+        description=report.description if report else 'N/A',
+        priority=report.priority if report else 'N/A',
+        status=work_order.status,
+        notes_block=templates.NOTES_BLOCK.render({'notes': work_order.notes}) if work_order.notes else ''
     )
+    
+    send_rendered(rendered, technician.email, sync=sync)
+
+
+STATUS_MESSAGES = {
+    'ASIGNADO': 'ha sido asignada a un técnico',
+    'EN PROGRESO': 'está en progreso',
+    'COMPLETADO': 'ha sido completada',
+    'CERRADO': 'ha sido cerrada'
+}
 
 
-def send_work_order_status_update_notification(work_order, requester):
+def send_work_order_status_update_notification(work_order, requester, sync=False):
     """Notify requester when work order status changes"""
     if not requester or not requester.email:
         return
@@ -216,73 +296,41 @@ def send_work_order_status_update_notification(work_order, requester):
     if not getattr(requester, 'notify_email', True):
         return
     
-    status_messages = {
-        'ASIGNADO': 'ha sido asignada a un técnico',
-        'EN PROGRESO': 'está en progreso',
-        'COMPLETADO': 'ha sido completada',
-        'CERRADO': 'ha sido cerrada'
-    }
-    
-    status_message = status_messages.get(work_order.status, 'ha sido actualizada')
-    
-    content = f"""
-        <h2>Actualización de Orden de Trabajo</h2>
-        <p>Hola <strong>{requester.name}</strong>,</p>
-        <p>Tu orden de trabajo <strong>{status_message}</strong>:</p>
-        
-        <div class="info-box">
-            <strong>ID de la Orden:</strong> #{work_order.id}<br>
-            <strong>Reporte:</strong> #{work_order.report_id}<br>
-            <strong>Nuevo Estado:</strong> <span style="color: #00A651">{work_order.status}</span><br>
-            {f'<strong>Técnico Asignado:</strong> {work_order.technician.name}<br>' if work_order.technician else ''}
-            {f'<strong>Fecha de Completación:</strong> {work_order.completion_date.strftime("%d/%m/%Y %H:%M")}<br>' if work_order.completion_date else ''}
-        </div>
-        
-        <p>Puedes revisar el estado completo de tu solicitud en el sistema.</p>
-        <a href="http://localhost:5173/dashboard/reports" class="button">Ver Mis Reportes</a>
-    """
+    technician_line = ''
+    if work_order.technician:
+        technician_line = templates.TECHNICIAN_LINE.render({'name': work_order.technician.name})
+    completion_line = ''
+    if work_order.completion_date:
+        completion_line = templates.COMPLETION_LINE.render(
+            {'date': work_order.completion_date.strftime("%d/%m/%Y %H:%M")}
+        )
     
-    send_email(
-        subject=f'[MAFIS] Actualización: Orden #{work_order.id} - {work_order.status}',
-        recipients=requester.email,
-        text_body=f'Tu orden de trabajo #{work_order.id} {status_message}.',
-        html_body=get_email_base_template(content)
+    rendered = templates.WORK_ORDER_STATUS_UPDATE.render(
+        recipient_name=requester.name,
+        work_order_id=work_order.id,
+        report_id=work_order.report_id,
+        status=work_order.status,
+        status_message=STATUS_MESSAGES.get(work_order.status, 'ha sido actualizada'),
+        technician_line=technician_line,
+        completion_line=completion_line
     )
+    
+    send_rendered(rendered, requester.email, sync=sync)
 
 
-def send_welcome_email(user, temp_password=None):
+def send_welcome_email(user, temp_password=None, sync=False):
     """Send welcome email to new user"""
     if not user or not user.email:
         return
     
-    content = f"""
-        <h2>Bienvenido a MAFIS</h2>
-        <p>Hola <strong>{user.name}</strong>,</p>
-        <p>Tu cuenta ha sido creada exitosamente en el Sistema de Gestión de Activos y Mantenimiento (MAFIS).</p>
-        
-        <div class="info-box">
-            <strong>Email:</strong> {user.email}<br>
-            <strong>Rol:</strong> {user.role.upper()}<br>
-            {f'<strong>Contraseña Temporal:</strong> {temp_password}<br>' if temp_password else ''}
-        </div>
-        
-        {f'<div class="warning-box"><strong>Importante:</strong> Por seguridad, te recomendamos cambiar tu contraseña temporal al iniciar sesión por primera vez.</div>' if temp_password else ''}
-        
-        <p>Puedes acceder al sistema usando tus credenciales.</p>
-        <a href="http://localhost:5173/login" class="button">Iniciar Sesión</a>
-        
-        <h3>¿Qué puedes hacer en MAFIS?</h3>
-        <ul>
-            <li>Reportar fallas en activos</li>
-            <li>Dar seguimiento a tus solicitudes</li>
-            <li>Ver el estado de las órdenes de trabajo</li>
-            {f'<li>Gestionar activos y usuarios (Admin)</li>' if user.role == 'admin' else ''}
-        </ul>
-    """
-    
-    send_email(
-        subject='[MAFIS] Bienvenido al Sistema de Gestión de Activos',
-        recipients=user.email,
-        text_body=f'Bienvenido a MAFIS, {user.name}. Tu cuenta ha sido creada con el rol de {user.role}.',
-        html_body=get_email_base_template(content)
+    rendered = templates.WELCOME.render(
+        recipient_name=user.name,
+        email=user.email,
+        role=user.role,
+        role_label=user.role.upper(),
+        password_line=templates.PASSWORD_LINE.render({'password': temp_password}) if temp_password else '',
+        password_warning=templates.PASSWORD_WARNING if temp_password else '',
+        admin_item=templates.ADMIN_ITEM if user.role == 'admin' else ''
     )
+    
+    send_rendered(rendered, user.email, sync=sync)
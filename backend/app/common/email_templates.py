@@ -0,0 +1,338 @@
+"""
+Precompiled email templates
+Every template is parsed once at import into literal chunks and field slots, and the HTML
+shell with its CSS is folded into those chunks, so rendering an email only escapes and
+joins the variable fields. Fields shared by every recipient of an event can be bound once
+with render_batch, leaving only the per-recipient fields to fill for each variant.
+"""
+from collections import namedtuple
+from string import Formatter
+from markupsafe import Markup, escape
+
+RenderedEmail = namedtuple('RenderedEmail', ['subject', 'text', 'html'])
+
+APP_URL = 'http://localhost:5173'
+
+PRIORITY_COLORS = {
+    'ALTA': '#dc2626',
+    'MEDIA': '#f59e0b',
+}
+DEFAULT_PRIORITY_COLOR = '#6b7280'
+
+
+class CompiledTemplate:
+    """
+    Template parsed into alternating literal chunks and field names.
+    HTML templates escape field values unless they are Markup; fragments render
+    to Markup so they can be passed as fields of another template.
+    """
+    __slots__ = ('_literals', '_fields', 'escape', 'markup')
+
+    def __init__(self, literals, fields, escape=True, markup=False):
+        # len(literals) == len(fields) + 1: literal, field, literal, ..., literal
+        self._literals = tuple(literals)
+        self._fields = tuple(fields)
+        self.escape = escape
+        self.markup = markup
+
+    @classmethod
+    def compile(cls, source, escape=True, markup=False):
+        literals, fields = [''], []
+        for literal, field, _spec, _conversion in Formatter().parse(source):
+            literals[-1] += literal
+            if field is not None:
+                fields.append(field)
+                literals.append('')
+        return cls(literals, fields, escape, markup)
+
+    @property
+    def fields(self):
+        return frozenset(self._fields)
+
+    def wrap(self, prefix, suffix):
+        """Same template with static text folded around it"""
+        literals = list(self._literals)
+        literals[0] = prefix + literals[0]
+        literals[-1] = literals[-1] + suffix
+        return CompiledTemplate(literals, self._fields, self.escape, self.markup)
+
+    def _value(self, value):
+        if value is None:
+            return ''
+        return str(escape(value)) if self.escape else str(value)
+
+    def bind(self, context):
+        """Render the fields present in context now and keep the rest as slots"""
+        literals, fields = [self._literals[0]], []
+        for field, literal in zip(self._fields, self._literals[1:]):
+            if field in context:
+                literals[-1] += self._value(context[field]) + literal
+            else:
+                fields.append(field)
+                literals.append(literal)
+        return CompiledTemplate(literals, fields, self.escape, self.markup)
+
+    def render(self, context):
+        literals = self._literals
+        if not self._fields:
+            rendered = literals[0]
+        else:
+            parts = [literals[0]]
+            for index, field in enumerate(self._fields, 1):
+                parts.append(self._value(context[field]))
+                parts.append(literals[index])
+            rendered = ''.join(parts)
+        return Markup(rendered) if self.markup else rendered
+
+
+class EmailTemplate:
+    """Subject, plain-text and HTML bodies of one kind of email"""
+    __slots__ = ('subject', 'text', 'html')
+
+    def __init__(self, subject, text, html):
+        self.subject = subject
+        self.text = text
+        self.html = html
+
+    @classmethod
+    def compile(cls, subject, text, html_content):
+        return cls(
+            CompiledTemplate.compile(subject, escape=False),
+            CompiledTemplate.compile(text, escape=False),
+            CompiledTemplate.compile(html_content).wrap(BASE_HEAD, BASE_TAIL)
+        )
+
+    def bind(self, context):
+        return EmailTemplate(self.subject.bind(context), self.text.bind(context), self.html.bind(context))
+
+    def render(self, **context):
+        return RenderedEmail(self.subject.render(context), self.text.render(context), self.html.render(context))
+
+    def render_batch(self, shared, recipients):
+        """
+        One event, many recipients: shared fields are rendered once and each
+        recipient context only fills what is left.
+
+        Args:
+            shared: Fields common to every variant
+            recipients: Iterable of per-recipient field dicts
+
+        Returns:
+            List of RenderedEmail in recipient order
+        """
+        bound = self.bind(shared)
+        return [
+            RenderedEmail(bound.subject.render(ctx), bound.text.render(ctx), bound.html.render(ctx))
+            for ctx in recipients
+        ]
+
+
+def fragment(source):
+    """Optional HTML snippet; render it to get Markup to pass as a field"""
+    return CompiledTemplate.compile(source, markup=True)
+
+
+def priority_color(priority):
+    return PRIORITY_COLORS.get(priority, DEFAULT_PRIORITY_COLOR)
+
+
+# ============================================
+# BASE LAYOUT (static, rendered once)
+# ============================================
+
+BASE_HEAD = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <style>
+            body {
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+                background-color: #f4f4f4;
+            }
+            .container {
+                background-color: white;
+                border-radius: 8px;
+                padding: 30px;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            }
+            .header {
+                background: linear-gradient(135deg, #0066CC 0%, #00A651 100%);
+                color: white;
+                padding: 20px;
+                border-radius: 8px 8px 0 0;
+                text-align: center;
+                margin: -30px -30px 20px -30px;
+            }
+            .header h1 {
+                margin: 0;
+                font-size: 24px;
+            }
+            .content {
+                padding: 20px 0;
+            }
+            .button {
+                display: inline-block;
+                padding: 12px 24px;
+                background-color: #00A651;
+                color: white !important;
+                text-decoration: none;
+                border-radius: 4px;
+                margin: 20px 0;
+            }
+            .footer {
+                text-align: center;
+                margin-top: 30px;
+                padding-top: 20px;
+                border-top: 1px solid #eee;
+                color: #666;
+                font-size: 12px;
+            }
+            .info-box {
+                background-color: #f0f9ff;
+                border-left: 4px solid #0066CC;
+                padding: 15px;
+                margin: 15px 0;
+            }
+            .warning-box {
+                background-color: #fef9c3;
+                border-left: 4px solid #f59e0b;
+                padding: 15px;
+                margin: 15px 0;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🔧 MAFIS - SENA</h1>
+                <p style="margin: 5px 0 0 0; font-size: 14px;">Sistema de Gestión de Activos y Mantenimiento</p>
+            </div>
+            <div class="content">
+                """
+
+BASE_TAIL = """
+            </div>
+            <div class="footer">
+                <p>Este es un correo automático, por favor no responder.</p>
+                <p>© 2025 SENA - Centro de Formación. Todos los derechos reservados.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+
+# ============================================
+# TEMPLATES
+# ============================================
+
+NEW_REPORT = EmailTemplate.compile(
+    subject='[MAFIS] Nuevo Reporte #{report_id} - Prioridad {priority}',
+    text='Nuevo reporte #{report_id} creado por {requester_name}. Descripción: {description}',
+    html_content=f"""
+        <h2>Nuevo Reporte de Falla</h2>
+        <p>Hola <strong>{{recipient_name}}</strong>,</p>
+        <p>Se ha creado un nuevo reporte en el sistema:</p>
+
+        <div class="info-box">
+            <strong>ID del Reporte:</strong> #{{report_id}}<br>
+            <strong>Activo:</strong> {{asset_name}}<br>
+            <strong>Prioridad:</strong> <span style="color: {{priority_color}}">{{priority}}</span><br>
+            <strong>Solicitante:</strong> {{requester_name}} ({{requester_email}})<br>
+            <strong>Descripción:</strong> {{description}}
+        </div>
+
+        <p>Por favor, revise el reporte y asigne un técnico lo antes posible.</p>
+        <a href="{APP_URL}/dashboard/reports" class="button">Ver Reporte</a>
+    """
+)
+
+WORK_ORDER_ASSIGNED = EmailTemplate.compile(
+    subject='[MAFIS] Nueva Orden de Trabajo #{work_order_id} Asignada',
+    text='Se te ha asignado la orden de trabajo #{work_order_id}. Descripción: {description}',
+    html_content=f"""
+        <h2>Nueva Orden de Trabajo Asignada</h2>
+        <p>Hola <strong>{{recipient_name}}</strong>,</p>
+        <p>Se te ha asignado una nueva orden de trabajo:</p>
+
+        <div class="info-box">
+            <strong>ID de la Orden:</strong> #{{work_order_id}}<br>
+            <strong>Reporte Relacionado:</strong> #{{report_id}}<br>
+            <strong>Descripción:</strong> {{description}}<br>
+            <strong>Prioridad:</strong> {{priority}}<br>
+            <strong>Estado:</strong> {{status}}
+        </div>
+
+        {{notes_block}}
+
+        <p>Por favor, revisa la orden y actualiza su estado según el progreso.</p>
+        <a href="{APP_URL}/dashboard/work-orders" class="button">Ver Orden de Trabajo</a>
+    """
+)
+
+WORK_ORDER_STATUS_UPDATE = EmailTemplate.compile(
+    subject='[MAFIS] Actualización: Orden #{work_order_id} - {status}',
+    text='Tu orden de trabajo #{work_order_id} {status_message}.',
+    html_content=f"""
+        <h2>Actualización de Orden de Trabajo</h2>
+        <p>Hola <strong>{{recipient_name}}</strong>,</p>
+        <p>Tu orden de trabajo <strong>{{status_message}}</strong>:</p>
+
+        <div class="info-box">
+            <strong>ID de la Orden:</strong> #{{work_order_id}}<br>
+            <strong>Reporte:</strong> #{{report_id}}<br>
+            <strong>Nuevo Estado:</strong> <span style="color: #00A651">{{status}}</span><br>
+            {{technician_line}}
+            {{completion_line}}
+        </div>
+
+        <p>Puedes revisar el estado completo de tu solicitud en el sistema.</p>
+        <a href="{APP_URL}/dashboard/reports" class="button">Ver Mis Reportes</a>
+    """
+)
+
+WELCOME = EmailTemplate.compile(
+    subject='[MAFIS] Bienvenido al Sistema de Gestión de Activos',
+    text='Bienvenido a MAFIS, {recipient_name}. Tu cuenta ha sido creada con el rol de {role}.',
+    html_content=f"""
+        <h2>Bienvenido a MAFIS</h2>
+        <p>Hola <strong>{{recipient_name}}</strong>,</p>
+        <p>Tu cuenta ha sido creada exitosamente en el Sistema de Gestión de Activos y Mantenimiento (MAFIS).</p>
+
+        <div class="info-box">
+            <strong>Email:</strong> {{email}}<br>
+            <strong>Rol:</strong> {{role_label}}<br>
+            {{password_line}}
+        </div>
+
+        {{password_warning}}
+
+        <p>Puedes acceder al sistema usando tus credenciales.</p>
+        <a href="{APP_URL}/login" class="button">Iniciar Sesión</a>
+
+        <h3>¿Qué puedes hacer en MAFIS?</h3>
+        <ul>
+            <li>Reportar fallas en activos</li>
+            <li>Dar seguimiento a tus solicitudes</li>
+            <li>Ver el estado de las órdenes de trabajo</li>
+            {{admin_item}}
+        </ul>
+    """
+)
+
+NOTES_BLOCK = fragment('<div class="warning-box"><strong>Notas:</strong> {notes}</div>')
+TECHNICIAN_LINE = fragment('<strong>Técnico Asignado:</strong> {name}<br>')
+COMPLETION_LINE = fragment('<strong>Fecha de Completación:</strong> {date}<br>')
+PASSWORD_LINE = fragment('<strong>Contraseña Temporal:</strong> {password}<br>')
+PASSWORD_WARNING = Markup(
+    '<div class="warning-box"><strong>Importante:</strong> Por seguridad, te recomendamos '
+    'cambiar tu contraseña temporal al iniciar sesión por primera vez.</div>'
+)
+ADMIN_ITEM = Markup('<li>Gestionar activos y usuarios (Admin)</li>')
@@ -0,0 +1,72 @@
+"""
+Strong ETags and conditional GETs for list and detail endpoints
+Validators are computed from aggregates (max(updated_at) and row count) in a single
+SELECT, before any row is loaded, so a matching If-None-Match is answered with 304
+without hydrating or serializing anything. updated_at keeps microseconds on every
+backend (PRECISE_DATETIME), so two edits within one second still change the tag.
+"""
+import hashlib
+from flask import Response, request
+from sqlalchemy import func, select
+from app.extensions import db
+
+# Bump when a to_dict() changes shape so clients drop their cached bodies
+SERIALIZATION_VERSION = '1'
+
+
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in (SERIALIZATION_VERSION, request.path, request.query_string.decode()) + parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def list_etag(query, model, *related_models):
+    """
+    ETag for a list endpoint
+
+    Args:
+        query: The filtered list query, without eager-loading options
+        model: Model listed by the endpoint
+        related_models: Models whose columns appear in the serialized rows
+            (e.g. asset names in reports), so edits to them change the tag
+    """
+    columns = [
+        query.with_entities(func.max(model.updated_at)).scalar_subquery(),
+        query.with_entities(func.count(model.id)).scalar_subquery(),
+    ]
+    for related in related_models:
+        columns.append(select(func.max(related.updated_at)).scalar_subquery())
+        columns.append(select(func.count(related.id)).scalar_subquery())
+
+    return make_etag(*db.session.execute(select(*columns)).one())
+
+
+def resource_etag(model, entity_id, *relationships):
+    """
+    ETag for a detail endpoint, or None if the row does not exist
+
+    Args:
+        relationships: Relationship attributes serialized with the row (e.g. Report.asset)
+    """
+    columns = [model.updated_at] + [rel.property.mapper.class_.updated_at for rel in relationships]
+    query = db.session.query(*columns).filter(model.id == entity_id)
+    for rel in relationships:
+        query = query.outerjoin(rel)
+
+    row = query.first()
+    if row is None:
+        return None
+    return make_etag(entity_id, *row)
+
+
+def not_modified(etag):
+    """304 response when the client already holds this version, else None"""
+    if etag is not None and request.if_none_match.contains(etag):
+        return with_etag(Response(status=304), etag)
+    return None
+
+
+def with_etag(response, etag):
+    """Tag a response; no-cache makes browsers revalidate with If-None-Match on every poll"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
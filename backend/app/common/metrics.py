@@ -0,0 +1,214 @@
+"""
+Per-route request metrics in Prometheus text format
+Every request records its latency, the SQL statements it ran with their total time
+(from SQLAlchemy cursor events) and its response size, labelled by method and URL rule.
+Observations are a few dict updates under one lock; /api/metrics renders them on scrape.
+Numbers are per process: with several gunicorn workers, scrape each one or sum upstream.
+The per-request SQL tracking is shared: the query guard reads the statement texts from
+request_sql() instead of listening to the engine itself.
+"""
+import time
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from flask import Response, current_app, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# SQL run by the request being served by this thread/greenlet
+_current_request = ContextVar('metrics_current_request', default=None)
+
+
+class RequestSQL:
+    """Statements run by one request and their total time; texts only when a consumer asked for them"""
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self, keep_statements=False):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = [] if keep_statements else None
+
+
+def request_sql():
+    """RequestSQL of the current request, or None outside a tracked request"""
+    return _current_request.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, labels, value):
+        # Caller holds the registry lock
+        series = self._series.get(labels)
+        if series is None:
+            # Bucket counts (non-cumulative), then +Inf, sum
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-1]}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Registry of the request histograms plus the in-flight gauge"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        labels = ('method', 'route', 'status')
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency in seconds', labels, LATENCY_BUCKETS)
+        self.sql_statements = Histogram(
+            'http_request_sql_statements', 'SQL statements executed per request', labels, SQL_COUNT_BUCKETS)
+        self.db_time = Histogram(
+            'http_request_db_seconds', 'Time spent in SQL statements per request', labels, LATENCY_BUCKETS)
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Response body size in bytes', labels, SIZE_BUCKETS)
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, labels, duration, statements, db_seconds, size):
+        with self._lock:
+            self.latency.observe(labels, duration)
+            self.sql_statements.observe(labels, statements)
+            self.db_time.observe(labels, db_seconds)
+            if size is not None:
+                self.response_size.observe(labels, size)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for histogram in (self.latency, self.sql_statements, self.db_time, self.response_size):
+                lines.extend(histogram.render())
+            lines += [
+                '# HELP http_requests_in_flight Requests being served',
+                '# TYPE http_requests_in_flight gauge',
+                f'http_requests_in_flight {self.in_flight}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context rather than conn.info: a statement that raises never
+    # reaches after_cursor_execute, and its start must not outlive it on a pooled connection
+    if context is not None and _current_request.get() is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sql = _current_request.get()
+    start = getattr(context, '_metrics_start', None)
+    if sql is None or start is None:
+        return
+    sql.count += 1
+    sql.seconds += time.perf_counter() - start
+    if sql.statements is not None:
+        sql.statements.append(statement)
+
+
+def track_request_sql(app, db, keep_statements=False):
+    """
+    Track the SQL of every request of the app; request_sql() returns it until teardown
+
+    Safe to call more than once: the listeners and hooks are installed the first time,
+    and keep_statements sticks once any caller asks for the statement texts.
+    """
+    state = app.extensions.get('request_sql')
+    if state is not None:
+        state['keep_statements'] = state['keep_statements'] or keep_statements
+        return
+    state = app.extensions['request_sql'] = {'keep_statements': keep_statements}
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_sql():
+        request.environ['metrics.sql_token'] = _current_request.set(RequestSQL(state['keep_statements']))
+
+    @app.teardown_request
+    def finish_request_sql(error=None):
+        # After every after_request hook, so each consumer sees the whole request
+        token = request.environ.pop('metrics.sql_token', None)
+        if token is not None:
+            _current_request.reset(token)
+
+
+def init_app(app, db):
+    """Install the request hooks, the SQL listeners and the /api/metrics route"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    metrics = RequestMetrics()
+    app.extensions['request_metrics'] = metrics
+    track_request_sql(app, db)
+
+    @app.before_request
+    def start_request_metrics():
+        request.environ['metrics.start'] = time.perf_counter()
+        request.environ['metrics.in_flight'] = True
+        metrics.started()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = request.environ.pop('metrics.start', None)
+        if start is None:
+            return response
+
+        sql = request_sql()
+        statements, db_seconds = (sql.count, sql.seconds) if sql else (0, 0.0)
+
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        # Streamed bodies have no length up front and are left out of the size histogram
+        size = None if response.is_streamed else response.calculate_content_length()
+        metrics.observe(
+            (request.method, route, str(response.status_code)),
+            time.perf_counter() - start, statements, db_seconds, size
+        )
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        # Runs even when a handler or after_request hook raised
+        if request.environ.pop('metrics.in_flight', False):
+            metrics.finished()
+
+    @app.route('/api/metrics')
+    def prometheus_metrics():
+        token = current_app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,131 @@
+"""
+Password hashing off the request threads
+bcrypt runs in a small pool of native threads (it releases the GIL while hashing), so a
+login rush queues for CPU instead of pinning every server thread. The queue is bounded:
+once it is full, or a caller has waited PASSWORD_HASH_TIMEOUT seconds, HashingBusy is
+raised and the request is answered with 503 + Retry-After instead of piling up.
+"""
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+import bcrypt
+from flask import current_app
+
+
+class HashingBusy(Exception):
+    """The hashing pool is saturated; the client should retry later"""
+
+
+def _native_executor(workers):
+    """
+    Thread pool whose threads are real OS threads even under gevent, where the
+    patched threading module would otherwise run bcrypt on the event loop.
+    """
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            from gevent.threadpool import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers=workers)
+    except ImportError:
+        pass
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+
+
+def hash_cost(password_hash):
+    """Work factor stored in a bcrypt hash ($2b$12$...)"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Bounded bcrypt pool
+
+    Args:
+        rounds: bcrypt work factor for new hashes
+        workers: Hashing threads, normally the CPU count
+        max_pending: Jobs allowed to wait for a thread before callers are turned away
+        timeout: Seconds a caller waits for its result before giving up
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=64, timeout=5):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = _native_executor(workers)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self):
+        """Jobs running or waiting for a thread"""
+        return self._in_flight
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                raise HashingBusy()
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Drop the job if no thread picked it up yet; a running one just finishes
+            future.cancel()
+            raise HashingBusy()
+
+    def _hash(self, password):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    def _verify(self, password, password_hash):
+        """Check a password and, if it matched under another cost, rehash it in the same job"""
+        if not bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
+            return False, None
+        if hash_cost(password_hash) == self.rounds:
+            return True, None
+        return True, self._hash(password)
+
+    def hash(self, password):
+        return self._run(self._hash, password)
+
+    def verify(self, password, password_hash):
+        """
+        Returns:
+            (matches, new_hash): new_hash is set when the stored hash used a
+            different work factor and should replace it
+        """
+        if not password or not password_hash:
+            return False, None
+        return self._run(self._verify, password, password_hash)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def get_password_hasher(app=None):
+    """Process-wide hasher for the app, created on first use"""
+    app = app or current_app._get_current_object()
+    hasher = app.extensions.get('password_hasher')
+    if hasher is None:
+        hasher = PasswordHasher(
+            rounds=app.config.get('BCRYPT_ROUNDS', 12),
+            workers=app.config.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 2,
+            max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 64),
+            timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 5)
+        )
+        app.extensions['password_hasher'] = hasher
+    return hasher
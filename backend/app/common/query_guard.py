@@ -0,0 +1,78 @@
+"""
+Query budgets and N+1 detection
+Reads the SQL statements of each request from the metrics tracking and checks
+them against the route's @query_budget and against QUERY_GUARD_MAX_REPEATS, the number of
+times one statement shape (literals and IN-lists collapsed) may run. A statement repeated
+with different parameters is the signature of a lazy load inside a loop.
+In testing the violation raises, so the test client fails; elsewhere it is logged.
+Statements run while a streamed body is sent (stream_json_array) come after the check and
+are not counted: its batch query repeats once per batch by design, so keep serializers
+used with streaming free of lazy loads (eager-load what to_dict() reads).
+"""
+import re
+from collections import Counter
+from flask import current_app, request
+from app.common.metrics import request_sql, track_request_sql
+
+_IN_LIST = re.compile(r'\((\s*(\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(\?|%s|%\(\w+\)s|:\w+)\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more statements than its route allows"""
+
+
+def statement_shape(statement):
+    """SQL text with literals and expanded IN-lists collapsed, to group repeats"""
+    shape = _STRING.sub('?', statement)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('(?)', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+def check(statements, max_queries=None, max_repeats=None):
+    """
+    Returns:
+        List of violation messages, empty when the request is within budget
+    """
+    problems = []
+    if max_queries is not None and len(statements) > max_queries:
+        problems.append(f'{len(statements)} statements, budget is {max_queries}')
+
+    if max_repeats is not None:
+        for shape, count in Counter(statement_shape(s) for s in statements).most_common():
+            if count <= max_repeats:
+                break
+            problems.append(f'repeated {count} times (limit {max_repeats}), possible N+1: {shape[:200]}')
+    return problems
+
+
+def init_app(app, db):
+    """Track statements per request and enforce route budgets when QUERY_GUARD_ENABLED"""
+    if not app.config.get('QUERY_GUARD_ENABLED'):
+        return
+
+    track_request_sql(app, db, keep_statements=True)
+
+    @app.after_request
+    def enforce_query_budget(response):
+        sql = request_sql()
+        if sql is None or sql.statements is None:
+            return response
+        statements = sql.statements
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None) or {}
+        max_repeats = None if budget.get('allow_repeats') else current_app.config.get('QUERY_GUARD_MAX_REPEATS')
+
+        problems = check(statements, budget.get('max_queries'), max_repeats)
+        if not problems:
+            return response
+
+        message = f'{request.method} {request.path}: ' + '; '.join(problems)
+        if current_app.testing:
+            raise QueryBudgetExceeded(message)
+        current_app.logger.warning(f'Query budget exceeded - {message}')
+        return response
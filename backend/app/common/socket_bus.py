@@ -0,0 +1,75 @@
+"""
+Message bus for Socket.IO emits across processes
+With several server workers each one only knows its own sockets, so emits are published
+on a pub/sub channel and every worker delivers them to the clients it holds.
+Production uses Redis, Kafka or any Kombu URL; `local://` is an in-process bus for tests
+and single-process development that behaves like the real ones.
+"""
+import queue
+import threading
+import socketio
+
+LOCAL_SCHEME = 'local://'
+
+
+class LocalPubSubManager(socketio.PubSubManager):
+    """
+    Pub/sub manager whose channel lives in this process.
+    Several Socket.IO servers created in the same process (one per simulated worker)
+    share the channel exactly like separate processes share a Redis channel.
+    """
+    name = 'local'
+
+    _lock = threading.Lock()
+    _subscribers = {}  # channel -> [queue.Queue]
+
+    def __init__(self, url=LOCAL_SCHEME, channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.url = url
+        self._queue = None
+
+    def initialize(self):
+        # Subscribe before the listener starts so nothing published meanwhile is lost
+        if not self.write_only:
+            self._queue = queue.Queue()
+            with self._lock:
+                self._subscribers.setdefault(self.channel, []).append(self._queue)
+        super().initialize()
+
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        with self._lock:
+            subscribers = list(self._subscribers.get(self.channel, []))
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+    def _listen(self):
+        while True:
+            yield self._queue.get()
+
+    def close(self):
+        """Stop receiving messages (tests tear down their simulated workers)"""
+        with self._lock:
+            subscribers = self._subscribers.get(self.channel, [])
+            if self._queue in subscribers:
+                subscribers.remove(self._queue)
+
+    @classmethod
+    def reset(cls, channel=None):
+        """Drop every subscriber, or only those of one channel"""
+        with cls._lock:
+            if channel is None:
+                cls._subscribers.clear()
+            else:
+                cls._subscribers.pop(channel, None)
+
+
+def build_client_manager(url, channel, write_only=False):
+    """
+    Client manager for a message-queue URL.
+    Returns None when Flask-SocketIO can build it itself from `message_queue`
+    (redis://, rediss://, kafka://, zmq+..., amqp:// and other Kombu URLs).
+    """
+    if url and url.startswith(LOCAL_SCHEME):
+        return LocalPubSubManager(url, channel=channel, write_only=write_only)
+    return None
@@ -15,6 +15,9 @@ VALID_PRIORITIES = ['BAJA', 'MEDIA', 'ALTA']
 # Work Order Statuses (en español)
 VALID_WORK_ORDER_STATUSES = ['ABIERTO', 'ASIGNADO', 'EN PROGRESO', 'COMPLETADO', 'CERRADO']
 
+# Work Order Statuses that still count as pending work
+OPEN_WORK_ORDER_STATUSES = ['ABIERTO', 'ASIGNADO', 'EN PROGRESO']
+
 # Asset Statuses (en español)
 VALID_ASSET_STATUSES = ['OPERATIVO', 'FUERA DE SERVICIO', 'EN MANTENIMIENTO']
 
@@ -72,3 +75,16 @@ def validate_criticality(criticality):
     if criticality not in VALID_CRITICALITY:
         raise ValueError(f'Criticidad inválida. Debe ser una de: {", ".join(VALID_CRITICALITY)}')
     return criticality
+
+
+def validate_id_list(ids, maximum):
+    """Validate a list of entity ids sent for a bulk operation; returns them de-duplicated"""
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids debe ser una lista no vacía de identificadores')
+    try:
+        unique_ids = list(dict.fromkeys(int(entity_id) for entity_id in ids))
+    except (TypeError, ValueError):
+        raise ValueError('ids solo puede contener números enteros')
+    if len(unique_ids) > maximum:
+        raise ValueError(f'Se permiten como máximo {maximum} ids por solicitud')
+    return unique_ids
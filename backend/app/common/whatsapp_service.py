@@ -1,7 +1,101 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from twilio.rest import Client
 from flask import current_app
 
+_client_lock = threading.Lock()
+_client = None
+_client_credentials = None
+
+_dispatcher_lock = threading.Lock()
+_dispatcher = None
+
+
+class RateLimiter:
+    """Token bucket shared by every sender thread in the process"""
+
+    def __init__(self, rate_per_second):
+        self.rate = float(rate_per_second)
+        self.capacity = max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a send is allowed"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class WhatsAppDispatcher:
+    """Bounded thread pool that sends WhatsApp messages under a messages-per-second limit"""
+
+    def __init__(self, max_workers=4, rate_per_second=10):
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='whatsapp')
+
+    def submit(self, to_number, body):
+        app = current_app._get_current_object()
+
+        def send():
+            with app.app_context():
+                return send_whatsapp_message(to_number, body)
+
+        return self._executor.submit(send)
+
+    def send_many(self, messages):
+        """
+        Send (to_number, body) pairs concurrently.
+
+        Returns:
+            List of (to_number, error) in input order; error is None on success.
+        """
+        futures = [(to_number, self.submit(to_number, body)) for to_number, body in messages]
+        results = []
+        for to_number, future in futures:
+            try:
+                future.result()
+                results.append((to_number, None))
+            except Exception as e:
+                results.append((to_number, e))
+        return results
+
+
+def get_twilio_client(account_sid, auth_token):
+    """Process-wide Twilio client; its HTTP session keeps connections to the API alive"""
+    global _client, _client_credentials
+    with _client_lock:
+        if _client is None or _client_credentials != (account_sid, auth_token):
+            _client = Client(account_sid, auth_token)
+            _client_credentials = (account_sid, auth_token)
+        return _client
+
+
+def get_dispatcher():
+    """Process-wide dispatcher sized from TWILIO_MAX_CONCURRENCY / TWILIO_MESSAGES_PER_SECOND"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = WhatsAppDispatcher(
+                max_workers=current_app.config.get('TWILIO_MAX_CONCURRENCY', 4),
+                rate_per_second=current_app.config.get('TWILIO_MESSAGES_PER_SECOND', 10)
+            )
+        return _dispatcher
+
+
 def send_whatsapp_message(to_number, body):
     """
     Send a WhatsApp message using Twilio API.
@@ -16,16 +110,16 @@ def send_whatsapp_message(to_number, body):
 
     if not account_sid or not auth_token:
         current_app.logger.warning(f"[WHATSAPP MOCK] To: {to_number} | Body: {body}")
-        print(f"⚠️ [WHATSAPP MOCK] Mensaje para {to_number}: {body}")
         return
 
     try:
-        client = Client(account_sid, auth_token)
+        client = get_twilio_client(account_sid, auth_token)
         
         # Ensure number has whatsapp: prefix
         if not to_number.startswith('whatsapp:'):
             to_number = f'whatsapp:{to_number}'
 
+        get_dispatcher().limiter.acquire()
         message = client.messages.create(
             from_=from_number,
             body=body,
@@ -35,7 +129,24 @@ def send_whatsapp_message(to_number, body):
         
     except Exception as e:
         current_app.logger.error(f"Failed to send WhatsApp message: {str(e)}")
-        print(f"❌ Error enviando WhatsApp: {str(e)}")
+        # Let the notification outbox schedule a retry
+        raise
+
+
+def send_whatsapp_batch(messages):
+    """
+    Send many messages concurrently through the shared dispatcher.
+
+    Args:
+        messages: Iterable of (to_number, body)
+
+    Returns:
+        List of (to_number, error) in input order; error is None on success.
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+    return get_dispatcher().send_many(messages)
 
 def notify_technician_assignment(technician, work_order):
     """Send WhatsApp notification to technician about new assignment"""
@@ -82,6 +193,17 @@ def notify_status_update(requester, work_order):
     
     send_whatsapp_message(requester.phone, message)
 
+def build_new_report_admin_message(admin, report, requester):
+    return (
+        f"📢 *Nuevo Reporte Registrado*\n\n"
+        f"Hola {admin.name}, se ha creado el reporte *#{report.id}*.\n"
+        f"👤 *Solicitante:* {requester.name}\n"
+        f"🏢 *Activo:* {report.asset.name if report.asset else 'N/A'}\n"
+        f"📝 *Descripción:* {report.description[:50]}...\n"
+        f"🚨 *Prioridad:* {report.priority}\n\n"
+        f"Por favor asigna un técnico."
+    )
+
 def notify_new_report_to_admin(admin, report, requester):
     """Notify admin about a new report"""
     if not admin.phone:
@@ -91,17 +213,23 @@ def notify_new_report_to_admin(admin, report, requester):
     if not getattr(admin, 'notify_whatsapp', True):
         return
 
-    message = (
-        f"📢 *Nuevo Reporte Registrado*\n\n"
-        f"Hola {admin.name}, se ha creado el reporte *#{report.id}*.\n"
-        f"👤 *Solicitante:* {requester.name}\n"
-        f"🏢 *Activo:* {report.asset.name if report.asset else 'N/A'}\n"
-        f"📝 *Descripción:* {report.description[:50]}...\n"
-        f"🚨 *Prioridad:* {report.priority}\n\n"
-        f"Por favor asigna un técnico."
+    send_whatsapp_message(admin.phone, build_new_report_admin_message(admin, report, requester))
+
+def notify_new_report_to_admins(admins, report, requester):
+    """
+    Notify every admin about a new report, sending concurrently
+
+    Returns:
+        List of admins whose message failed, so the caller can retry them
+    """
+    recipients = [
+        admin for admin in admins
+        if admin.phone and getattr(admin, 'notify_whatsapp', True)
+    ]
+    results = send_whatsapp_batch(
+        (admin.phone, build_new_report_admin_message(admin, report, requester)) for admin in recipients
     )
-    
-    send_whatsapp_message(admin.phone, message)
+    return [admin for admin, (_, error) in zip(recipients, results) if error is not None]
 
 def notify_report_creation_confirmation(requester, report):
     """Confirm report creation to requester"""
@@ -23,6 +23,14 @@ class Config:
         
     JWT_ACCESS_TOKEN_EXPIRES = 86400 # 24 hours
     JWT_ALGORITHM = 'HS256'
+    # Seconds a worker trusts its cached users.token_version before re-reading it
+    TOKEN_VERSION_CACHE_TTL = int(os.environ.get('TOKEN_VERSION_CACHE_TTL', 60))
+
+    # Password hashing pool; hashes with another cost are upgraded on the next login
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) # 0 = one per CPU
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64)) # queued beyond this -> 503
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5)) # seconds waited before 503
     
     # CORS
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
@@ -37,6 +45,57 @@ class Config:
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@mafis.sena.edu.co')
     MAIL_MAX_EMAILS = None
     MAIL_ASCII_ATTACHMENTS = False
+    # Sender pool: persistent SMTP connections shared by all outgoing mail
+    MAIL_SENDER_WORKERS = int(os.environ.get('MAIL_SENDER_WORKERS', 2))
+    MAIL_QUEUE_SIZE = int(os.environ.get('MAIL_QUEUE_SIZE', 1000))
+    MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', 20))
+    MAIL_CONNECTION_IDLE_TIMEOUT = int(os.environ.get('MAIL_CONNECTION_IDLE_TIMEOUT', 30))
+    MAIL_SEND_TIMEOUT = int(os.environ.get('MAIL_SEND_TIMEOUT', 60))
+
+    # WhatsApp (Twilio) dispatch
+    TWILIO_MAX_CONCURRENCY = int(os.environ.get('TWILIO_MAX_CONCURRENCY', 4))
+    TWILIO_MESSAGES_PER_SECOND = float(os.environ.get('TWILIO_MESSAGES_PER_SECOND', 10))
+
+    # Web Push fan-out
+    PUSH_MAX_CONCURRENCY = int(os.environ.get('PUSH_MAX_CONCURRENCY', 8))
+    PUSH_VAPID_TTL = int(os.environ.get('PUSH_VAPID_TTL', 12 * 60 * 60)) # seconds a signed VAPID header is reused
+
+    # Notification outbox worker
+    NOTIFICATION_WORKER_ENABLED = os.environ.get('NOTIFICATION_WORKER_ENABLED', 'True').lower() == 'true'
+    NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', 4))
+    NOTIFICATION_POLL_INTERVAL = float(os.environ.get('NOTIFICATION_POLL_INTERVAL', 2))
+    NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 5))
+    NOTIFICATION_RETRY_DELAY = int(os.environ.get('NOTIFICATION_RETRY_DELAY', 30)) # seconds, doubled per attempt
+    NOTIFICATION_LEASE_SECONDS = int(os.environ.get('NOTIFICATION_LEASE_SECONDS', 300))
+
+    # Socket.IO: cooperative server mode and the bus shared by all workers
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading') # threading | gevent | eventlet
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') # redis://..., amqp://... or local://
+    SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'mafis-socketio')
+
+    # Bulk asset import
+    ASSET_IMPORT_BATCH_SIZE = int(os.environ.get('ASSET_IMPORT_BATCH_SIZE', 1000)) # rows per INSERT/transaction
+    ASSET_IMPORT_MAX_ERRORS = int(os.environ.get('ASSET_IMPORT_MAX_ERRORS', 1000)) # row errors listed in the response
+
+    # Bulk status transitions
+    BULK_STATUS_MAX_IDS = int(os.environ.get('BULK_STATUS_MAX_IDS', 1000))
+
+    # Delta sync
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    SYNC_TOKEN_OVERLAP = int(os.environ.get('SYNC_TOKEN_OVERLAP', 5)) # seconds re-read before the token
+    SYNC_PAGE_SIZE = int(os.environ.get('SYNC_PAGE_SIZE', 500)) # rows per page across all collections
+    SYNC_MAX_PAGE_SIZE = int(os.environ.get('SYNC_MAX_PAGE_SIZE', 2000))
+
+    # Request metrics exposed at /api/metrics (Prometheus text format)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') # bearer token required to scrape, if set
+
+    # Query budgets / N+1 guard: raises in testing, logs a warning elsewhere
+    QUERY_GUARD_ENABLED = os.environ.get('QUERY_GUARD_ENABLED', 'False').lower() == 'true'
+    QUERY_GUARD_MAX_REPEATS = int(os.environ.get('QUERY_GUARD_MAX_REPEATS', 5)) # same statement shape per request
+
+    # Dashboard summary cache (seconds)
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 15))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -47,6 +106,12 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    NOTIFICATION_WORKER_ENABLED = False
+    SOCKETIO_ASYNC_MODE = 'threading'
+    BCRYPT_ROUNDS = 4
+    QUERY_GUARD_ENABLED = True
+    # The summary cache is process-wide; each test has a fresh database
+    DASHBOARD_CACHE_TTL = 0
 
 config = {
     'development': DevelopmentConfig,
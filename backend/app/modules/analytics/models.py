@@ -0,0 +1,30 @@
+from app.extensions import db
+
+
+class AssetReliabilityMonth(db.Model):
+    """
+    Failure and repair totals for one asset in one calendar month (UTC)
+
+    MTTR = repair_seconds / repairs, MTBF = failure_gap_seconds / failure_gaps;
+    summing the columns over several months gives the figures for the whole range.
+    """
+    __tablename__ = 'asset_reliability_monthly'
+    __table_args__ = (
+        db.UniqueConstraint('asset_id', 'month', name='uq_asset_reliability_asset_month'),
+        # Range queries over every asset
+        db.Index('ix_asset_reliability_month_asset', 'month', 'asset_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id', ondelete='CASCADE'), nullable=False)
+    month = db.Column(db.Date, nullable=False) # first day of the month
+
+    # Reports created this month, and the time since each one's previous failure
+    failures = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    failure_gaps = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    failure_gap_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    last_failure_at = db.Column(db.DateTime, nullable=True)
+
+    # Work orders completed this month, and report-to-completion time
+    repairs = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    repair_seconds = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
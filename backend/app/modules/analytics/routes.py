@@ -0,0 +1,38 @@
+import click
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.modules.analytics import services
+from app.common.decorators import role_required, query_budget
+from app.common.pagination import parse_limit
+
+analytics_bp = Blueprint('analytics', __name__)
+
+@analytics_bp.route('/assets', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@role_required('admin', 'technician')
+def get_asset_reliability():
+    """
+    GET /api/analytics/assets?from=2026-01&to=2026-06&asset_id=&limit=50
+    MTTR/MTBF per asset from the monthly rollups; with asset_id adds the monthly series.
+    """
+    try:
+        start = services.parse_month(request.args.get('from'), 'from')
+        end = services.parse_month(request.args.get('to'), 'to')
+        asset_id = request.args.get('asset_id', type=int)
+        limit = parse_limit(request.args.get('limit'), default=50, maximum=500)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify(services.asset_reliability(start, end, asset_id, limit)), 200
+
+
+@click.group('analytics')
+def analytics_cli():
+    """Reliability rollup commands"""
+
+
+@analytics_cli.command('rebuild')
+def rebuild():
+    """Recompute the monthly MTTR/MTBF rollups from reports and work orders"""
+    click.echo(f'Rebuilt {services.rebuild_rollups()} asset-month rollups')
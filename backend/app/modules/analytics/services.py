@@ -0,0 +1,233 @@
+"""
+Asset reliability rollups
+Each new report and each work order reaching COMPLETADO adds its contribution to the
+asset's row for that month with an upsert (one multi-row statement per batch), so
+MTTR/MTBF queries only aggregate the small monthly table instead of scanning reports
+and work orders.
+"""
+from datetime import date
+from sqlalchemy import func, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import db
+from app.modules.analytics.models import AssetReliabilityMonth
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.work_orders.models import WorkOrder
+
+COUNTERS = ('failures', 'failure_gaps', 'failure_gap_seconds', 'repairs', 'repair_seconds')
+
+
+def month_start(moment):
+    return date(moment.year, moment.month, 1)
+
+
+def parse_month(value, name):
+    """'YYYY-MM' -> first day of that month"""
+    if not value:
+        return None
+    try:
+        year, month = value.split('-')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise ValueError(f'El parámetro {name} debe tener el formato AAAA-MM')
+
+
+def _row(asset_id, moment, last_failure_at=None, **amounts):
+    values = {'asset_id': asset_id, 'month': month_start(moment)}
+    values.update({column: amounts.get(column, 0) for column in COUNTERS})
+    if last_failure_at is not None:
+        values['last_failure_at'] = last_failure_at
+    return values
+
+
+def _add(rows, chunk_size=500):
+    """
+    Add each row's amounts to its (asset, month) rollup, creating missing ones
+
+    Uses the dialect's native multi-row upsert, so a batch is one statement per chunk
+    and concurrent workers never race on the unique (asset_id, month) key. All rows
+    must carry the same columns. The caller commits.
+    """
+    if not rows:
+        return
+    table = AssetReliabilityMonth.__table__
+    with_last_failure = 'last_failure_at' in rows[0]
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in ('sqlite', 'mysql'):
+        for values in rows:
+            row = AssetReliabilityMonth.query.filter_by(
+                asset_id=values['asset_id'], month=values['month']
+            ).with_for_update().first()
+            if row is None:
+                db.session.add(AssetReliabilityMonth(**values))
+                continue
+            for column in COUNTERS:
+                setattr(row, column, getattr(row, column) + values[column])
+            if with_last_failure:
+                row.last_failure_at = values['last_failure_at']
+        db.session.flush()
+        return
+
+    for i in range(0, len(rows), chunk_size):
+        if dialect == 'sqlite':
+            stmt = sqlite_insert(table).values(rows[i:i + chunk_size])
+            incoming = stmt.excluded
+        else:
+            stmt = mysql_insert(table).values(rows[i:i + chunk_size])
+            incoming = stmt.inserted
+
+        updates = {column: table.c[column] + incoming[column] for column in COUNTERS}
+        if with_last_failure:
+            updates['last_failure_at'] = incoming.last_failure_at
+
+        if dialect == 'sqlite':
+            stmt = stmt.on_conflict_do_update(index_elements=['asset_id', 'month'], set_=updates)
+        else:
+            stmt = stmt.on_duplicate_key_update(updates)
+        db.session.execute(stmt)
+
+
+def _previous_failure(asset_id):
+    """Latest failure already rolled up for the asset (one seek on the unique key)"""
+    return db.session.query(AssetReliabilityMonth.last_failure_at).filter(
+        AssetReliabilityMonth.asset_id == asset_id,
+        AssetReliabilityMonth.last_failure_at.isnot(None)
+    ).order_by(AssetReliabilityMonth.month.desc()).limit(1).scalar()
+
+
+def record_failure(report):
+    """Count a new report; call after it is flushed so created_at is set"""
+    previous = _previous_failure(report.asset_id)
+    gap = {}
+    if previous is not None and report.created_at >= previous:
+        gap = {'failure_gaps': 1, 'failure_gap_seconds': int((report.created_at - previous).total_seconds())}
+    _add([_row(report.asset_id, report.created_at, last_failure_at=report.created_at, failures=1, **gap)])
+
+
+def record_repairs(repairs, completed_at):
+    """
+    Count orders that just reached COMPLETADO, each timed from its report
+
+    Args:
+        repairs: Iterable of (asset_id, reported_at)
+        completed_at: Completion time shared by the batch
+    """
+    per_asset = {}
+    for asset_id, reported_at in repairs:
+        if asset_id is None or reported_at is None:
+            continue
+        count, seconds = per_asset.get(asset_id, (0, 0))
+        per_asset[asset_id] = (count + 1, seconds + max(0, int((completed_at - reported_at).total_seconds())))
+
+    _add([
+        _row(asset_id, completed_at, repairs=count, repair_seconds=seconds)
+        for asset_id, (count, seconds) in per_asset.items()
+    ])
+
+
+def record_repair(asset_id, reported_at, completed_at):
+    record_repairs([(asset_id, reported_at)], completed_at)
+
+
+def _ratio_hours(seconds, count):
+    return round(seconds / count / 3600, 2) if count else None
+
+
+def _figures(row):
+    return {
+        'failures': int(row.failures or 0),
+        'repairs': int(row.repairs or 0),
+        'mttr_hours': _ratio_hours(row.repair_seconds or 0, row.repairs or 0),
+        'mtbf_hours': _ratio_hours(row.failure_gap_seconds or 0, row.failure_gaps or 0),
+    }
+
+
+def _sums():
+    return [func.sum(getattr(AssetReliabilityMonth, column)).label(column) for column in COUNTERS]
+
+
+def asset_reliability(start=None, end=None, asset_id=None, limit=50):
+    """
+    MTTR/MTBF per asset over [start, end] months, most failures first.
+    With asset_id, also returns the month-by-month series for that asset.
+    """
+    query = db.session.query(
+        AssetReliabilityMonth.asset_id, Asset.name, *_sums()
+    ).join(Asset, Asset.id == AssetReliabilityMonth.asset_id)
+    if start:
+        query = query.filter(AssetReliabilityMonth.month >= start)
+    if end:
+        query = query.filter(AssetReliabilityMonth.month <= end)
+    if asset_id:
+        query = query.filter(AssetReliabilityMonth.asset_id == asset_id)
+
+    rows = query.group_by(AssetReliabilityMonth.asset_id, Asset.name).order_by(
+        func.sum(AssetReliabilityMonth.failures).desc(), AssetReliabilityMonth.asset_id
+    ).limit(limit).all()
+
+    result = {
+        'from': start.strftime('%Y-%m') if start else None,
+        'to': end.strftime('%Y-%m') if end else None,
+        'assets': [dict(asset_id=row.asset_id, name=row.name, **_figures(row)) for row in rows]
+    }
+
+    if asset_id:
+        months = AssetReliabilityMonth.query.filter_by(asset_id=asset_id)
+        if start:
+            months = months.filter(AssetReliabilityMonth.month >= start)
+        if end:
+            months = months.filter(AssetReliabilityMonth.month <= end)
+        result['months'] = [
+            dict(month=row.month.strftime('%Y-%m'), **_figures(row))
+            for row in months.order_by(AssetReliabilityMonth.month)
+        ]
+    return result
+
+
+def rebuild_rollups(batch_size=1000):
+    """
+    Recompute every rollup from reports and completed work orders
+    Used to backfill existing data and to repair drift (e.g. after reports are deleted).
+    """
+    AssetReliabilityMonth.query.delete(synchronize_session=False)
+    totals = {}
+
+    def bucket(asset_id, moment):
+        key = (asset_id, month_start(moment))
+        if key not in totals:
+            totals[key] = dict.fromkeys(COUNTERS, 0)
+            totals[key]['last_failure_at'] = None
+        return totals[key]
+
+    previous = {}
+    reports = db.session.query(Report.asset_id, Report.created_at).filter(
+        Report.created_at.isnot(None)
+    ).order_by(Report.asset_id, Report.created_at).yield_per(batch_size)
+    for asset_id, created_at in reports:
+        row = bucket(asset_id, created_at)
+        row['failures'] += 1
+        row['last_failure_at'] = created_at
+        if asset_id in previous:
+            row['failure_gaps'] += 1
+            row['failure_gap_seconds'] += int((created_at - previous[asset_id]).total_seconds())
+        previous[asset_id] = created_at
+
+    repairs = db.session.query(Report.asset_id, Report.created_at, WorkOrder.completion_date).join(
+        Report, Report.id == WorkOrder.report_id
+    ).filter(
+        WorkOrder.status.in_(('COMPLETADO', 'CERRADO')),
+        WorkOrder.completion_date.isnot(None),
+        Report.created_at.isnot(None)
+    ).yield_per(batch_size)
+    for asset_id, reported_at, completed_at in repairs:
+        row = bucket(asset_id, completed_at)
+        row['repairs'] += 1
+        row['repair_seconds'] += max(0, int((completed_at - reported_at).total_seconds()))
+
+    rows = [dict(asset_id=asset_id, month=month, **values) for (asset_id, month), values in totals.items()]
+    for i in range(0, len(rows), batch_size):
+        db.session.execute(insert(AssetReliabilityMonth), rows[i:i + batch_size])
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,220 @@
+"""
+Bulk asset import and export
+Uploads are read as a stream, validated in chunks and inserted with multi-row INSERTs,
+committing once per chunk so a large file never holds one long transaction.
+Exports walk the table in primary-key batches and stream CSV or JSON Lines.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import insert
+from app.extensions import db
+from app.modules.assets.models import Asset
+from app.common.pagination import iter_by_id
+from app.common.validators import validate_asset_type, validate_asset_status, validate_criticality
+
+FORMATS = ('csv', 'jsonl')
+
+EXPORT_FIELDS = ['id', 'name', 'description', 'type', 'location', 'serial_number', 'status', 'criticality', 'created_at']
+
+# column -> max length, from the model
+MAX_LENGTHS = {'name': 100, 'location': 100, 'serial_number': 100}
+
+REQUIRED_FIELDS = ('name', 'type', 'location')
+
+
+def detect_format(requested=None, filename=None):
+    """Format from ?format=, else from the file extension, else CSV"""
+    fmt = (requested or '').lower()
+    if not fmt and filename and '.' in filename:
+        fmt = filename.rsplit('.', 1)[1].lower()
+        if fmt in ('json', 'ndjson'):
+            fmt = 'jsonl'
+    fmt = fmt or 'csv'
+    if fmt not in FORMATS:
+        raise ValueError(f'Formato no soportado. Debe ser uno de: {", ".join(FORMATS)}')
+    return fmt
+
+
+# ============================================
+# IMPORT
+# ============================================
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def validate_row(raw):
+    """
+    Normalize one input row into insert values
+
+    Returns:
+        (values, errors): values is None when errors is not empty
+    """
+    row = {key.strip().lower(): _clean(value) for key, value in raw.items() if key}
+    errors = []
+
+    for field in REQUIRED_FIELDS:
+        if not row.get(field):
+            errors.append(f'Campo requerido: {field}')
+
+    for field, max_length in MAX_LENGTHS.items():
+        if row.get(field) and len(row[field]) > max_length:
+            errors.append(f'{field} excede {max_length} caracteres')
+
+    values = {
+        'name': row.get('name'),
+        'description': row.get('description'),
+        'location': row.get('location'),
+        'serial_number': row.get('serial_number'),
+    }
+    for field, validator, default in (
+        ('type', validate_asset_type, None),
+        ('status', validate_asset_status, 'OPERATIVO'),
+        ('criticality', validate_criticality, 'MEDIA'),
+    ):
+        value = row.get(field)
+        if value is None:
+            values[field] = default
+            continue
+        try:
+            values[field] = validator(value.upper())
+        except ValueError as e:
+            errors.append(str(e))
+
+    if errors:
+        return None, errors
+    return values, []
+
+
+def read_rows(stream, fmt):
+    """Yield (row_number, dict or error message) from a binary upload stream"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        # Row 1 is the header, so data rows are numbered as in a spreadsheet
+        for number, row in enumerate(csv.DictReader(text), start=2):
+            yield number, row
+        return
+
+    for number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, 'JSON inválido'
+            continue
+        yield number, row if isinstance(row, dict) else 'Cada línea debe ser un objeto JSON'
+
+
+def import_assets(stream, fmt, dry_run=False, batch_size=None, max_errors=None):
+    """
+    Validate and insert every row of an uploaded file
+
+    Valid rows are inserted chunk by chunk, each chunk in its own transaction;
+    invalid rows are skipped and reported with their row number.
+
+    Args:
+        stream: Binary file-like object with the upload
+        fmt: 'csv' or 'jsonl'
+        dry_run: Only validate, insert nothing
+
+    Returns:
+        Dict with processed/inserted/failed counts and the per-row errors; file_error
+        is set (with a row=None entry in errors) when the file itself could not be read
+    """
+    config = current_app.config
+    batch_size = batch_size or config.get('ASSET_IMPORT_BATCH_SIZE', 1000)
+    max_errors = max_errors or config.get('ASSET_IMPORT_MAX_ERRORS', 1000)
+
+    summary = {'processed': 0, 'inserted': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+    chunk = []
+
+    def flush():
+        if chunk and not dry_run:
+            now = datetime.utcnow()
+            for values in chunk:
+                values['created_at'] = now
+                values['updated_at'] = now
+            db.session.execute(insert(Asset), chunk)
+            db.session.commit()
+            summary['inserted'] += len(chunk)
+        chunk.clear()
+
+    try:
+        for number, raw in read_rows(stream, fmt):
+            summary['processed'] += 1
+            if isinstance(raw, str):
+                values, errors = None, [raw]
+            else:
+                values, errors = validate_row(raw)
+
+            if errors:
+                summary['failed'] += 1
+                if len(summary['errors']) < max_errors:
+                    summary['errors'].append({'row': number, 'errors': errors})
+                else:
+                    summary['errors_truncated'] = True
+                continue
+
+            chunk.append(values)
+            if len(chunk) >= batch_size:
+                flush()
+    except UnicodeDecodeError:
+        summary['file_error'] = True
+        summary['errors'].append({'row': None, 'errors': ['El archivo debe estar codificado en UTF-8']})
+    except csv.Error as e:
+        summary['file_error'] = True
+        summary['errors'].append({'row': None, 'errors': [f'CSV mal formado: {e}']})
+
+    # Rows read before a file error are still inserted, like any earlier chunk
+    flush()
+    if dry_run:
+        summary['dry_run'] = True
+    return summary
+
+
+# ============================================
+# EXPORT
+# ============================================
+
+def _export_row(asset):
+    row = {field: getattr(asset, field) for field in EXPORT_FIELDS}
+    row['created_at'] = asset.created_at.isoformat() if asset.created_at else None
+    return row
+
+
+def export_assets(query, fmt):
+    """Stream every asset of the query as CSV or JSON Lines"""
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for assets in iter_by_id(query, Asset):
+            writer.writerows(_export_row(asset) for asset in assets)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_jsonl():
+        for assets in iter_by_id(query, Asset):
+            yield ''.join(json.dumps(_export_row(asset), ensure_ascii=False) + '\n' for asset in assets)
+
+    if fmt == 'csv':
+        body, mimetype = generate_csv(), 'text/csv'
+    else:
+        body, mimetype = generate_jsonl(), 'application/x-ndjson'
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=assets.{fmt}'}
+    )
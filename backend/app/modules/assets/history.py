@@ -0,0 +1,131 @@
+"""
+Maintenance timeline of one asset
+Reports and work orders are merged by a single UNION ALL query, already joined to the
+requester / technician names and cut at the cursor inside each branch, so a page costs
+one query whatever its size. Events are ordered by (at DESC, sort_key DESC), where
+sort_key = 2 * id for reports and 2 * id + 1 for work orders, which keeps the order total
+across both tables and lets the regular (created_at, id) cursor encoding be reused.
+"""
+from sqlalchemy import DateTime, String, and_, cast, func, literal, null, or_, select, true, union_all
+from sqlalchemy.orm import aliased
+from app.extensions import db
+from app.common.etag import make_etag
+from app.common.pagination import decode_cursor, encode_cursor
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _before(at, sort_key, cursor):
+    if cursor is None:
+        return true()
+    cursor_at, cursor_key = cursor
+    return or_(at < cursor_at, and_(at == cursor_at, sort_key < cursor_key))
+
+
+def _timeline(asset_id, cursor):
+    requester = aliased(User)
+    technician = aliased(User)
+
+    report_key = Report.id * 2
+    reports = select(
+        literal('report').label('type'),
+        Report.id.label('id'),
+        report_key.label('sort_key'),
+        Report.created_at.label('at'),
+        Report.status.label('status'),
+        Report.priority.label('priority'),
+        Report.description.label('text'),
+        requester.name.label('person'),
+        cast(null(), db.Integer).label('report_id'),
+        cast(null(), DateTime).label('completion_date'),
+    ).outerjoin(requester, requester.id == Report.requester_id).where(
+        Report.asset_id == asset_id,
+        _before(Report.created_at, report_key, cursor)
+    )
+
+    order_key = WorkOrder.id * 2 + 1
+    orders = select(
+        literal('work_order'),
+        WorkOrder.id,
+        order_key,
+        WorkOrder.created_at,
+        WorkOrder.status,
+        cast(null(), String(20)),
+        WorkOrder.notes,
+        technician.name,
+        WorkOrder.report_id,
+        WorkOrder.completion_date,
+    ).join(Report, Report.id == WorkOrder.report_id).outerjoin(
+        technician, technician.id == WorkOrder.technician_id
+    ).where(
+        Report.asset_id == asset_id,
+        _before(WorkOrder.created_at, order_key, cursor)
+    )
+
+    return union_all(reports, orders).subquery('timeline')
+
+
+def _serialize(row):
+    event = {
+        'type': row.type,
+        'id': row.id,
+        'at': row.at.isoformat() if row.at else None,
+        'status': row.status,
+    }
+    if row.type == 'report':
+        event.update(priority=row.priority, description=row.text, requester_name=row.person)
+    else:
+        event.update(
+            report_id=row.report_id,
+            notes=row.text,
+            technician_name=row.person,
+            completion_date=row.completion_date.isoformat() if row.completion_date else None
+        )
+    return event
+
+
+def history_page(asset_id, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of the asset timeline, newest first
+
+    Returns:
+        Dict with items and next_cursor (None on the last page)
+    """
+    cursor = decode_cursor(after) if after else None
+    timeline = _timeline(asset_id, cursor)
+
+    # One extra row tells whether another page exists without a COUNT
+    rows = db.session.execute(
+        select(timeline).order_by(timeline.c.at.desc(), timeline.c.sort_key.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].at, rows[-1].sort_key)
+    return {'items': [_serialize(row) for row in rows], 'next_cursor': next_cursor}
+
+
+def history_etag(asset_id):
+    """
+    ETag over everything the timeline shows, in one SELECT; None if the asset does not exist
+    """
+    asset_reports = select(Report.id).where(Report.asset_id == asset_id)
+    row = db.session.execute(select(
+        select(Asset.id).where(Asset.id == asset_id).scalar_subquery(),
+        select(func.max(Report.updated_at)).where(Report.asset_id == asset_id).scalar_subquery(),
+        select(func.count(Report.id)).where(Report.asset_id == asset_id).scalar_subquery(),
+        select(func.max(WorkOrder.updated_at)).where(WorkOrder.report_id.in_(asset_reports)).scalar_subquery(),
+        select(func.count(WorkOrder.id)).where(WorkOrder.report_id.in_(asset_reports)).scalar_subquery(),
+        # Requester and technician names
+        select(func.max(User.updated_at)).scalar_subquery(),
+    )).one()
+
+    if row[0] is None:
+        return None
+    return make_etag(*row)
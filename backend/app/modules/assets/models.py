@@ -1,4 +1,5 @@
 from app.extensions import db
+from app.common.columns import PRECISE_DATETIME
 from datetime import datetime
 
 class Asset(db.Model):
@@ -7,13 +8,13 @@ class Asset(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    type = db.Column(db.String(50), nullable=False) # EQUIPO, LOCATIVO, SERVICIO
+    type = db.Column(db.String(50), nullable=False, index=True) # EQUIPO, LOCATIVO, SERVICIO
     location = db.Column(db.String(100), nullable=True)
     serial_number = db.Column(db.String(100), nullable=True)
     status = db.Column(db.String(20), default='OPERATIVO') # OPERATIVO, FUERA DE SERVICIO, EN MANTENIMIENTO
     criticality = db.Column(db.String(20), default='MEDIA') # ALTA, MEDIA, BAJA
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
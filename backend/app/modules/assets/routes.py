@@ -1,16 +1,25 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from flask_jwt_extended import jwt_required
-from app.modules.assets import services
+from app.modules.assets import services, bulk, history
+from app.modules.assets.models import Asset
+from app.common.decorators import admin_required, query_budget
+from app.common.etag import list_etag, resource_etag, not_modified, with_etag
+from app.common.pagination import parse_limit
 
 assets_bp = Blueprint('assets', __name__)
 
 @assets_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(3)
 @jwt_required()
 def get_assets():
-    print("DEBUG: get_assets called")
-    type_filter = request.args.get('type')
-    assets = services.get_all_assets(type_filter)
-    return jsonify([asset.to_dict() for asset in assets]), 200
+    query = services.assets_query(request.args.get('type'))
+
+    etag = list_etag(query, Asset)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    return with_etag(jsonify([asset.to_dict() for asset in query.all()]), etag)
 
 @assets_bp.route('/', methods=['POST'], strict_slashes=False)
 @jwt_required()
@@ -39,11 +48,79 @@ def create_asset():
         # current_app.logger.error(f"Error creating asset: {str(e)}")
         return jsonify({'message': 'Internal Server Error'}), 500
 
+@assets_bp.route('/import', methods=['POST'])
+@query_budget(allow_repeats=True)
+@jwt_required()
+@admin_required
+def import_assets():
+    """
+    Bulk import from a CSV or JSON Lines upload (multipart field `file`, or the raw body)
+    Query params: format=csv|jsonl, dry_run=1
+    """
+    upload = request.files.get('file')
+    try:
+        fmt = bulk.detect_format(request.args.get('format'), upload.filename if upload else None)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    stream = upload.stream if upload else request.stream
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true')
+    summary = bulk.import_assets(stream, fmt, dry_run=dry_run)
+
+    if summary.get('file_error'):
+        status = 400
+    else:
+        status = 201 if summary['inserted'] else 200
+    return jsonify(summary), status
+
+@assets_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_assets():
+    try:
+        fmt = bulk.detect_format(request.args.get('format'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = Asset.query
+    if request.args.get('type'):
+        query = query.filter_by(type=request.args.get('type'))
+    return bulk.export_assets(query, fmt)
+
 @assets_bp.route('/<int:id>', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 def get_asset(id):
+    etag = resource_etag(Asset, id)
+    if etag is None:
+        abort(404)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     asset = services.get_asset_by_id(id)
-    return jsonify(asset.to_dict()), 200
+    return with_etag(jsonify(asset.to_dict()), etag)
+
+@assets_bp.route('/<int:id>/history', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+def get_asset_history(id):
+    """
+    Reports and work orders of the asset, newest first: ?limit=20&after=<cursor>
+    Answered with 304 when nothing changed since the client's copy.
+    """
+    etag = history.history_etag(id)
+    if etag is None:
+        abort(404)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    try:
+        limit = parse_limit(request.args.get('limit'), default=history.DEFAULT_PAGE_SIZE, maximum=history.MAX_PAGE_SIZE)
+        page = history.history_page(id, request.args.get('after'), limit)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return with_etag(jsonify(page), etag)
 
 @assets_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
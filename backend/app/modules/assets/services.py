@@ -1,11 +1,14 @@
 from app.extensions import db
 from app.modules.assets.models import Asset
 
-def get_all_assets(type_filter=None):
+def assets_query(type_filter=None):
     query = Asset.query
     if type_filter:
         query = query.filter_by(type=type_filter)
-    return query.all()
+    return query
+
+def get_all_assets(type_filter=None):
+    return assets_query(type_filter).all()
 
 def get_asset_by_id(asset_id):
     return Asset.query.get_or_404(asset_id)
@@ -40,7 +43,9 @@ def update_existing_asset(asset_id, data):
     return asset
 
 def delete_existing_asset(asset_id):
+    from app.modules.sync.services import record_deletion
     asset = Asset.query.get_or_404(asset_id)
     db.session.delete(asset)
+    record_deletion('assets', asset_id)
     db.session.commit()
     return True
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required
 from app.extensions import db
+from app.common.auth import build_token_claims, get_current_user
 from app.modules.users.models import User
 
 auth_bp = Blueprint('auth', __name__)
@@ -43,7 +44,12 @@ def login():
     
     # Check user exists, password is correct, and account is active
     if user and user.is_active and user.check_password(data.get('password')):
-        access_token = create_access_token(identity=str(user.id))
+        # Persist a hash upgraded to the current BCRYPT_ROUNDS (nothing to write otherwise)
+        db.session.commit()
+        access_token = create_access_token(
+            identity=str(user.id),
+            additional_claims=build_token_claims(user)
+        )
         return jsonify({
             'access_token': access_token,
             'user': user.to_dict()
@@ -55,6 +61,5 @@ def login():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def me():
-    current_user_id = int(get_jwt_identity())  # Convert string back to int
-    user = User.query.get(current_user_id)
+    user = get_current_user()
     return jsonify(user.to_dict()), 200
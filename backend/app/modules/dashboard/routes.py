@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app.modules.dashboard import services
+from app.common.auth import get_current_user
+from app.common.decorators import query_budget
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@query_budget(8)
+@jwt_required()
+def get_summary():
+    user = get_current_user()
+
+    if not user:
+        return jsonify({'message': 'User not found'}), 404
+
+    return jsonify(services.get_summary(user)), 200
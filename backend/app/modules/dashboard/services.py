@@ -0,0 +1,85 @@
+from flask import current_app
+from sqlalchemy import func
+from app.extensions import db
+from app.common.cache import TTLCache
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.reports import services as report_services
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+from app.modules.work_orders import services as work_order_services
+
+RECENT_ITEMS = 5
+
+_summary_cache = TTLCache(ttl=15)
+
+
+def _scope_reports(query, user):
+    """Requesters only see their own reports"""
+    if user.role == 'requester':
+        query = query.filter(Report.requester_id == user.id)
+    return query
+
+
+def _scope_work_orders(query, user):
+    """Technicians see their assigned orders, requesters the orders of their reports"""
+    if user.role == 'technician':
+        query = query.filter(WorkOrder.technician_id == user.id)
+    elif user.role == 'requester':
+        query = query.join(Report, WorkOrder.report_id == Report.id).filter(Report.requester_id == user.id)
+    return query
+
+
+def _status_counts(query, status_column):
+    rows = query.group_by(status_column).all()
+    by_status = {status: count for status, count in rows}
+    return {'total': sum(by_status.values()), 'by_status': by_status}
+
+
+def _technician_load(user):
+    """Open work orders per active technician, read from the workload counters"""
+    if user.role == 'requester':
+        return []
+
+    query = db.session.query(User.id, User.name, User.open_work_orders).filter(
+        User.role == 'technician', User.is_active.is_(True)
+    )
+
+    if user.role == 'technician':
+        query = query.filter(User.id == user.id)
+
+    rows = query.order_by(User.name).all()
+    return [{'id': tech_id, 'name': name, 'open_orders': count} for tech_id, name, count in rows]
+
+
+def build_summary(user):
+    reports_query = _scope_reports(db.session.query(Report.status, func.count(Report.id)), user)
+    orders_query = _scope_work_orders(db.session.query(WorkOrder.status, func.count(WorkOrder.id)), user)
+
+    recent_reports = _scope_reports(
+        report_services.with_serialization_relations(Report.query), user
+    ).order_by(Report.created_at.desc(), Report.id.desc()).limit(RECENT_ITEMS).all()
+
+    recent_orders = _scope_work_orders(
+        work_order_services.with_serialization_relations(WorkOrder.query), user
+    ).order_by(WorkOrder.created_at.desc(), WorkOrder.id.desc()).limit(RECENT_ITEMS).all()
+
+    return {
+        'reports': _status_counts(reports_query, Report.status),
+        'work_orders': _status_counts(orders_query, WorkOrder.status),
+        'assets': {'total': db.session.query(func.count(Asset.id)).scalar()},
+        'technicians': _technician_load(user),
+        'recent_reports': [report.to_dict() for report in recent_reports],
+        'recent_work_orders': [order.to_dict() for order in recent_orders]
+    }
+
+
+def get_summary(user):
+    """Role-scoped dashboard summary, cached for DASHBOARD_CACHE_TTL seconds"""
+    # Admins share one entry; other roles are scoped to the caller
+    key = ('admin',) if user.role == 'admin' else (user.role, user.id)
+    return _summary_cache.get_or_set(
+        key,
+        lambda: build_summary(user),
+        ttl=current_app.config.get('DASHBOARD_CACHE_TTL', 15)
+    )
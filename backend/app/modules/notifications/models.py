@@ -0,0 +1,34 @@
+from app.extensions import db
+from datetime import datetime
+
+class NotificationOutbox(db.Model):
+    """Pending provider deliveries (email, WhatsApp, web push) written with the domain change"""
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        # Worker poll: due rows by status
+        db.Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(50), nullable=False) # e.g. email.work_order_assigned, push.users
+    payload = db.Column(db.Text, nullable=False) # JSON with entity ids, never full objects
+
+    status = db.Column(db.String(20), nullable=False, default='PENDING') # PENDING, PROCESSING, SENT, FAILED
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event': self.event,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
@@ -0,0 +1,330 @@
+"""
+Transactional notification outbox
+Call sites enqueue deliveries in the same session as the domain change; the worker
+pool in worker.py drains the table and retries failures with exponential backoff.
+One row is written per provider so a failing channel never re-sends the others.
+"""
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import insert, or_
+from app.extensions import db
+from app.modules.notifications.models import NotificationOutbox
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+# Marks a session holding uncommitted outbox rows so the worker can be woken on commit
+SESSION_FLAG = 'notification_outbox_pending'
+
+
+def enqueue_many(deliveries):
+    """
+    Add several deliveries to the current transaction with one executemany.
+    The caller commits.
+
+    Args:
+        deliveries: Iterable of (event, payload dict)
+    """
+    rows = []
+    for event, payload in deliveries:
+        if event not in HANDLERS:
+            raise ValueError(f'Unknown notification event: {event}')
+        rows.append({'event': event, 'payload': json.dumps(payload)})
+
+    if rows:
+        # Core insert: the ORM would issue one INSERT per row to fetch each primary key
+        db.session.execute(insert(NotificationOutbox), rows)
+        db.session.info[SESSION_FLAG] = True
+
+
+def enqueue(event, **payload):
+    """Add a delivery to the current transaction. The caller commits."""
+    enqueue_many([(event, payload)])
+
+
+# ============================================
+# ENQUEUE HELPERS (used by routes/services)
+# ============================================
+
+def notify_work_order_assigned(work_order, technician, push_message):
+    """Email, WhatsApp and push to the technician assigned to work_order"""
+    enqueue_many([
+        ('email.work_order_assigned', {'work_order_id': work_order.id, 'technician_id': technician.id}),
+        ('whatsapp.technician_assignment', {'work_order_id': work_order.id, 'technician_id': technician.id}),
+        ('push.users', {'user_ids': [technician.id], 'message': push_message, 'title': 'Orden Asignada'}),
+    ])
+
+
+def notify_report_assigned(work_order, requester):
+    """Email, WhatsApp and push to the requester whose report got a technician"""
+    enqueue_many([
+        ('whatsapp.status_update', {'work_order_id': work_order.id, 'requester_id': requester.id}),
+        ('email.work_order_status_update', {'work_order_id': work_order.id, 'requester_id': requester.id}),
+        ('push.users', {
+            'user_ids': [requester.id],
+            'message': f'Tu reporte #{work_order.report_id} ha sido asignado',
+            'title': 'Reporte Asignado'
+        }),
+    ])
+
+
+def notify_report_created(report, requester, admins):
+    """Confirmation to the requester and new report alerts to every admin"""
+    deliveries = [
+        ('whatsapp.report_confirmation', {'report_id': report.id, 'requester_id': requester.id}),
+        ('push.users', {
+            'user_ids': [requester.id],
+            'message': f'Reporte #{report.id} recibido. Te notificaremos cuando sea asignado.',
+            'title': 'Reporte Creado'
+        }),
+        ('email.new_report', {'report_id': report.id, 'requester_id': requester.id}),
+    ]
+    if admins:
+        admin_ids = [admin.id for admin in admins]
+        deliveries += [
+            ('whatsapp.new_report_admins', {
+                'report_id': report.id, 'requester_id': requester.id, 'admin_ids': admin_ids
+            }),
+            ('push.users', {
+                'user_ids': admin_ids,
+                'message': f'Nuevo reporte #{report.id} - Prioridad {report.priority}',
+                'title': 'Nuevo Reporte'
+            }),
+        ]
+    enqueue_many(deliveries)
+
+
+def format_id_list(ids, limit=5):
+    """'#1, #2, #3' or '#1, #2, #3, #4, #5 y 7 más' for coalesced messages"""
+    shown = ', '.join(f'#{entity_id}' for entity_id in ids[:limit])
+    if len(ids) > limit:
+        return f'{shown} y {len(ids) - limit} más'
+    return shown
+
+
+def notify_bulk_status_change(messages, title):
+    """
+    One push fan-out for a bulk transition
+
+    Args:
+        messages: Dict of user_id -> message already coalesced per user
+    """
+    if messages:
+        enqueue('push.batch', messages={str(user_id): message for user_id, message in messages.items()}, title=title)
+
+
+# ============================================
+# DELIVERY HANDLERS (run by the worker)
+# ============================================
+
+def _get(model, entity_id):
+    return db.session.get(model, entity_id) if entity_id is not None else None
+
+
+def _email_work_order_assigned(payload):
+    from app.common.email_service import send_work_order_assigned_notification
+    send_work_order_assigned_notification(
+        _get(WorkOrder, payload['work_order_id']), _get(User, payload['technician_id']), sync=True
+    )
+
+
+def _email_work_order_status_update(payload):
+    from app.common.email_service import send_work_order_status_update_notification
+    send_work_order_status_update_notification(
+        _get(WorkOrder, payload['work_order_id']), _get(User, payload['requester_id']), sync=True
+    )
+
+
+def _email_new_report(payload):
+    """Concurrent fan-out; admins whose email failed get their own row to retry"""
+    from app.common.email_service import send_new_report_notification
+    report = _get(Report, payload['report_id'])
+    if not report:
+        return
+
+    failed = send_new_report_notification(report, _get(User, payload['requester_id']))
+    enqueue_many(
+        ('email.new_report_admin', {'report_id': report.id, 'requester_id': payload['requester_id'], 'admin_id': admin.id})
+        for admin, _ in failed
+    )
+    if failed:
+        db.session.commit()
+
+
+def _email_new_report_admin(payload):
+    from app.common.email_service import send_new_report_notification
+    admin = _get(User, payload['admin_id'])
+    report = _get(Report, payload['report_id'])
+    if admin and report:
+        failed = send_new_report_notification(report, _get(User, payload['requester_id']), admins=[admin])
+        if failed:
+            raise failed[0][1]
+
+
+def _whatsapp_technician_assignment(payload):
+    from app.common.whatsapp_service import notify_technician_assignment
+    technician = _get(User, payload['technician_id'])
+    work_order = _get(WorkOrder, payload['work_order_id'])
+    if technician and work_order:
+        notify_technician_assignment(technician, work_order)
+
+
+def _whatsapp_status_update(payload):
+    from app.common.whatsapp_service import notify_status_update
+    requester = _get(User, payload['requester_id'])
+    work_order = _get(WorkOrder, payload['work_order_id'])
+    if requester and work_order:
+        notify_status_update(requester, work_order)
+
+
+def _whatsapp_new_report_admin(payload):
+    from app.common.whatsapp_service import notify_new_report_to_admin
+    admin = _get(User, payload['admin_id'])
+    report = _get(Report, payload['report_id'])
+    if admin and report:
+        notify_new_report_to_admin(admin, report, _get(User, payload['requester_id']))
+
+
+def _whatsapp_new_report_admins(payload):
+    """Concurrent fan-out; admins whose message failed get their own row to retry"""
+    from app.common.whatsapp_service import notify_new_report_to_admins
+    report = _get(Report, payload['report_id'])
+    if not report:
+        return
+
+    admins = User.query.filter(User.id.in_(payload['admin_ids'])).all()
+    failed = notify_new_report_to_admins(admins, report, _get(User, payload['requester_id']))
+    enqueue_many(
+        ('whatsapp.new_report_admin', {'report_id': report.id, 'requester_id': payload['requester_id'], 'admin_id': admin.id})
+        for admin in failed
+    )
+    if failed:
+        db.session.commit()
+
+
+def _whatsapp_report_confirmation(payload):
+    from app.common.whatsapp_service import notify_report_creation_confirmation
+    requester = _get(User, payload['requester_id'])
+    report = _get(Report, payload['report_id'])
+    if requester and report:
+        notify_report_creation_confirmation(requester, report)
+
+
+def _push_users(payload):
+    from app.modules.push.service import send_push_to_user_ids
+    send_push_to_user_ids(payload['user_ids'], payload['message'], payload.get('title', 'MAFIS'))
+
+
+def _push_batch(payload):
+    from app.modules.push.service import send_push_batch
+    send_push_batch(payload['messages'], payload.get('title', 'MAFIS'))
+
+
+HANDLERS = {
+    'email.work_order_assigned': _email_work_order_assigned,
+    'email.work_order_status_update': _email_work_order_status_update,
+    'email.new_report': _email_new_report,
+    'email.new_report_admin': _email_new_report_admin,
+    'whatsapp.technician_assignment': _whatsapp_technician_assignment,
+    'whatsapp.status_update': _whatsapp_status_update,
+    'whatsapp.new_report_admin': _whatsapp_new_report_admin,
+    'whatsapp.new_report_admins': _whatsapp_new_report_admins,
+    'whatsapp.report_confirmation': _whatsapp_report_confirmation,
+    'push.users': _push_users,
+    'push.batch': _push_batch,
+}
+
+
+# ============================================
+# DRAINING
+# ============================================
+
+def claim_due(limit):
+    """
+    Claim up to `limit` due rows for this worker.
+
+    A claim is a conditional UPDATE, so concurrent workers (threads or processes)
+    never deliver the same row twice. The lease doubles as crash recovery: rows
+    left PROCESSING by a dead worker become due again once it expires.
+    """
+    now = datetime.utcnow()
+    lease = now + timedelta(seconds=current_app.config.get('NOTIFICATION_LEASE_SECONDS', 300))
+    due = NotificationOutbox.status.in_(['PENDING', 'PROCESSING']) & (NotificationOutbox.next_attempt_at <= now)
+
+    candidate_ids = [
+        row_id for (row_id,) in db.session.query(NotificationOutbox.id)
+        .filter(due).order_by(NotificationOutbox.next_attempt_at).limit(limit).all()
+    ]
+
+    claimed = []
+    for row_id in candidate_ids:
+        updated = NotificationOutbox.query.filter(NotificationOutbox.id == row_id, due).update(
+            {'status': 'PROCESSING', 'next_attempt_at': lease}, synchronize_session=False
+        )
+        db.session.commit()
+        if updated:
+            claimed.append(row_id)
+    return claimed
+
+
+def deliver(row_id):
+    """Run the handler for one claimed row and record the outcome"""
+    row = db.session.get(NotificationOutbox, row_id)
+    if row is None:
+        return False
+
+    try:
+        HANDLERS[row.event](json.loads(row.payload))
+    except Exception as e:
+        db.session.rollback()
+        row = db.session.get(NotificationOutbox, row_id)
+        row.attempts += 1
+        row.last_error = str(e)[:1000]
+        if row.attempts >= current_app.config.get('NOTIFICATION_MAX_ATTEMPTS', 5):
+            row.status = 'FAILED'
+            current_app.logger.error(f'Notification {row.id} ({row.event}) failed permanently: {e}')
+        else:
+            backoff = current_app.config.get('NOTIFICATION_RETRY_DELAY', 30) * 2 ** (row.attempts - 1)
+            row.status = 'PENDING'
+            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff)
+            current_app.logger.warning(f'Notification {row.id} ({row.event}) failed, retrying in {backoff}s: {e}')
+        db.session.commit()
+        return False
+
+    row.status = 'SENT'
+    row.sent_at = datetime.utcnow()
+    db.session.commit()
+    return True
+
+
+def drain(limit=None, batch_size=50):
+    """Deliver due rows synchronously until none are left (or `limit` are processed)"""
+    processed = 0
+    while limit is None or processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - processed)
+        claimed = claim_due(size)
+        if not claimed:
+            break
+        for row_id in claimed:
+            deliver(row_id)
+        processed += len(claimed)
+    return processed
+
+
+def queue_stats():
+    rows = db.session.query(NotificationOutbox.status, db.func.count(NotificationOutbox.id)).group_by(
+        NotificationOutbox.status
+    ).all()
+    return {status: count for status, count in rows}
+
+
+def purge_sent(older_than_days=7):
+    """Delete delivered rows older than the given age"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    deleted = NotificationOutbox.query.filter(
+        NotificationOutbox.status == 'SENT',
+        or_(NotificationOutbox.sent_at < cutoff, NotificationOutbox.sent_at.is_(None))
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
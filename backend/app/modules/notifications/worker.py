@@ -0,0 +1,147 @@
+"""
+Background worker pool that drains the notification outbox
+Started lazily on the first request (NOTIFICATION_WORKER_ENABLED) or run on its own
+with `flask notifications worker`.
+"""
+import threading
+import click
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.modules.notifications import services
+
+
+class OutboxWorker:
+    """Fixed pool of threads, each claiming and delivering outbox rows"""
+
+    def __init__(self, app, workers=4, poll_interval=2.0, batch_size=10):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'outbox-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def wake(self):
+        """Skip the poll wait; called after a commit that wrote outbox rows"""
+        self._wake.set()
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    claimed = services.claim_due(self.batch_size)
+                    for row_id in claimed:
+                        services.deliver(row_id)
+                except Exception as e:
+                    db.session.rollback()
+                    current_app.logger.error(f'Outbox worker error: {e}')
+                    claimed = []
+                finally:
+                    db.session.remove()
+
+                # A full batch means more rows are probably due; go again right away
+                if len(claimed) < self.batch_size:
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_worker_after_commit(session):
+    if not session.info.pop(services.SESSION_FLAG, False):
+        return
+    try:
+        worker = current_app.extensions.get('notification_worker')
+    except RuntimeError:
+        return
+    if worker:
+        worker.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _clear_flag_after_rollback(session):
+    session.info.pop(services.SESSION_FLAG, None)
+
+
+def init_app(app):
+    worker = OutboxWorker(
+        app,
+        workers=app.config.get('NOTIFICATION_WORKERS', 4),
+        poll_interval=app.config.get('NOTIFICATION_POLL_INTERVAL', 2.0)
+    )
+    app.extensions['notification_worker'] = worker
+
+    if app.config.get('NOTIFICATION_WORKER_ENABLED'):
+        # Start on the first request so CLI commands (db upgrade, seeds) never spawn workers
+        @app.before_request
+        def start_notification_worker():
+            if not worker.running:
+                worker.start()
+
+    app.cli.add_command(notifications_cli)
+
+
+@click.group('notifications')
+def notifications_cli():
+    """Notification outbox commands"""
+
+
+@notifications_cli.command('worker')
+def run_worker():
+    """Run the outbox worker pool in the foreground"""
+    worker = current_app.extensions['notification_worker']
+    worker.start()
+    click.echo(f'Outbox worker running with {worker.workers} threads. Ctrl+C to stop.')
+    try:
+        while worker.running:
+            worker._stop.wait(1)
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+@notifications_cli.command('drain')
+def drain_outbox():
+    """Deliver every due row once and exit"""
+    click.echo(f'Delivered {services.drain()} notifications')
+
+
+@notifications_cli.command('stats')
+def outbox_stats():
+    """Show outbox row counts by status and the email sender queue depth"""
+    for status, count in sorted(services.queue_stats().items()):
+        click.echo(f'{status}: {count}')
+
+    from app.common.email_service import get_email_queue_depth
+    click.echo(f'email queue depth: {get_email_queue_depth()}')
+
+
+@notifications_cli.command('purge')
+@click.option('--days', default=7, show_default=True, help='Delete SENT rows older than this')
+def purge_outbox(days):
+    """Delete delivered rows"""
+    click.echo(f'Deleted {services.purge_sent(days)} rows')
@@ -0,0 +1,120 @@
+"""
+Parallel Web Push delivery
+Caches the signed VAPID header per push-service origin until shortly before it expires,
+keeps one HTTP session per origin and sends through a bounded thread pool.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from py_vapid import Vapid
+from pywebpush import WebPusher
+
+# Statuses meaning the subscription is gone for good and should be deleted
+GONE_STATUSES = (404, 410)
+
+# Re-sign this many seconds before the cached VAPID JWT expires
+VAPID_REFRESH_MARGIN = 300
+
+
+class PushResult:
+    __slots__ = ('endpoint', 'status_code', 'error')
+
+    def __init__(self, endpoint, status_code=None, error=None):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and self.status_code is not None and self.status_code <= 202
+
+    @property
+    def gone(self):
+        return self.status_code in GONE_STATUSES
+
+
+class PushEngine:
+    def __init__(self, vapid_private_key, claim_email, max_workers=8, vapid_ttl=12 * 60 * 60, timeout=10):
+        self.claim_email = claim_email
+        self.vapid_ttl = vapid_ttl
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._vapid = Vapid.from_string(private_key=vapid_private_key)
+        self._headers = {}   # origin -> (expires_at, headers)
+        self._sessions = {}  # origin -> requests.Session
+        self._lock = threading.Lock()
+        self._sign_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='web-push')
+
+    @staticmethod
+    def origin_of(endpoint):
+        url = urlparse(endpoint)
+        return f'{url.scheme}://{url.netloc}'
+
+    def vapid_headers(self, origin):
+        """Signed VAPID header for a push service, reused until near expiry"""
+        with self._sign_lock:
+            now = time.time()
+            cached = self._headers.get(origin)
+            if cached and cached[0] - VAPID_REFRESH_MARGIN > now:
+                return cached[1]
+
+            expires_at = int(now) + self.vapid_ttl
+            headers = self._vapid.sign({'sub': self.claim_email, 'aud': origin, 'exp': expires_at})
+            self._headers[origin] = (expires_at, headers)
+            return headers
+
+    def session(self, origin):
+        """One keep-alive HTTP session per push service"""
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers))
+                self._sessions[origin] = session
+            return session
+
+    def send(self, subscription_info, payload, ttl=0):
+        endpoint = subscription_info.get('endpoint', '')
+        try:
+            origin = self.origin_of(endpoint)
+            response = WebPusher(subscription_info, requests_session=self.session(origin)).send(
+                payload,
+                dict(self.vapid_headers(origin)),
+                ttl=ttl,
+                content_encoding='aes128gcm',
+                timeout=self.timeout
+            )
+        except Exception as e:
+            return PushResult(endpoint, error=e)
+
+        if response.status_code > 202:
+            return PushResult(endpoint, response.status_code, f'{response.status_code} {response.reason}')
+        return PushResult(endpoint, response.status_code)
+
+    def send_many(self, subscriptions, payload, ttl=0):
+        """Send one payload to many subscriptions in parallel; results keep input order"""
+        return list(self._executor.map(lambda sub: self.send(sub, payload, ttl), subscriptions))
+
+    def send_each(self, deliveries, ttl=0):
+        """Send (subscription, payload) pairs in parallel; results keep input order"""
+        return list(self._executor.map(lambda item: self.send(item[0], item[1], ttl), deliveries))
+
+
+_engine_lock = threading.Lock()
+_engine = None
+_engine_key = None
+
+
+def get_push_engine(vapid_private_key, claim_email, max_workers=8, vapid_ttl=12 * 60 * 60):
+    """Process-wide engine, rebuilt only if the VAPID configuration changes"""
+    global _engine, _engine_key
+    key = (vapid_private_key, claim_email, max_workers, vapid_ttl)
+    with _engine_lock:
+        if _engine is None or _engine_key != key:
+            _engine = PushEngine(vapid_private_key, claim_email, max_workers=max_workers, vapid_ttl=vapid_ttl)
+            _engine_key = key
+        return _engine
@@ -6,7 +6,7 @@ class PushSubscription(db.Model):
     __tablename__ = 'push_subscriptions'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     endpoint = db.Column(db.String(500), nullable=False, unique=True)
     p256dh = db.Column(db.String(200), nullable=False)
     auth = db.Column(db.String(50), nullable=False)
@@ -4,90 +4,203 @@ Handles sending push notifications using VAPID
 """
 import os
 import json
-from pywebpush import webpush, WebPushException
 from flask import current_app
+from app.extensions import db
+
+def build_payload(message_body, title="MAFIS"):
+    """Notification payload shown by the service worker"""
+    return json.dumps({
+        'title': title,
+        'body': message_body,
+        'icon': '/pwa-192x192.png',
+        'badge': '/pwa-192x192.png',
+        'vibrate': [200, 100, 200],
+        'data': {
+            'url': '/'
+        }
+    })
+
+def get_engine():
+    """Shared PushEngine, or None when VAPID is not configured"""
+    vapid_private_key = os.environ.get('VAPID_PRIVATE_KEY')
+    if not vapid_private_key:
+        return None
+
+    from app.modules.push.engine import get_push_engine
+    return get_push_engine(
+        vapid_private_key,
+        os.environ.get('VAPID_CLAIM_EMAIL', 'mailto:admin@mafis.sena.edu.co'),
+        max_workers=current_app.config.get('PUSH_MAX_CONCURRENCY', 8),
+        vapid_ttl=current_app.config.get('PUSH_VAPID_TTL', 12 * 60 * 60)
+    )
+
+def send_to_subscriptions(subscriptions, message_body, title="MAFIS"):
+    """
+    Send one notification to many subscriptions in parallel
+
+    Subscriptions answered with 404/410 are deleted in a single statement.
+
+    Args:
+        subscriptions: List of subscription dicts (endpoint + keys)
+        message_body: String message to send
+        title: Notification title
+
+    Returns:
+        Number of notifications accepted by the push services
+    """
+    if not subscriptions:
+        return 0
+
+    payload = build_payload(message_body, title)
+    return _deliver([(subscription, payload) for subscription in subscriptions], f'{title} - {message_body}')
+
+def _deliver(deliveries, description):
+    """Send (subscription, payload) pairs through the engine and prune dead subscriptions"""
+    engine = get_engine()
+    if engine is None:
+        current_app.logger.warning("[WEB PUSH MOCK] No VAPID keys configured")
+        current_app.logger.info(f"[WEB PUSH MOCK] Would send to {len(deliveries)} subscriptions: {description}")
+        return 0
+
+    results = engine.send_each(deliveries)
+
+    gone = [result.endpoint for result in results if result.gone]
+    for result in results:
+        if not result.ok and not result.gone:
+            current_app.logger.error(f"Web Push failed for {result.endpoint[:50]}...: {result.error}")
+
+    if gone:
+        prune_subscriptions(gone)
+
+    sent = sum(1 for result in results if result.ok)
+    current_app.logger.info(f"Web Push sent {sent}/{len(results)}, pruned {len(gone)} expired subscriptions")
+    return sent
+
+def prune_subscriptions(endpoints):
+    """Bulk-delete subscriptions the push service reported as gone"""
+    from app.modules.push.models import PushSubscription
+
+    deleted = PushSubscription.query.filter(PushSubscription.endpoint.in_(endpoints)).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+    current_app.logger.warning(f"Removed {deleted} expired/invalid push subscriptions")
+    return deleted
 
 def send_web_push(subscription_info, message_body, title="MAFIS"):
     """
     Send a web push notification
-    
+
     Args:
         subscription_info: Dict with endpoint, p256dh, and auth keys
         message_body: String message to send
         title: Notification title
     """
-    vapid_private_key = os.environ.get('VAPID_PRIVATE_KEY')
-    vapid_claim_email = os.environ.get('VAPID_CLAIM_EMAIL', 'mailto:admin@mafis.sena.edu.co')
-    
-    if not vapid_private_key:
-        current_app.logger.warning("[WEB PUSH MOCK] No VAPID keys configured")
-        print(f"⚠️ [WEB PUSH MOCK] Would send: {title} - {message_body}")
-        return
-    
-    try:
-        # Prepare notification payload
-        payload = json.dumps({
-            'title': title,
-            'body': message_body,
-            'icon': '/pwa-192x192.png',
-            'badge': '/pwa-192x192.png',
-            'vibrate': [200, 100, 200],
-            'data': {
-                'url': '/'
-            }
-        })
-        
-        # Send push notification
-        webpush(
-            subscription_info=subscription_info,
-            data=payload,
-            vapid_private_key=vapid_private_key,
-            vapid_claims={"sub": vapid_claim_email}
-        )
-        
-        current_app.logger.info(f"Web Push sent successfully to {subscription_info.get('endpoint', 'unknown')[:50]}...")
-        
-    except WebPushException as e:
-        current_app.logger.error(f"Web Push failed: {e}")
-        # If subscription is expired/invalid, we should remove it from DB
-        if e.response and e.response.status_code in [404, 410]:
-            current_app.logger.warning(f"Subscription expired/invalid: {subscription_info.get('endpoint', 'unknown')[:50]}...")
-    except Exception as e:
-        current_app.logger.error(f"Unexpected error sending Web Push: {e}")
+    return send_to_subscriptions([subscription_info], message_body, title)
+
+def _subscription_query(columns, user_ids=None, roles=None):
+    from app.modules.push.models import PushSubscription
+    from app.modules.users.models import User
+
+    query = db.session.query(*columns).join(User, User.id == PushSubscription.user_id).filter(
+        User.is_active.is_(True),
+        User.notify_push.is_(True)
+    )
+    if user_ids is not None:
+        query = query.filter(PushSubscription.user_id.in_(list(user_ids)))
+    if roles is not None:
+        query = query.filter(User.role.in_(list(roles)))
+    return query
+
+def resolve_subscriptions(user_ids=None, roles=None):
+    """
+    Subscriptions of active users with push enabled, resolved in one query
+
+    Args:
+        user_ids: Restrict to these user ids
+        roles: Restrict to users with these roles
+
+    Returns:
+        List of subscription dicts (endpoint + keys)
+    """
+    from app.modules.push.models import PushSubscription
+
+    if user_ids is not None and not user_ids:
+        return []
+
+    query = _subscription_query(
+        (PushSubscription.endpoint, PushSubscription.p256dh, PushSubscription.auth), user_ids, roles
+    )
+    return [
+        {'endpoint': endpoint, 'keys': {'p256dh': p256dh, 'auth': auth}}
+        for endpoint, p256dh, auth in query.all()
+    ]
 
 def send_push_to_user(user, message, title="MAFIS"):
     """
     Send push notification to all subscriptions of a user
-    
+
     Args:
         user: User model instance
         message: Message body
         title: Notification title
     """
-    from app.modules.push.models import PushSubscription
-    
-    subscriptions = PushSubscription.query.filter_by(user_id=user.id).all()
-    
-    if not subscriptions:
-        current_app.logger.info(f"No push subscriptions for user {user.id}")
-        return
-        
-    # Check preferences
-    if not getattr(user, 'notify_push', True):
-        current_app.logger.info(f"User {user.id} has disabled push notifications")
-        return
-    
-    for subscription in subscriptions:
-        send_web_push(subscription.to_dict(), message, title)
+    return send_push_to_user_ids([user.id], message, title)
 
 def send_push_to_users(users, message, title="MAFIS"):
     """
     Send push notification to multiple users
-    
+
     Args:
         users: List of User model instances
         message: Message body
         title: Notification title
     """
-    for user in users:
-        send_push_to_user(user, message, title)
+    return send_push_to_user_ids([user.id for user in users], message, title)
+
+def send_push_to_user_ids(user_ids, message, title="MAFIS"):
+    """Send push notification to users by id without loading them"""
+    subscriptions = resolve_subscriptions(user_ids=user_ids)
+    if not subscriptions:
+        current_app.logger.info(f"No push subscriptions for users {list(user_ids)}")
+        return 0
+    return send_to_subscriptions(subscriptions, message, title)
+
+def send_push_to_roles(roles, message, title="MAFIS"):
+    """Send push notification to every active user holding one of the roles"""
+    subscriptions = resolve_subscriptions(roles=roles)
+    if not subscriptions:
+        current_app.logger.info(f"No push subscriptions for roles {list(roles)}")
+        return 0
+    return send_to_subscriptions(subscriptions, message, title)
+
+def send_push_batch(messages, title="MAFIS"):
+    """
+    Different message per user, delivered as one parallel fan-out
+
+    Args:
+        messages: Dict of user_id -> message body
+        title: Notification title shared by every message
+    """
+    from app.modules.push.models import PushSubscription
+
+    if not messages:
+        return 0
+
+    messages = {int(user_id): message for user_id, message in messages.items()}
+    rows = _subscription_query(
+        (PushSubscription.user_id, PushSubscription.endpoint, PushSubscription.p256dh, PushSubscription.auth),
+        user_ids=messages
+    ).all()
+    if not rows:
+        current_app.logger.info(f"No push subscriptions for users {list(messages)}")
+        return 0
+
+    payloads = {}
+    deliveries = []
+    for user_id, endpoint, p256dh, auth in rows:
+        if user_id not in payloads:
+            payloads[user_id] = build_payload(messages[user_id], title)
+        deliveries.append(({'endpoint': endpoint, 'keys': {'p256dh': p256dh, 'auth': auth}}, payloads[user_id]))
+
+    return _deliver(deliveries, f'{title} ({len(payloads)} users)')
@@ -1,21 +1,26 @@
 from app.extensions import db
+from app.common.columns import PRECISE_DATETIME
 from datetime import datetime
 
 
 class Report(db.Model):
     __tablename__ = 'reports'
+    __table_args__ = (
+        # List filters on status and always sorts newest first
+        db.Index('ix_reports_status_created_at', 'status', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=False)
-    requester_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=False, index=True)
+    requester_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     description = db.Column(db.Text, nullable=False)
     priority = db.Column(db.String(20), default='MEDIA') # ALTA, MEDIA, BAJA
     status = db.Column(db.String(20), default='ABIERTO') # ABIERTO, EN PROGRESO, RESUELTO, CERRADO
     evidence_url = db.Column(db.String(255), nullable=True)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     asset = db.relationship('Asset', backref=db.backref('reports', lazy=True))
@@ -1,17 +1,32 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.modules.reports import services
+from app.common.decorators import admin_required, query_budget
+from app.common.validators import validate_id_list
+from app.common.etag import list_etag, resource_etag, not_modified, with_etag
+from app.modules.reports.models import Report
+from app.modules.assets.models import Asset
+from app.modules.users.models import User
 
 reports_bp = Blueprint('reports', __name__)
 
 @reports_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(3)
 @jwt_required()
 def get_reports():
-    status_filter = request.args.get('status')
-    reports = services.get_all_reports(status_filter)
-    return jsonify([report.to_dict() for report in reports]), 200
+    query = services.reports_query(request.args.get('status'))
+
+    # Rows embed asset and requester names, so their tables are part of the tag
+    etag = list_etag(query, Report, Asset, User)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    reports = services.get_all_reports(query=query)
+    return with_etag(jsonify([report.to_dict() for report in reports]), etag)
 
 @reports_bp.route('/', methods=['POST'], strict_slashes=False)
+@query_budget(10)
 @jwt_required()
 def create_report():
     try:
@@ -19,55 +34,34 @@ def create_report():
         data = request.get_json()
         
         new_report = services.create_report(data, current_user_id)
-        return jsonify(new_report.to_dict()), 201
     except ValueError as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
         return jsonify({'message': f'Error creating report: {str(e)}'}), 500
     
-    # Notifications Logic
+    # In-app notification to admins (email, WhatsApp and push were queued with the report)
     try:
-        from app.modules.users.models import User
-        from app.socket_extensions import socketio
-        from app.common.email_service import send_new_report_notification
-        from app.common.whatsapp_service import notify_new_report_to_admin, notify_report_creation_confirmation
-        from app.modules.push.service import send_push_to_users, send_push_to_user
-        
-        requester = User.query.get(current_user_id)
-        admins = User.query.filter_by(role='admin').all()
-        
-        # 1. Notify Requester (Confirmation)
-        notify_report_creation_confirmation(requester, new_report)
-        send_push_to_user(requester, f'Reporte #{new_report.id} recibido. Te notificaremos cuando sea asignado.', 'Reporte Creado')
+        from app.socket_extensions import notify_role
         
-        # 2. Notify Admins
-        for admin in admins:
-            # SocketIO (Push In-App)
-            socketio.emit('notification', {
-                'userId': admin.id,
-                'message': f'Nuevo reporte #{new_report.id} creado por {requester.name}',
-                'type': 'warning'
-            })
-            
-            # WhatsApp
-            notify_new_report_to_admin(admin, new_report, requester)
-            
-        # Email (Already handles multiple admins inside)
-        send_new_report_notification(new_report, requester)
-        
-        # Web Push to all admins
-        send_push_to_users(admins, f'Nuevo reporte #{new_report.id} - Prioridad {new_report.priority}', 'Nuevo Reporte')
-            
+        notify_role('admin', f'Nuevo reporte #{new_report.id} creado por {new_report.requester.name}', 'warning')
     except Exception as e:
         print(f"Failed to send notifications: {e}")
 
     return jsonify(new_report.to_dict()), 201
 
 @reports_bp.route('/<int:id>', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 def get_report(id):
+    etag = resource_etag(Report, id, Report.asset, Report.requester)
+    if etag is None:
+        abort(404)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     report = services.get_report_by_id(id)
-    return jsonify(report.to_dict()), 200
+    return with_etag(jsonify(report.to_dict()), etag)
 
 @reports_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
@@ -98,3 +92,22 @@ def update_report_status(id):
         return jsonify(report.to_dict()), 200
     
     return jsonify({'message': 'Status is required'}), 400
+
+@reports_bp.route('/status', methods=['PATCH'])
+@query_budget(4)
+@jwt_required()
+@admin_required
+def bulk_update_report_status():
+    """Move many reports to one status: {"ids": [...], "status": "CERRADO"}"""
+    data = request.get_json() or {}
+    try:
+        ids = validate_id_list(data.get('ids'), current_app.config.get('BULK_STATUS_MAX_IDS', 1000))
+        result, messages = services.bulk_update_status(ids, data.get('status'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    from app.socket_extensions import notify_user
+    for requester_id, message in messages.items():
+        notify_user(requester_id, message, 'info')
+
+    return jsonify(result), 200
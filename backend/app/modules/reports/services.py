@@ -1,14 +1,26 @@
+from collections import defaultdict
+from sqlalchemy.orm import joinedload
 from app.extensions import db
 from app.modules.reports.models import Report
 from app.modules.assets.models import Asset
 from app.common.validators import validate_priority, validate_report_status
 
 
-def get_all_reports(status=None):
+def with_serialization_relations(query):
+    """Eager-load the relationships read by Report.to_dict() in the same SELECT"""
+    return query.options(joinedload(Report.asset), joinedload(Report.requester))
+
+
+def reports_query(status=None):
     query = Report.query
     if status:
         query = query.filter_by(status=status)
-    return query.order_by(Report.created_at.desc()).all()
+    return query
+
+
+def get_all_reports(status=None, query=None):
+    query = query if query is not None else reports_query(status)
+    return with_serialization_relations(query).order_by(Report.created_at.desc()).all()
 
 
 def get_report_by_id(report_id):
@@ -43,18 +55,19 @@ def create_report(data, user_id):
     )
     
     db.session.add(new_report)
-    db.session.commit()
+    db.session.flush()
+
+    from app.modules.analytics.services import record_failure
+    record_failure(new_report)
     
-    # Send email notification to admins
-    try:
-        from app.common.email_service import send_new_report_notification
-        from app.modules.users.models import User
-        requester = User.query.get(user_id)
-        send_new_report_notification(new_report, requester)
-    except Exception as e:
-        # Don't block if email fails
-        print(f"Failed to send email notification: {e}")
-        
+    # Queue requester confirmation and admin alerts in the same transaction
+    from app.modules.notifications.services import notify_report_created
+    from app.modules.users.models import User
+    requester = User.query.get(user_id)
+    admins = User.query.filter_by(role='admin', is_active=True).all()
+    notify_report_created(new_report, requester, admins)
+    
+    db.session.commit()
     return new_report
 
 
@@ -82,6 +95,47 @@ def delete_report(report_id):
     if existing_wo:
         raise ValueError("No se puede eliminar el reporte porque tiene una Orden de Trabajo asociada.")
         
+    from app.modules.sync.services import record_deletion
     db.session.delete(report)
+    record_deletion('reports', report_id)
     db.session.commit()
     return True
+
+
+def bulk_update_status(ids, status):
+    """
+    Move many reports to one status with a single UPDATE and one coalesced push per requester
+
+    Returns:
+        (result, messages): result lists updated/not_found ids;
+        messages maps requester_id -> in-app message to emit after commit
+    """
+    from app.modules.notifications import services as notifications
+
+    status = validate_report_status(status)
+
+    rows = db.session.query(Report.id, Report.requester_id).filter(Report.id.in_(ids)).all()
+    found_ids = [row.id for row in rows]
+    found = set(found_ids)
+    result = {
+        'status': status,
+        'updated': found_ids,
+        'not_found': [report_id for report_id in ids if report_id not in found]
+    }
+    if not rows:
+        return result, {}
+
+    Report.query.filter(Report.id.in_(found_ids)).update({'status': status}, synchronize_session=False)
+
+    reports_by_requester = defaultdict(list)
+    for row in rows:
+        if row.requester_id:
+            reports_by_requester[row.requester_id].append(row.id)
+    messages = {
+        requester_id: f'Reportes {notifications.format_id_list(report_ids)} actualizados a {status}'
+        for requester_id, report_ids in reports_by_requester.items()
+    }
+    notifications.notify_bulk_status_change(messages, 'Reportes Actualizados')
+
+    db.session.commit()
+    return result, messages
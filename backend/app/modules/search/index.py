@@ -0,0 +1,108 @@
+"""
+Full-text index DDL
+SQLite: external-content FTS5 tables kept in sync by triggers on every INSERT, UPDATE
+and DELETE (including bulk statements). MySQL: InnoDB FULLTEXT indexes, which the
+engine maintains itself. Other databases have no index and search falls back to LIKE.
+"""
+from sqlalchemy import event, inspect, text
+from app.extensions import db
+
+SQLITE_CREATE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+        name, serial_number, location, description,
+        content='assets', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_ai AFTER INSERT ON assets BEGIN
+        INSERT INTO assets_fts(rowid, name, serial_number, location, description)
+        VALUES (new.id, new.name, new.serial_number, new.location, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_ad AFTER DELETE ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, name, serial_number, location, description)
+        VALUES ('delete', old.id, old.name, old.serial_number, old.location, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_au AFTER UPDATE OF name, serial_number, location, description ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, name, serial_number, location, description)
+        VALUES ('delete', old.id, old.name, old.serial_number, old.location, old.description);
+        INSERT INTO assets_fts(rowid, name, serial_number, location, description)
+        VALUES (new.id, new.name, new.serial_number, new.location, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+        description,
+        content='reports', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_ai AFTER INSERT ON reports BEGIN
+        INSERT INTO reports_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_ad AFTER DELETE ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_au AFTER UPDATE OF description ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO reports_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    # Index rows that existed before the tables were created
+    "INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')",
+    "INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS assets_fts_ai',
+    'DROP TRIGGER IF EXISTS assets_fts_ad',
+    'DROP TRIGGER IF EXISTS assets_fts_au',
+    'DROP TABLE IF EXISTS assets_fts',
+    'DROP TRIGGER IF EXISTS reports_fts_ai',
+    'DROP TRIGGER IF EXISTS reports_fts_ad',
+    'DROP TRIGGER IF EXISTS reports_fts_au',
+    'DROP TABLE IF EXISTS reports_fts',
+]
+
+MYSQL_CREATE = [
+    'CREATE FULLTEXT INDEX ft_assets_search ON assets (name, serial_number, location, description)',
+    'CREATE FULLTEXT INDEX ft_reports_description ON reports (description)',
+]
+
+MYSQL_DROP = [
+    'DROP INDEX ft_assets_search ON assets',
+    'DROP INDEX ft_reports_description ON reports',
+]
+
+
+def create_search_index(connection):
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        # CREATE INDEX has no IF NOT EXISTS on MySQL
+        existing = {index['name'] for index in inspect(connection).get_indexes('assets')}
+        if 'ft_assets_search' in existing:
+            return
+
+    for statement in {'sqlite': SQLITE_CREATE, 'mysql': MYSQL_CREATE}.get(dialect, []):
+        connection.execute(text(statement))
+
+
+def drop_search_index(connection):
+    statements = {'sqlite': SQLITE_DROP, 'mysql': MYSQL_DROP}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def rebuild_search_index(connection):
+    """Re-index every row (SQLite only; MySQL FULLTEXT never drifts)"""
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text("INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')"))
+        connection.execute(text("INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_after_tables(target, connection, **kw):
+    # db.create_all() (tests, fresh installs) gets the index too; migrations create it explicitly
+    tables = kw.get('tables')
+    names = {table.name for table in tables} if tables is not None else set(target.tables)
+    if {'assets', 'reports'} <= names:
+        create_search_index(connection)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_before_tables(target, connection, **kw):
+    # FULLTEXT indexes go away with their tables; FTS5 tables are not in the metadata
+    if connection.dialect.name == 'sqlite':
+        drop_search_index(connection)
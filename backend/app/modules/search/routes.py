@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.modules.search import services
+from app.common.pagination import parse_limit
+from app.common.decorators import query_budget
+
+search_bp = Blueprint('search', __name__)
+
+def parse_offset(value):
+    try:
+        offset = int(value or 0)
+    except ValueError:
+        raise ValueError('El parámetro offset debe ser un número entero')
+    if offset < 0:
+        raise ValueError('El parámetro offset no puede ser negativo')
+    return offset
+
+@search_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(5)
+@jwt_required()
+def search():
+    """
+    GET /api/search?q=<texto>&type=assets|reports&limit=20&offset=0
+    Ranked matches over asset name, serial number, location and description,
+    and over report descriptions.
+    """
+    kind = request.args.get('type')
+    if kind and kind not in services.SEARCH_TYPES:
+        return jsonify({'message': f'Tipo inválido. Debe ser uno de: {", ".join(services.SEARCH_TYPES)}'}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+        offset = parse_offset(request.args.get('offset'))
+        results = services.search(
+            request.args.get('q'),
+            types=(kind,) if kind else services.SEARCH_TYPES,
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify(results), 200
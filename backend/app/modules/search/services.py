@@ -0,0 +1,128 @@
+"""
+Ranked full-text search over assets and reports
+Candidate ids and scores come from the dialect's full-text index; the matching rows
+are then loaded in one query per collection and returned in rank order.
+"""
+import re
+from sqlalchemy import or_, text
+from app.extensions import db
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.search import index  # noqa: F401  (registers the create_all hook)
+
+SEARCH_TYPES = ('assets', 'reports')
+
+MAX_TERMS = 10
+
+# Column weights for SQLite bm25(): name, serial_number, location, description
+ASSET_WEIGHTS = (10.0, 8.0, 4.0, 1.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_terms(query):
+    """Words of the user query; punctuation and FTS operators are dropped"""
+    terms = TOKEN_RE.findall(query or '')[:MAX_TERMS]
+    if not terms:
+        raise ValueError('El parámetro q es requerido')
+    return terms
+
+
+def _sqlite_match(terms):
+    # Every term must match, each as a prefix: "bom"* "2"*
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _mysql_match(terms):
+    return ' '.join(f'+{term}*' for term in terms)
+
+
+def _ranked_ids(kind, terms, limit, offset):
+    """[(id, score)] best first, using the full-text index of the current database"""
+    dialect = db.engine.dialect.name
+    params = {'limit': limit, 'offset': offset}
+
+    if dialect == 'sqlite':
+        params['q'] = _sqlite_match(terms)
+        if kind == 'assets':
+            weights = ', '.join(str(weight) for weight in ASSET_WEIGHTS)
+            sql = f'SELECT rowid, bm25(assets_fts, {weights}) AS score FROM assets_fts WHERE assets_fts MATCH :q'
+        else:
+            sql = 'SELECT rowid, bm25(reports_fts) AS score FROM reports_fts WHERE reports_fts MATCH :q'
+        # bm25 is lower for better matches
+        sql += ' ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset'
+        return [(row_id, -score) for row_id, score in db.session.execute(text(sql), params)]
+
+    if dialect == 'mysql':
+        params['q'] = _mysql_match(terms)
+        if kind == 'assets':
+            match = 'MATCH(name, serial_number, location, description) AGAINST(:q IN BOOLEAN MODE)'
+            table = 'assets'
+        else:
+            match = 'MATCH(description) AGAINST(:q IN BOOLEAN MODE)'
+            table = 'reports'
+        sql = (
+            f'SELECT id, {match} AS score FROM {table} WHERE {match} '
+            'ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset'
+        )
+        return [(row_id, float(score)) for row_id, score in db.session.execute(text(sql), params)]
+
+    return _like_ids(kind, terms, limit, offset)
+
+
+def _like_ids(kind, terms, limit, offset):
+    """Unindexed fallback for databases without a full-text index; newest first"""
+    if kind == 'assets':
+        model, columns = Asset, (Asset.name, Asset.serial_number, Asset.location, Asset.description)
+    else:
+        model, columns = Report, (Report.description,)
+
+    query = db.session.query(model.id)
+    for term in terms:
+        query = query.filter(or_(*[column.ilike(f'%{term}%') for column in columns]))
+    rows = query.order_by(model.id.desc()).limit(limit).offset(offset).all()
+    return [(row_id, 0.0) for (row_id,) in rows]
+
+
+def _load(kind, ids):
+    if kind == 'assets':
+        rows = Asset.query.filter(Asset.id.in_(ids)).all()
+    else:
+        from app.modules.reports.services import with_serialization_relations
+        rows = with_serialization_relations(Report.query).filter(Report.id.in_(ids)).all()
+    return {row.id: row for row in rows}
+
+
+def search(query, types=SEARCH_TYPES, limit=20, offset=0):
+    """
+    Ranked matches per collection
+
+    Returns:
+        Dict per type with items (each with its score) and next_offset, which is
+        None on the last page
+
+    Raises:
+        ValueError: Empty query
+    """
+    terms = parse_terms(query)
+    results = {'query': query}
+
+    for kind in types:
+        # One extra row tells whether there is a next page
+        ranked = _ranked_ids(kind, terms, limit + 1, offset)
+        has_more = len(ranked) > limit
+        ranked = ranked[:limit]
+
+        rows = _load(kind, [row_id for row_id, _ in ranked]) if ranked else {}
+        items = []
+        for row_id, score in ranked:
+            row = rows.get(row_id)
+            if row is not None:
+                items.append(dict(row.to_dict(), score=round(score, 4)))
+
+        results[kind] = {
+            'items': items,
+            'next_offset': offset + limit if has_more else None
+        }
+
+    return results
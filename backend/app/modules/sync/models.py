@@ -0,0 +1,14 @@
+from app.extensions import db
+from datetime import datetime
+
+class Tombstone(db.Model):
+    """Marker left by a hard delete so offline clients can drop the row on their next sync"""
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_deleted_at_entity', 'deleted_at', 'entity'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(30), nullable=False) # assets, reports, users
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
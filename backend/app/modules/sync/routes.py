@@ -0,0 +1,41 @@
+import click
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.modules.sync import services
+from app.common.decorators import query_budget
+from app.common.pagination import parse_limit
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(5)
+@jwt_required()
+def get_changes():
+    """
+    Delta feed for offline clients: GET /api/sync?since=<sync_token>&limit=500
+    Without since (or with an expired token) returns a full snapshot with reset=true.
+    While has_more is true, fetch the next page with after=<next_cursor>; the last
+    page carries the sync_token to store.
+    """
+    try:
+        limit = parse_limit(
+            request.args.get('limit'),
+            default=current_app.config.get('SYNC_PAGE_SIZE', 500),
+            maximum=current_app.config.get('SYNC_MAX_PAGE_SIZE', 2000)
+        )
+        changes = services.get_changes(request.args.get('since'), request.args.get('after'), limit)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify(changes), 200
+
+
+@click.group('sync')
+def sync_cli():
+    """Delta sync commands"""
+
+
+@sync_cli.command('purge')
+@click.option('--days', type=int, default=None, help='Keep tombstones newer than this many days')
+def purge(days):
+    """Delete tombstones past the retention window"""
+    click.echo(f'Deleted {services.purge_tombstones(days)} tombstones')
@@ -0,0 +1,206 @@
+"""
+Delta sync for offline clients
+A sync token is the server time at which a feed was read. The next feed returns rows
+whose updated_at (or that of the rows they embed) is past the token, plus tombstones
+for hard deletes, so a reconnecting client only downloads what changed. Feeds are
+paged with a keyset cursor on (updated_at, id), so a snapshot never has to be built
+in one response.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_
+from app.extensions import db
+from app.modules.sync.models import Tombstone
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+# Collections with tombstones; work orders are never hard-deleted
+TOMBSTONE_ENTITIES = ('assets', 'reports', 'users')
+
+
+def encode_token(moment):
+    raw = json.dumps({'t': moment.isoformat()})
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return datetime.fromisoformat(json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))['t'])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Token de sincronización inválido')
+
+
+def record_deletion(entity, entity_id):
+    """Leave a tombstone in the current transaction. The caller commits."""
+    if entity not in TOMBSTONE_ENTITIES:
+        raise ValueError(f'Unknown sync entity: {entity}')
+    db.session.add(Tombstone(entity=entity, entity_id=entity_id))
+
+
+def _changed_assets(since):
+    query = Asset.query
+    if since:
+        query = query.filter(Asset.updated_at >= since)
+    return query
+
+
+def _changed_reports(since):
+    from app.modules.reports.services import with_serialization_relations
+    query = Report.query
+    if since:
+        # Rows embed the asset and requester names
+        query = query.outerjoin(Asset, Asset.id == Report.asset_id).outerjoin(
+            User, User.id == Report.requester_id
+        ).filter(or_(Report.updated_at >= since, Asset.updated_at >= since, User.updated_at >= since))
+    return with_serialization_relations(query)
+
+
+def _changed_work_orders(since):
+    from app.modules.work_orders.services import with_serialization_relations
+    query = WorkOrder.query
+    if since:
+        # Rows embed the report description and technician name
+        query = query.outerjoin(Report, Report.id == WorkOrder.report_id).outerjoin(
+            User, User.id == WorkOrder.technician_id
+        ).filter(or_(WorkOrder.updated_at >= since, Report.updated_at >= since, User.updated_at >= since))
+    return with_serialization_relations(query)
+
+
+# Pages walk the collections in this order, each one by (updated_at, id)
+COLLECTIONS = (
+    ('assets', Asset, _changed_assets),
+    ('reports', Report, _changed_reports),
+    ('work_orders', WorkOrder, _changed_work_orders),
+)
+
+
+def _encode_cursor(state):
+    raw = json.dumps(state)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return {
+            'since': datetime.fromisoformat(state['s']) if state['s'] else None,
+            'started': datetime.fromisoformat(state['t']),
+            'reset': bool(state['r']),
+            'collection': int(state['c']),
+            'updated_at': datetime.fromisoformat(state['u']) if state['u'] else None,
+            'id': state['i'],
+        }
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Cursor de sincronización inválido')
+
+
+def _page_cursor(since, started, reset, collection, row=None):
+    return _encode_cursor({
+        's': since.isoformat() if since else None,
+        't': started.isoformat(),
+        'r': reset,
+        'c': collection,
+        'u': row.updated_at.isoformat() if row is not None and row.updated_at else None,
+        'i': row.id if row is not None else None,
+    })
+
+
+def get_changes(token=None, after=None, limit=500):
+    """
+    One page of everything that changed since token, or of a full snapshot without one
+
+    A token older than the tombstone retention also yields a full snapshot
+    (reset=True) because deletions from that period may already be purged.
+
+    Pages hold up to `limit` rows across assets, reports and work orders. While
+    has_more is true the client asks again with after=next_cursor; the last page
+    carries the sync_token, which is the time the first page was read, so rows that
+    changed while the client was paging come back in the next feed.
+
+    Raises:
+        ValueError: Malformed token or cursor
+    """
+    config = current_app.config
+
+    if after:
+        state = _decode_cursor(after)
+        since, started, reset = state['since'], state['started'], state['reset']
+    else:
+        state = {'collection': 0, 'updated_at': None, 'id': None}
+        started = datetime.utcnow()
+        since = decode_token(token) if token else None
+        retention = timedelta(days=config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+        reset = since is None or since < started - retention
+
+        if reset:
+            since = None
+        else:
+            # Re-read a short window so rows committed while the previous feed was
+            # being built (or stored with second precision) are never skipped
+            since = since - timedelta(seconds=config.get('SYNC_TOKEN_OVERLAP', 5))
+
+    changes = {
+        'reset': reset,
+        'assets': [],
+        'reports': [],
+        'work_orders': [],
+        'deleted': {entity: [] for entity in TOMBSTONE_ENTITIES},
+        'has_more': False,
+        'next_cursor': None,
+        'sync_token': None,
+    }
+
+    remaining = limit
+    for index in range(state['collection'], len(COLLECTIONS)):
+        if remaining <= 0:
+            changes['has_more'] = True
+            changes['next_cursor'] = _page_cursor(since, started, reset, index)
+            break
+
+        name, model, changed = COLLECTIONS[index]
+        query = changed(since)
+        if index == state['collection'] and state['id'] is not None:
+            query = query.filter(or_(
+                model.updated_at > state['updated_at'],
+                and_(model.updated_at == state['updated_at'], model.id > state['id'])
+            ))
+
+        # One extra row tells whether the collection continues on the next page
+        rows = query.order_by(model.updated_at, model.id).limit(remaining + 1).all()
+        if len(rows) > remaining:
+            rows = rows[:remaining]
+            changes['has_more'] = True
+            changes['next_cursor'] = _page_cursor(since, started, reset, index, rows[-1])
+        changes[name] = [row.to_dict() for row in rows]
+        remaining -= len(rows)
+        if changes['has_more']:
+            break
+
+    # Tombstones are few (bounded by the retention window) and go with the first page
+    if since is not None and not after:
+        tombstones = db.session.query(Tombstone.entity, Tombstone.entity_id).filter(
+            Tombstone.deleted_at >= since
+        ).order_by(Tombstone.id).all()
+        for entity, entity_id in tombstones:
+            changes['deleted'][entity].append(entity_id)
+
+    if not changes['has_more']:
+        changes['sync_token'] = encode_token(started)
+    return changes
+
+
+def purge_tombstones(older_than_days=None):
+    """Delete tombstones past the retention window; clients that old get a reset instead"""
+    days = older_than_days
+    if days is None:
+        days = current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    deleted = Tombstone.query.filter(Tombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -1,18 +1,29 @@
 from app.extensions import db
+from app.common.columns import PRECISE_DATETIME
 from datetime import datetime
-import bcrypt
+from sqlalchemy.orm.attributes import set_committed_value
+from app.common.passwords import get_password_hasher
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Least-loaded technician lookup for auto-assignment
+        db.Index('ix_users_technician_load', 'role', 'is_active', 'open_work_orders', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    role = db.Column(db.String(20), default='requester') # admin, technician, requester
+    role = db.Column(db.String(20), default='requester', index=True) # admin, technician, requester
     phone = db.Column(db.String(20), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped on role/status changes to revoke previously issued tokens
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Assigned work orders still open, kept by work_orders.workload
+    open_work_orders = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Notification Preferences
     notify_email = db.Column(db.Boolean, default=True)
@@ -20,11 +31,22 @@ class User(db.Model):
     notify_push = db.Column(db.Boolean, default=True)
 
     def set_password(self, password):
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        self.password_hash = get_password_hasher().hash(password)
 
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        """
+        Verify on the hashing pool; a hash made with another BCRYPT_ROUNDS is
+        replaced in place, so the caller should commit after a successful login
+        """
+        matches, new_hash = get_password_hasher().verify(password, self.password_hash)
+        if new_hash:
+            # The hash is not part of the serialized user; keep ETags and sync feeds quiet
+            User.query.filter_by(id=self.id).update(
+                {User.password_hash: new_hash, User.updated_at: User.updated_at},
+                synchronize_session=False
+            )
+            set_committed_value(self, 'password_hash', new_hash)
+        return matches
 
     def to_dict(self):
         return {
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.modules.users import services
+from app.common.auth import get_current_role, get_current_user_id
 from app.common.decorators import admin_required
 
 users_bp = Blueprint('users', __name__)
@@ -11,10 +12,7 @@ def get_users():
     role_filter = request.args.get('role')
     
     # Check permissions
-    current_user_id = int(get_jwt_identity())
-    current_user = services.get_user_by_id(current_user_id)
-    
-    if current_user.role != 'admin':
+    if get_current_role() != 'admin':
         # Non-admins can only list technicians
         if role_filter != 'technician':
             return jsonify({'message': 'Access denied'}), 403
@@ -26,15 +24,13 @@ def get_users():
 @jwt_required()
 def get_user(id):
     # Allow users to view their own profile or admins to view any
-    current_user_id = int(get_jwt_identity())
-    user = services.get_user_by_id(id)
+    current_user_id = get_current_user_id()
     
     # Check if user is viewing their own profile or is admin
-    if current_user_id != id:
-        current_user = services.get_user_by_id(current_user_id)
-        if current_user.role != 'admin':
-            return jsonify({'message': 'Access denied'}), 403
+    if current_user_id != id and get_current_role() != 'admin':
+        return jsonify({'message': 'Access denied'}), 403
     
+    user = services.get_user_by_id(id)
     return jsonify(user.to_dict()), 200
 
 @users_bp.route('/', methods=['POST'])
@@ -59,17 +55,17 @@ def create_user():
 @jwt_required()
 def update_user(id):
     # Allow users to update their own profile or admins to update any
-    current_user_id = int(get_jwt_identity())
-    current_user = services.get_user_by_id(current_user_id)
+    current_user_id = get_current_user_id()
+    current_role = get_current_role()
     
     # Non-admins can only update their own profile
-    if current_user.role != 'admin' and current_user_id != id:
+    if current_role != 'admin' and current_user_id != id:
         return jsonify({'message': 'Access denied'}), 403
     
     data = request.get_json()
     
     # Non-admins cannot change their own role
-    if current_user.role != 'admin' and 'role' in data:
+    if current_role != 'admin' and ('role' in data or 'is_active' in data):
         return jsonify({'message': 'Cannot change your own role'}), 403
     
     user = services.update_user(id, data)
@@ -80,8 +76,7 @@ def update_user(id):
 @admin_required
 def delete_user(id):
     # Prevent self-deletion
-    current_user_id = int(get_jwt_identity())
-    if current_user_id == id:
+    if get_current_user_id() == id:
         return jsonify({'message': 'Cannot delete your own account'}), 400
     
     services.delete_user(id)
@@ -90,7 +85,7 @@ def delete_user(id):
 @users_bp.route('/me/preferences', methods=['PUT'])
 @jwt_required()
 def update_my_preferences():
-    current_user_id = int(get_jwt_identity())
+    current_user_id = get_current_user_id()
     data = request.get_json()
     
     # Wrap preferences in a dict if sent directly
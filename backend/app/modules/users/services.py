@@ -1,5 +1,6 @@
 from app.extensions import db
 from app.modules.users.models import User
+from app.common.auth import bump_token_version, forget_token_version
 
 
 def get_all_users(role=None):
@@ -33,14 +34,17 @@ def create_user(data):
 
 def update_user(user_id, data):
     user = User.query.get_or_404(user_id)
+    revoke_tokens = False
     
     if 'name' in data:
         user.name = data['name']
     if 'phone' in data:
         user.phone = data['phone']
     if 'role' in data:
+        revoke_tokens |= data['role'] != user.role
         user.role = data['role']
     if 'is_active' in data:
+        revoke_tokens |= bool(data['is_active']) != bool(user.is_active)
         user.is_active = data['is_active']
         
     # Notification Preferences
@@ -56,12 +60,21 @@ def update_user(user_id, data):
     # Only update password if provided
     if 'password' in data and data['password']:
         user.set_password(data['password'])
+    
+    # Role and active status are signed into tokens; make the old ones invalid
+    if revoke_tokens:
+        bump_token_version(user)
         
     db.session.commit()
+    if revoke_tokens:
+        forget_token_version(user.id)
     return user
 
 def delete_user(user_id):
+    from app.modules.sync.services import record_deletion
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
+    record_deletion('users', user_id)
     db.session.commit()
+    forget_token_version(user_id)
     return True
@@ -1,11 +1,18 @@
 from app.extensions import db
+from app.common.columns import PRECISE_DATETIME
 from datetime import datetime
 
 class WorkOrder(db.Model):
     __tablename__ = 'work_orders'
+    __table_args__ = (
+        # List filters on status and always sorts newest first
+        db.Index('ix_work_orders_status_created_at', 'status', 'created_at'),
+        # Technician workload and "my orders" lookups
+        db.Index('ix_work_orders_technician_id_status', 'technician_id', 'status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    report_id = db.Column(db.Integer, db.ForeignKey('reports.id'), nullable=False)
+    report_id = db.Column(db.Integer, db.ForeignKey('reports.id'), nullable=False, index=True)
     technician_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     
     status = db.Column(db.String(20), default='ABIERTO') # ABIERTO, ASIGNADO, EN PROGRESO, COMPLETADO, CERRADO
@@ -13,8 +20,8 @@ class WorkOrder(db.Model):
     completion_date = db.Column(db.DateTime, nullable=True)
     notes = db.Column(db.Text, nullable=True)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     report = db.relationship('Report', backref=db.backref('work_order', uselist=False))
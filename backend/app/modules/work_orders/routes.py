@@ -1,14 +1,25 @@
-from flask import Blueprint, request, jsonify
+import click
+from flask import Blueprint, request, jsonify, current_app, abort
 from flask_jwt_extended import jwt_required
 from app.extensions import db
+from app.socket_extensions import notify_user
 from app.modules.work_orders.models import WorkOrder
+from app.modules.work_orders import services, workload
+from app.modules.notifications import services as notifications
+from app.modules.analytics import services as analytics
 from app.modules.reports.models import Report
 from app.modules.users.models import User
+from app.common.validators import validate_work_order_status, validate_id_list
+from app.common.auth import get_current_role, get_current_user_id
+from app.common.decorators import admin_required, role_required, query_budget
+from app.common.pagination import keyset_page, parse_limit, stream_json_array
+from app.common.etag import list_etag, resource_etag, not_modified, with_etag
 from datetime import datetime
 
 work_orders_bp = Blueprint('work_orders', __name__)
 
 @work_orders_bp.route('/', methods=['GET'], strict_slashes=False)
+@query_budget(3)
 @jwt_required()
 def get_work_orders():
     status_filter = request.args.get('status')
@@ -16,49 +27,36 @@ def get_work_orders():
     
     if status_filter:
         query = query.filter_by(status=status_filter)
-        
-    orders = query.order_by(WorkOrder.created_at.desc()).all()
-    return jsonify([order.to_dict() for order in orders]), 200
 
-@work_orders_bp.route('/', methods=['POST'], strict_slashes=False)
-@jwt_required()
-def create_work_order():
-    data = request.get_json()
-    
-    # Validate Report exists
-    report = Report.query.get(data.get('report_id'))
-    if not report:
-        return jsonify({'message': 'Report not found'}), 404
-        
-    # Check if WO already exists for this report
-    if WorkOrder.query.filter_by(report_id=report.id).first():
-        return jsonify({'message': 'Work Order already exists for this report'}), 400
+    # Rows embed the report description and technician name
+    etag = list_etag(query, WorkOrder, Report, User)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.extensions import db
-from app.socket_extensions import socketio
-from app.modules.work_orders.models import WorkOrder
-from app.modules.reports.models import Report
-from app.modules.users.models import User
-from app.common.validators import validate_work_order_status
-from datetime import datetime
+    query = services.with_serialization_relations(query)
 
-work_orders_bp = Blueprint('work_orders', __name__)
+    # Streaming mode: rows are written out batch by batch as they are fetched
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return with_etag(stream_json_array(query, WorkOrder, lambda order: order.to_dict()), etag)
 
-@work_orders_bp.route('/', methods=['GET'], strict_slashes=False)
-@jwt_required()
-def get_work_orders():
-    status_filter = request.args.get('status')
-    query = WorkOrder.query
-    
-    if status_filter:
-        query = query.filter_by(status=status_filter)
-        
-    orders = query.order_by(WorkOrder.created_at.desc()).all()
-    return jsonify([order.to_dict() for order in orders]), 200
+    # Cursor mode: one page plus an opaque cursor on (created_at, id) for the next one
+    if 'limit' in request.args or 'after' in request.args:
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            orders, next_cursor = keyset_page(query, WorkOrder, request.args.get('after'), limit)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        return with_etag(jsonify({
+            'items': [order.to_dict() for order in orders],
+            'next_cursor': next_cursor
+        }), etag)
+
+    orders = query.order_by(WorkOrder.created_at.desc(), WorkOrder.id.desc()).all()
+    return with_etag(jsonify([order.to_dict() for order in orders]), etag)
 
 @work_orders_bp.route('/', methods=['POST'], strict_slashes=False)
+@query_budget(13)
 @jwt_required()
 def create_work_order():
     data = request.get_json()
@@ -78,79 +76,63 @@ def create_work_order():
         status='ABIERTO'
     )
     
-    # Auto-assign logic
+    # Auto-assign to the active technician with the fewest open orders
     if data.get('auto_assign'):
-        technician = User.query.filter_by(role='technician').first()
+        technician = workload.least_loaded_technician()
         if technician:
             new_order.technician_id = technician.id
             new_order.status = 'ASIGNADO'
     elif data.get('technician_id'):
-        new_order.technician_id = data.get('technician_id')
+        technician = User.query.get(data.get('technician_id'))
+        if not technician or technician.role != 'technician':
+            return jsonify({'message': 'Invalid technician'}), 400
+        new_order.technician_id = technician.id
         new_order.status = 'ASIGNADO'
     
     db.session.add(new_order)
+    workload.record_change(None, None, new_order.technician_id, new_order.status)
     
     # Update Report status
     report.status = 'EN PROGRESO'
     
+    # Flush for the order id; deliveries go to the outbox in this same transaction
+    db.session.flush()
+    technician = User.query.get(new_order.technician_id) if new_order.technician_id else None
+    requester = User.query.get(report.requester_id) if report.requester_id else None
+    
+    if technician:
+        notifications.notify_work_order_assigned(new_order, technician, f'Nueva orden #{new_order.id} asignada')
+    if requester:
+        notifications.notify_report_assigned(new_order, requester)
+    
     db.session.commit()
     
-    # Notify Technician
-    if new_order.technician_id:
-        technician = User.query.get(new_order.technician_id)
-        
-        # SocketIO
-        socketio.emit('notification', {
-            'userId': new_order.technician_id,
-            'message': f'Nueva orden de trabajo asignada: #{new_order.id}',
-            'type': 'info'
-        })
-        
-        # Email & WhatsApp & Web Push
-        try:
-            from app.common.email_service import send_work_order_assigned_notification
-            from app.common.whatsapp_service import notify_technician_assignment
-            from app.modules.push.service import send_push_to_user
-            
-            send_work_order_assigned_notification(new_order, technician)
-            notify_technician_assignment(technician, new_order)
-            send_push_to_user(technician, f'Nueva orden #{new_order.id} asignada', 'Orden Asignada')
-        except Exception as e:
-            print(f"Failed to send notifications: {e}")
+    # Notify Technician (SocketIO)
+    if technician:
+        notify_user(technician.id, f'Nueva orden de trabajo asignada: #{new_order.id}', 'info')
 
     # Notify Requester (Report Assigned)
-    if report.requester_id:
-        try:
-            from app.common.whatsapp_service import notify_status_update
-            from app.common.email_service import send_work_order_status_update_notification
-            from app.modules.push.service import send_push_to_user
-            
-            requester = User.query.get(report.requester_id)
-            
-            # SocketIO
-            socketio.emit('notification', {
-                'userId': requester.id,
-                'message': f'Tu reporte #{report.id} ha sido asignado a un técnico.',
-                'type': 'success'
-            })
-            
-            # WhatsApp & Email & Web Push
-            notify_status_update(requester, new_order)
-            send_work_order_status_update_notification(new_order, requester)
-            send_push_to_user(requester, f'Tu reporte #{report.id} ha sido asignado', 'Reporte Asignado')
-            
-        except Exception as e:
-            print(f"Failed to notify requester: {e}")
+    if requester:
+        notify_user(requester.id, f'Tu reporte #{report.id} ha sido asignado a un técnico.', 'success')
 
     return jsonify(new_order.to_dict()), 201
 
 @work_orders_bp.route('/<int:id>', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 def get_work_order(id):
+    etag = resource_etag(WorkOrder, id, WorkOrder.report, WorkOrder.technician)
+    if etag is None:
+        abort(404)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     order = WorkOrder.query.get_or_404(id)
-    return jsonify(order.to_dict()), 200
+    return with_etag(jsonify(order.to_dict()), etag)
 
 @work_orders_bp.route('/<int:id>/assign', methods=['PATCH'])
+@query_budget(12)
 @jwt_required()
 def assign_technician(id):
     order = WorkOrder.query.get_or_404(id)
@@ -162,61 +144,38 @@ def assign_technician(id):
     if not technician or technician.role != 'technician':
         return jsonify({'message': 'Invalid technician'}), 400
         
+    workload.record_change(order.technician_id, order.status, technician.id, 'ASIGNADO')
     order.technician_id = technician_id
     order.status = 'ASIGNADO'
-    db.session.commit()
     
-    # Notify Technician
-    try:
-        from app.common.email_service import send_work_order_assigned_notification
-        from app.common.whatsapp_service import notify_technician_assignment
-        from app.modules.push.service import send_push_to_user
-        
-        send_work_order_assigned_notification(order, technician)
-        notify_technician_assignment(technician, order)
-        send_push_to_user(technician, f'Orden #{order.id} reasignada', 'Orden Asignada')
-    except Exception as e:
-        print(f"Failed to send notifications: {e}")
+    requester = None
+    if order.report and order.report.requester_id:
+        requester = User.query.get(order.report.requester_id)
+    
+    # Deliveries go to the outbox in the same transaction as the assignment
+    notifications.notify_work_order_assigned(order, technician, f'Orden #{order.id} reasignada')
+    if requester:
+        notifications.notify_report_assigned(order, requester)
+    
+    db.session.commit()
         
     # Notify Requester (Report Assigned)
-    if order.report and order.report.requester_id:
-        try:
-            from app.common.whatsapp_service import notify_status_update
-            from app.common.email_service import send_work_order_status_update_notification
-            from app.modules.push.service import send_push_to_user
-            
-            requester = User.query.get(order.report.requester_id)
-            
-            # SocketIO
-            socketio.emit('notification', {
-                'userId': requester.id,
-                'message': f'Tu reporte #{order.report.id} ha sido asignado a un técnico.',
-                'type': 'success'
-            })
-            
-            # WhatsApp & Email & Web Push
-            notify_status_update(requester, order)
-            send_work_order_status_update_notification(order, requester)
-            send_push_to_user(requester, f'Tu reporte #{order.report.id} ha sido asignado', 'Reporte Asignado')
-            
-        except Exception as e:
-            print(f"Failed to notify requester: {e}")
+    if requester:
+        notify_user(requester.id, f'Tu reporte #{order.report.id} ha sido asignado a un técnico.', 'success')
     
     return jsonify(order.to_dict()), 200
 
 @work_orders_bp.route('/<int:id>/status', methods=['PATCH'])
+@query_budget(10)
 @jwt_required()
 def update_status(id):
     order = WorkOrder.query.get_or_404(id)
     data = request.get_json()
-    print(f"DEBUG: update_status called for id {id} with data {data}")
     
-    # Get current user
-    current_user_id = int(get_jwt_identity())
-    current_user = User.query.get(current_user_id)
+    current_user_id = get_current_user_id()
     
     # Only assigned technician or admin can update status
-    if current_user.role != 'admin' and order.technician_id != current_user_id:
+    if get_current_role() != 'admin' and order.technician_id != current_user_id:
         return jsonify({'message': 'Only the assigned technician or admin can update this order'}), 403
     
     new_status = data.get('status')
@@ -229,14 +188,62 @@ def update_status(id):
     except ValueError as e:
         return jsonify({'message': str(e)}), 400
     
+    workload.record_change(order.technician_id, order.status, order.technician_id, new_status)
+    completed_now = new_status == 'COMPLETADO' and order.status != 'COMPLETADO'
     order.status = new_status
-    if new_status == 'COMPLETADO':
+    if completed_now:
+        # An order completed again keeps its first completion_date, as the rollups do
         order.completion_date = datetime.utcnow()
+    if new_status == 'COMPLETADO':
         # Also update report status
         if order.report:
             order.report.status = 'RESUELTO'
+    if completed_now and order.report:
+        analytics.record_repair(order.report.asset_id, order.report.created_at, order.completion_date)
     
-    print(f"DEBUG: Committing status change to {new_status}")
     db.session.commit()
         
     return jsonify(order.to_dict()), 200
+
+@work_orders_bp.route('/status', methods=['PATCH'])
+@query_budget(7)
+@jwt_required()
+@role_required('admin', 'technician')
+def bulk_update_status():
+    """Move many orders to one status: {"ids": [...], "status": "COMPLETADO"}"""
+    data = request.get_json() or {}
+    try:
+        ids = validate_id_list(data.get('ids'), current_app.config.get('BULK_STATUS_MAX_IDS', 1000))
+        result, messages = services.bulk_update_status(
+            ids, data.get('status'), get_current_user_id(), get_current_role()
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    for requester_id, message in messages.items():
+        notify_user(requester_id, message, 'info')
+
+    return jsonify(result), 200
+
+@work_orders_bp.route('/workload', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+@admin_required
+def get_workload():
+    """Open orders per active technician, least loaded first"""
+    technicians = workload.load_distribution()
+    return jsonify({
+        'technicians': technicians,
+        'total_open': sum(row['open_work_orders'] for row in technicians)
+    }), 200
+
+
+@click.group('workload')
+def workload_cli():
+    """Technician workload index commands"""
+
+
+@workload_cli.command('rebuild')
+def rebuild_workload():
+    """Recount open work orders per user from the work_orders table"""
+    click.echo(f'Recounted open work orders for {workload.rebuild()} users')
@@ -0,0 +1,87 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import case
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.modules.work_orders.models import WorkOrder
+from app.modules.reports.models import Report
+from app.modules.work_orders import workload
+from app.common.validators import validate_work_order_status
+
+
+def with_serialization_relations(query):
+    """Eager-load the relationships read by WorkOrder.to_dict() in the same SELECT"""
+    return query.options(joinedload(WorkOrder.report), joinedload(WorkOrder.technician))
+
+
+def bulk_update_status(ids, status, user_id, role):
+    """
+    Move many work orders to one status with set-based UPDATEs in a single transaction
+
+    Mirrors the single-order rules: technicians may only move their own orders, and
+    COMPLETADO stamps completion_date (kept on orders that were already completed)
+    and resolves the linked reports. Requesters get
+    one coalesced push per person, queued in the same transaction.
+
+    Returns:
+        (result, messages): result lists updated/not_found/forbidden ids;
+        messages maps requester_id -> in-app message to emit after commit
+    """
+    from app.modules.notifications import services as notifications
+    from app.modules.analytics import services as analytics
+
+    status = validate_work_order_status(status)
+
+    rows = db.session.query(
+        WorkOrder.id, WorkOrder.report_id, WorkOrder.technician_id, WorkOrder.status,
+        Report.requester_id, Report.asset_id, Report.created_at.label('reported_at')
+    ).outerjoin(Report, Report.id == WorkOrder.report_id).filter(WorkOrder.id.in_(ids)).all()
+
+    found = {row.id for row in rows}
+    allowed = [row for row in rows if role == 'admin' or row.technician_id == user_id]
+    allowed_ids = [row.id for row in allowed]
+    allowed_set = set(allowed_ids)
+    result = {
+        'status': status,
+        'updated': allowed_ids,
+        'not_found': [order_id for order_id in ids if order_id not in found],
+        'forbidden': [row.id for row in rows if row.id not in allowed_set]
+    }
+    if not allowed:
+        return result, {}
+
+    values = {'status': status}
+    completed_at = datetime.utcnow()
+    completed_now = [row for row in allowed if status == 'COMPLETADO' and row.status != 'COMPLETADO']
+    if completed_now:
+        # Keyed on ids, not on the old status: MySQL evaluates SET assignments left to right
+        values['completion_date'] = case(
+            (WorkOrder.id.in_([row.id for row in completed_now]), completed_at),
+            else_=WorkOrder.completion_date
+        )
+    WorkOrder.query.filter(WorkOrder.id.in_(allowed_ids)).update(values, synchronize_session=False)
+
+    deltas = Counter()
+    for row in allowed:
+        workload.track(deltas, row.technician_id, row.status, row.technician_id, status)
+    workload.apply(deltas)
+
+    if status == 'COMPLETADO':
+        report_ids = [row.report_id for row in allowed if row.report_id]
+        if report_ids:
+            Report.query.filter(Report.id.in_(report_ids)).update({'status': 'RESUELTO'}, synchronize_session=False)
+    if completed_now:
+        analytics.record_repairs([(row.asset_id, row.reported_at) for row in completed_now], completed_at)
+
+    orders_by_requester = defaultdict(list)
+    for row in allowed:
+        if row.requester_id:
+            orders_by_requester[row.requester_id].append(row.id)
+    messages = {
+        requester_id: f'Órdenes {notifications.format_id_list(order_ids)} actualizadas a {status}'
+        for requester_id, order_ids in orders_by_requester.items()
+    }
+    notifications.notify_bulk_status_change(messages, 'Órdenes Actualizadas')
+
+    db.session.commit()
+    return result, messages
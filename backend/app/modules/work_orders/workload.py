@@ -0,0 +1,73 @@
+"""
+Technician workload index
+users.open_work_orders counts the orders in OPEN_WORK_ORDER_STATUSES assigned to
+each user. It is adjusted in the same transaction as every assignment and status change,
+so picking the least-loaded technician is one lookup on ix_users_technician_load instead
+of counting work orders.
+"""
+from collections import Counter
+from sqlalchemy import case, func
+from app.extensions import db
+from app.common.validators import OPEN_WORK_ORDER_STATUSES
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+def counts_as_load(technician_id, status):
+    return technician_id is not None and status in OPEN_WORK_ORDER_STATUSES
+
+
+def track(deltas, old_technician_id, old_status, new_technician_id, new_status):
+    """Add the effect of one order moving from (technician, status) to another to deltas"""
+    if counts_as_load(old_technician_id, old_status):
+        deltas[old_technician_id] -= 1
+    if counts_as_load(new_technician_id, new_status):
+        deltas[new_technician_id] += 1
+    return deltas
+
+
+def apply(deltas):
+    """Apply per-technician deltas with one UPDATE; the caller commits"""
+    deltas = {technician_id: delta for technician_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    User.query.filter(User.id.in_(deltas)).update({
+        User.open_work_orders: User.open_work_orders + case(deltas, value=User.id, else_=0),
+        # Load is not part of the serialized user; keep ETags and sync feeds quiet
+        User.updated_at: User.updated_at,
+    }, synchronize_session=False)
+
+
+def record_change(old_technician_id, old_status, new_technician_id, new_status):
+    apply(track(Counter(), old_technician_id, old_status, new_technician_id, new_status))
+
+
+def least_loaded_technician():
+    """Active technician with the fewest open orders, ties broken by id; None if there is none"""
+    return User.query.filter_by(role='technician', is_active=True).order_by(
+        User.open_work_orders, User.id
+    ).first()
+
+
+def load_distribution():
+    technicians = User.query.filter_by(role='technician', is_active=True).order_by(
+        User.open_work_orders, User.id
+    ).with_entities(User.id, User.name, User.open_work_orders).all()
+    return [
+        {'technician_id': row.id, 'name': row.name, 'open_work_orders': row.open_work_orders}
+        for row in technicians
+    ]
+
+
+def rebuild():
+    """Recompute every counter from work_orders; returns the number of users updated"""
+    open_orders = db.session.query(func.count(WorkOrder.id)).filter(
+        WorkOrder.technician_id == User.id,
+        WorkOrder.status.in_(OPEN_WORK_ORDER_STATUSES)
+    ).scalar_subquery()
+    updated = User.query.update(
+        {User.open_work_orders: open_orders, User.updated_at: User.updated_at},
+        synchronize_session=False
+    )
+    db.session.commit()
+    return updated
+
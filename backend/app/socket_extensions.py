@@ -1,10 +1,94 @@
-from flask_socketio import SocketIO
+from flask import request
+from flask_socketio import SocketIO, join_room
+from app.common.socket_bus import build_client_manager
 
+# async_mode and the message queue are chosen per deployment in init_app
 socketio = SocketIO(
     cors_allowed_origins="*",
-    async_mode='threading',
     logger=False,
     engineio_logger=False,
     ping_timeout=60,
     ping_interval=25
 )
+
+
+def init_app(app):
+    """
+    Attach Socket.IO to the app.
+
+    SOCKETIO_ASYNC_MODE selects the server mode: 'threading' for development,
+    'gevent' or 'eventlet' for thousands of cooperative connections per worker.
+    SOCKETIO_MESSAGE_QUEUE connects the workers so an emit from any of them
+    reaches sockets held by the others.
+    """
+    options = {'async_mode': app.config.get('SOCKETIO_ASYNC_MODE') or 'threading'}
+
+    url = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    channel = app.config.get('SOCKETIO_CHANNEL', 'mafis-socketio')
+    if url:
+        client_manager = build_client_manager(url, channel)
+        if client_manager is not None:
+            options['client_manager'] = client_manager
+        else:
+            options['message_queue'] = url
+            options['channel'] = channel
+
+    socketio.init_app(app, **options)
+
+
+def user_room(user_id):
+    return f'user:{user_id}'
+
+
+def role_room(role):
+    return f'role:{role}'
+
+
+@socketio.on('connect')
+def handle_connect(auth=None):
+    """Authenticate the socket with the access token and join the user's rooms"""
+    from flask_jwt_extended import decode_token
+    from app.common.auth import is_token_revoked
+
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        return False
+
+    try:
+        claims = decode_token(token)
+    except Exception:
+        return False
+
+    if is_token_revoked(claims):
+        return False
+
+    role = claims.get('role')
+    if role is None:
+        # Tokens issued before role claims existed
+        from app.extensions import db
+        from app.modules.users.models import User
+        user = db.session.get(User, int(claims['sub']))
+        if user is None or not user.is_active:
+            return False
+        role = user.role
+
+    join_room(user_room(claims['sub']))
+    join_room(role_room(role))
+
+
+def notify_user(user_id, message, notification_type='info'):
+    """In-app notification delivered only to the sockets of one user"""
+    socketio.emit('notification', {
+        'userId': user_id,
+        'message': message,
+        'type': notification_type
+    }, to=user_room(user_id))
+
+
+def notify_role(role, message, notification_type='info'):
+    """In-app notification delivered to every connected user with the role"""
+    socketio.emit('notification', {
+        'userId': None,
+        'message': message,
+        'type': notification_type
+    }, to=role_room(role))
@@ -0,0 +1,408 @@
+"""
+Benchmark de los endpoints de la API sobre SQLite
+Genera un dataset sintético (generate_data.py) en una base SQLite, recorre cada endpoint
+de los blueprints con el test client de Flask y reporta latencia p50/p99, consultas SQL
+por petición y pico de memoria (tracemalloc, en una pasada aparte para no sesgar la
+latencia). Los resultados se guardan en JSON; --compare muestra la diferencia contra una
+corrida anterior.
+Ejecutar: python bench_api.py --scale 0.01 --iterations 20 --output bench_antes.json
+          python bench_api.py --scale 0.01 --iterations 20 --output bench_despues.json --compare bench_antes.json
+Con --db se reutiliza (o se crea una sola vez) la base generada, útil a escala 1.
+La app corre con la configuración de producción (costo de bcrypt, caché del dashboard),
+así que login, registro y los usuarios generados usan el costo real de los hashes.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from sqlalchemy import event, func
+from app import create_app
+from app.extensions import db
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+from generate_data import DEFAULT_COUNTS, PASSWORD, ROLES, generate
+
+# Endpoints that are not part of the API surface
+SKIPPED_ENDPOINTS = {'static'}
+
+
+class Endpoint:
+    """
+    One benchmarked request
+
+    Args:
+        name: Label in the results, e.g. 'GET /api/assets/<id>'
+        endpoint: Flask endpoint it exercises, to check every route is covered
+        role: Whose token is sent (admin, technician, requester or None)
+        request: fn(bench) -> dict of test client arguments (path, json, data...), built
+            before the clock starts; may create whatever the request needs
+    """
+
+    def __init__(self, name, endpoint, role, request):
+        self.name = name
+        self.endpoint = endpoint
+        self.role = role
+        self.request = request
+
+
+class Bench:
+    """Dataset ids, tokens and helpers shared by the endpoint builders"""
+
+    def __init__(self, app, seed):
+        self.app = app
+        self.client = app.test_client()
+        self.random = random.Random(seed)
+        self.sequence = 0
+        with app.app_context():
+            self.assets = self._id_range(Asset)
+            self.reports = self._id_range(Report)
+            self.work_orders = self._id_range(WorkOrder)
+            self.users = {
+                role: User.query.filter_by(role=role, is_active=True).with_entities(User.id, User.email).first()
+                for role in ROLES
+            }
+            self.technician_ids = [row.id for row in User.query.filter_by(role='technician').with_entities(User.id)]
+        missing = [role for role, user in self.users.items() if user is None]
+        if missing:
+            raise RuntimeError(f'La base no tiene usuarios activos con rol {", ".join(missing)}')
+        self.tokens = {role: self.login(user.email) for role, user in self.users.items()}
+
+    @staticmethod
+    def _id_range(model):
+        low, high = db.session.query(func.min(model.id), func.max(model.id)).one()
+        return (low or 0, high or 0)
+
+    def login(self, email):
+        response = self.client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+        return response.get_json()['access_token']
+
+    def headers(self, role):
+        return {'Authorization': f'Bearer {self.tokens[role]}'} if role else {}
+
+    def pick(self, id_range):
+        return self.random.randint(*id_range)
+
+    def sample(self, id_range, count):
+        low, high = id_range
+        return self.random.sample(range(low, high + 1), min(count, high - low + 1))
+
+    def unique(self, prefix):
+        self.sequence += 1
+        return f'{prefix}-{os.getpid()}-{time.time_ns()}-{self.sequence}'
+
+    def setup(self, method, path, role, **kwargs):
+        """Untimed request that prepares a benchmarked one; returns the JSON body"""
+        response = self.client.open(path, method=method, headers=self.headers(role), **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f'Setup {method} {path} -> {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        return response.get_json()
+
+    def new_asset(self):
+        return self.setup('POST', '/api/assets/', 'admin', json={
+            'name': self.unique('Activo benchmark'), 'type': 'EQUIPO', 'location': 'Bodega'
+        })['id']
+
+    def new_report(self):
+        return self.setup('POST', '/api/reports/', 'requester', json={
+            'asset_id': self.pick(self.assets), 'description': 'Bomba benchmark hace ruido', 'priority': 'ALTA'
+        })['id']
+
+    def new_user(self):
+        return self.setup('POST', '/api/users/', 'admin', json={
+            'email': f'{self.unique("usuario")}@bench.local', 'password': PASSWORD, 'name': 'Usuario benchmark'
+        })['id']
+
+    def new_subscription(self):
+        endpoint = f'https://fcm.googleapis.com/fcm/send/{self.unique("bench")}'
+        self.setup('POST', '/api/push/subscribe', 'requester', json={
+            'endpoint': endpoint, 'keys': {'p256dh': 'bench-p256dh', 'auth': 'bench-auth'}
+        })
+        return endpoint
+
+
+def import_file(bench, rows=50):
+    lines = ['name,type,location,serial_number'] + [
+        f'{bench.unique("Importado")},EQUIPO,Bodega,{bench.unique("SN")}' for _ in range(rows)
+    ]
+    return (io.BytesIO('\n'.join(lines).encode('utf-8')), 'activos.csv')
+
+
+# Reads first, on the pristine dataset; writes afterwards
+ENDPOINTS = [
+    Endpoint('GET /api/health', 'health', None, lambda b: {'path': '/api/health'}),
+    Endpoint('GET /api/metrics', 'prometheus_metrics', None, lambda b: {'path': '/api/metrics'}),
+    Endpoint('GET /api/auth/me', 'auth.me', 'requester', lambda b: {'path': '/api/auth/me'}),
+    Endpoint('GET /api/assets', 'assets.get_assets', 'admin', lambda b: {'path': '/api/assets/'}),
+    Endpoint('GET /api/assets/<id>', 'assets.get_asset', 'admin',
+             lambda b: {'path': f'/api/assets/{b.pick(b.assets)}'}),
+    Endpoint('GET /api/assets/<id>/history', 'assets.get_asset_history', 'admin',
+             lambda b: {'path': f'/api/assets/{b.pick(b.assets)}/history'}),
+    Endpoint('GET /api/assets/export', 'assets.export_assets', 'admin',
+             lambda b: {'path': '/api/assets/export?format=csv'}),
+    Endpoint('GET /api/reports', 'reports.get_reports', 'admin', lambda b: {'path': '/api/reports/'}),
+    Endpoint('GET /api/reports?status', 'reports.get_reports', 'admin',
+             lambda b: {'path': '/api/reports/?status=ABIERTO'}),
+    Endpoint('GET /api/reports (solicitante)', 'reports.get_reports', 'requester',
+             lambda b: {'path': '/api/reports/'}),
+    Endpoint('GET /api/reports/<id>', 'reports.get_report', 'admin',
+             lambda b: {'path': f'/api/reports/{b.pick(b.reports)}'}),
+    Endpoint('GET /api/work-orders', 'work_orders.get_work_orders', 'admin',
+             lambda b: {'path': '/api/work-orders/'}),
+    Endpoint('GET /api/work-orders?limit', 'work_orders.get_work_orders', 'admin',
+             lambda b: {'path': '/api/work-orders/?limit=50'}),
+    Endpoint('GET /api/work-orders (técnico)', 'work_orders.get_work_orders', 'technician',
+             lambda b: {'path': '/api/work-orders/?limit=50'}),
+    Endpoint('GET /api/work-orders/<id>', 'work_orders.get_work_order', 'admin',
+             lambda b: {'path': f'/api/work-orders/{b.pick(b.work_orders)}'}),
+    Endpoint('GET /api/work-orders/workload', 'work_orders.get_workload', 'admin',
+             lambda b: {'path': '/api/work-orders/workload'}),
+    Endpoint('GET /api/users', 'users.get_users', 'admin', lambda b: {'path': '/api/users/'}),
+    Endpoint('GET /api/users/<id>', 'users.get_user', 'admin',
+             lambda b: {'path': f'/api/users/{b.users["technician"].id}'}),
+    Endpoint('GET /api/dashboard/summary', 'dashboard.get_summary', 'admin',
+             lambda b: {'path': '/api/dashboard/summary'}),
+    Endpoint('GET /api/search', 'search.search', 'admin', lambda b: {'path': '/api/search/?q=bomba ruido'}),
+    Endpoint('GET /api/sync', 'sync.get_changes', 'technician', lambda b: {'path': '/api/sync/'}),
+    Endpoint('GET /api/analytics/assets', 'analytics.get_asset_reliability', 'admin',
+             lambda b: {'path': '/api/analytics/assets'}),
+    Endpoint('GET /api/push/vapid-public-key', 'push.get_vapid_public_key', None,
+             lambda b: {'path': '/api/push/vapid-public-key'}),
+
+    Endpoint('POST /api/auth/login', 'auth.login', None,
+             lambda b: {'path': '/api/auth/login', 'method': 'POST',
+                        'json': {'email': b.users['requester'].email, 'password': PASSWORD}}),
+    Endpoint('POST /api/auth/register', 'auth.register', None,
+             lambda b: {'path': '/api/auth/register', 'method': 'POST', 'json': {
+                 'email': f'{b.unique("registro")}@bench.local', 'password': PASSWORD, 'name': 'Registro'}}),
+    Endpoint('POST /api/assets', 'assets.create_asset', 'admin',
+             lambda b: {'path': '/api/assets/', 'method': 'POST', 'json': {
+                 'name': b.unique('Activo'), 'type': 'EQUIPO', 'location': 'Bloque A'}}),
+    Endpoint('POST /api/assets/import', 'assets.import_assets', 'admin',
+             lambda b: {'path': '/api/assets/import', 'method': 'POST', 'data': {'file': import_file(b)},
+                        'content_type': 'multipart/form-data'}),
+    Endpoint('PUT /api/assets/<id>', 'assets.update_asset', 'admin',
+             lambda b: {'path': f'/api/assets/{b.pick(b.assets)}', 'method': 'PUT',
+                        'json': {'location': 'Bloque B'}}),
+    Endpoint('DELETE /api/assets/<id>', 'assets.delete_asset', 'admin',
+             lambda b: {'path': f'/api/assets/{b.new_asset()}', 'method': 'DELETE'}),
+    Endpoint('POST /api/reports', 'reports.create_report', 'requester',
+             lambda b: {'path': '/api/reports/', 'method': 'POST', 'json': {
+                 'asset_id': b.pick(b.assets), 'description': 'Compresor no enciende', 'priority': 'ALTA'}}),
+    Endpoint('PUT /api/reports/<id>', 'reports.update_report', 'admin',
+             lambda b: {'path': f'/api/reports/{b.pick(b.reports)}', 'method': 'PUT',
+                        'json': {'description': 'Descripción actualizada'}}),
+    Endpoint('PATCH /api/reports/<id>/status', 'reports.update_report_status', 'admin',
+             lambda b: {'path': f'/api/reports/{b.pick(b.reports)}/status', 'method': 'PATCH',
+                        'json': {'status': 'EN PROGRESO'}}),
+    Endpoint('PATCH /api/reports/status (100)', 'reports.bulk_update_report_status', 'admin',
+             lambda b: {'path': '/api/reports/status', 'method': 'PATCH',
+                        'json': {'ids': b.sample(b.reports, 100), 'status': 'EN PROGRESO'}}),
+    Endpoint('DELETE /api/reports/<id>', 'reports.delete_report', 'admin',
+             lambda b: {'path': f'/api/reports/{b.new_report()}', 'method': 'DELETE'}),
+    Endpoint('POST /api/work-orders', 'work_orders.create_work_order', 'admin',
+             lambda b: {'path': '/api/work-orders/', 'method': 'POST',
+                        'json': {'report_id': b.new_report(), 'auto_assign': True}}),
+    Endpoint('PATCH /api/work-orders/<id>/assign', 'work_orders.assign_technician', 'admin',
+             lambda b: {'path': f'/api/work-orders/{b.pick(b.work_orders)}/assign', 'method': 'PATCH',
+                        'json': {'technician_id': b.random.choice(b.technician_ids)}}),
+    Endpoint('PATCH /api/work-orders/<id>/status', 'work_orders.update_status', 'admin',
+             lambda b: {'path': f'/api/work-orders/{b.pick(b.work_orders)}/status', 'method': 'PATCH',
+                        'json': {'status': 'EN PROGRESO'}}),
+    Endpoint('PATCH /api/work-orders/status (100)', 'work_orders.bulk_update_status', 'admin',
+             lambda b: {'path': '/api/work-orders/status', 'method': 'PATCH',
+                        'json': {'ids': b.sample(b.work_orders, 100), 'status': 'COMPLETADO'}}),
+    Endpoint('POST /api/users', 'users.create_user', 'admin',
+             lambda b: {'path': '/api/users/', 'method': 'POST', 'json': {
+                 'email': f'{b.unique("usuario")}@bench.local', 'password': PASSWORD, 'name': 'Usuario'}}),
+    Endpoint('PUT /api/users/<id>', 'users.update_user', 'admin',
+             lambda b: {'path': f'/api/users/{b.users["technician"].id}', 'method': 'PUT',
+                        'json': {'phone': '3000000000'}}),
+    Endpoint('PUT /api/users/me/preferences', 'users.update_my_preferences', 'requester',
+             lambda b: {'path': '/api/users/me/preferences', 'method': 'PUT', 'json': {'email': True}}),
+    Endpoint('DELETE /api/users/<id>', 'users.delete_user', 'admin',
+             lambda b: {'path': f'/api/users/{b.new_user()}', 'method': 'DELETE'}),
+    Endpoint('POST /api/push/subscribe', 'push.subscribe', 'requester',
+             lambda b: {'path': '/api/push/subscribe', 'method': 'POST', 'json': {
+                 'endpoint': f'https://fcm.googleapis.com/fcm/send/{b.unique("bench")}',
+                 'keys': {'p256dh': 'bench-p256dh', 'auth': 'bench-auth'}}}),
+    Endpoint('POST /api/push/unsubscribe', 'push.unsubscribe', 'requester',
+             lambda b: {'path': '/api/push/unsubscribe', 'method': 'POST',
+                        'json': {'endpoint': b.new_subscription()}}),
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def run_endpoint(bench, spec, iterations, statements):
+    """Time `iterations` requests, then one more under tracemalloc for the memory peak"""
+    latencies, queries, statuses = [], [], {}
+
+    def send(traced=False):
+        kwargs = spec.request(bench)
+        path = kwargs.pop('path')
+        kwargs.setdefault('method', 'GET')
+        if traced:
+            tracemalloc.start()
+        statements[0] = 0
+        start = time.perf_counter()
+        response = bench.client.open(path, headers=bench.headers(spec.role), **kwargs)
+        response.get_data()  # drain streamed bodies inside the measurement
+        elapsed = time.perf_counter() - start
+        peak = None
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return response.status_code, elapsed, statements[0], peak
+
+    for _ in range(iterations):
+        status, elapsed, count, _peak = send()
+        latencies.append(elapsed)
+        queries.append(count)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    *_, peak = send(traced=True)
+
+    return {
+        'endpoint': spec.endpoint,
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2),
+        'queries_p50': statistics.median(queries),
+        'queries_max': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'statuses': statuses,
+    }
+
+
+def build_app(db_path, counts, seed, batch_size):
+    """
+    Production settings (bcrypt cost, dashboard cache...) on a SQLite file; only what
+    would reach outside the process or alter the measurement is turned off
+    """
+    app = create_app('production', overrides={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        # Budget overruns are measured here, not logged
+        'QUERY_GUARD_ENABLED': False,
+        # Requests still write the outbox; nothing is delivered to the synthetic users
+        'NOTIFICATION_WORKER_ENABLED': False,
+        # Emits stay in this process instead of a shared bus
+        'SOCKETIO_MESSAGE_QUEUE': None,
+    })
+    with app.app_context():
+        db.create_all()
+        if Asset.query.first() is not None:
+            print(f' Reutilizando el dataset de {db_path}')
+            return app, None
+        print(f' Generando {counts}')
+        return app, generate(counts, seed=seed, batch_size=batch_size)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)['endpoints']
+
+    def change(before, after):
+        return f'{(after - before) / before * 100:+6.0f}%' if before else '     -'
+
+    print(f'\n Comparación contra {baseline_path}')
+    print(f'   {"endpoint":<42} {"p50 ms":>15} {"p99 ms":>15} {"consultas":>11} {"memoria KB":>17}')
+    for name, after in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f'   {name:<42} (nuevo)')
+            continue
+        print(
+            f'   {name:<42} {after["p50_ms"]:8.1f} {change(before["p50_ms"], after["p50_ms"])}'
+            f' {after["p99_ms"]:8.1f} {change(before["p99_ms"], after["p99_ms"])}'
+            f' {before["queries_max"]:>4} -> {after["queries_max"]:<4}'
+            f' {after["peak_memory_kb"]:9.0f} {change(before["peak_memory_kb"], after["peak_memory_kb"])}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.01, help='Fracción del dataset completo de generate_data.py')
+    parser.add_argument('--iterations', type=int, default=20, help='Peticiones medidas por endpoint')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--db', help='Archivo SQLite a reutilizar o crear (por defecto uno temporal)')
+    parser.add_argument('--only', help='Solo los endpoints cuyo nombre contiene este texto')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='JSON de una corrida anterior')
+    args = parser.parse_args()
+
+    counts = {name: max(1, int(count * args.scale)) for name, count in DEFAULT_COUNTS.items()}
+    # Every scenario logs in as one user per role
+    counts['users'] = max(len(ROLES), counts['users'])
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.abspath(args.db) if args.db else os.path.join(tmp, 'bench.db')
+        app, created = build_app(db_path, counts, args.seed, args.batch_size)
+
+        covered = {spec.endpoint for spec in ENDPOINTS}
+        missing = sorted(rule.endpoint for rule in app.url_map.iter_rules()
+                         if rule.endpoint not in covered and rule.endpoint not in SKIPPED_ENDPOINTS)
+        if missing:
+            print(f' Endpoints sin escenario: {", ".join(missing)}')
+
+        statements = [0]
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', lambda *_: statements.__setitem__(0, statements[0] + 1))
+
+        bench = Bench(app, args.seed)
+        with app.app_context():
+            dataset = {
+                'assets': db.session.query(func.count(Asset.id)).scalar(),
+                'reports': db.session.query(func.count(Report.id)).scalar(),
+                'work_orders': db.session.query(func.count(WorkOrder.id)).scalar(),
+                'users': db.session.query(func.count(User.id)).scalar(),
+            }
+
+        results = {}
+        print(f'\n {args.iterations} peticiones por endpoint, dataset: {dataset}')
+        print(f'   {"endpoint":<42} {"p50 ms":>8} {"p99 ms":>8} {"consultas":>9} {"memoria KB":>10}  códigos')
+        for spec in ENDPOINTS:
+            if args.only and args.only not in spec.name:
+                continue
+            with app.app_context():
+                result = run_endpoint(bench, spec, args.iterations, statements)
+            results[spec.name] = result
+            print(
+                f'   {spec.name:<42} {result["p50_ms"]:8.1f} {result["p99_ms"]:8.1f} '
+                f'{result["queries_max"]:9} {result["peak_memory_kb"]:10.0f}  {result["statuses"]}'
+            )
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'scale': args.scale,
+        'seed': args.seed,
+        'generated': created,
+        'dataset': dataset,
+        'missing_endpoints': missing,
+        'endpoints': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, ensure_ascii=False)
+    print(f'\n Resultados guardados en {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
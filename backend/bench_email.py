@@ -0,0 +1,120 @@
+"""
+Benchmark de envío de correos contra un servidor SMTP local de prueba
+Compara una conexión SMTP por mensaje con el pool de conexiones persistentes.
+Ejecutar: python bench_email.py --messages 200
+"""
+import argparse
+import socketserver
+import threading
+import time
+from flask_mail import Message
+from app import create_app
+from app.extensions import mail
+from app.common.email_service import EmailSenderPool
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Servidor SMTP mínimo: acepta todo y descarta los mensajes"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        self.reply('220 localhost SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'ignore').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif command.startswith('DATA'):
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.received += 1
+                self.reply('250 OK')
+            elif command.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+    received = 0
+
+
+def build_message(i):
+    return Message(
+        subject=f'[MAFIS] Benchmark #{i}',
+        recipients=['bench@mafis.local'],
+        body='Mensaje de prueba',
+        html='<p>Mensaje de prueba</p>'
+    )
+
+
+def bench_connection_per_message(app, count):
+    """Comportamiento anterior: un hilo y una conexión SMTP por mensaje"""
+    def send(msg):
+        with app.app_context():
+            mail.send(msg)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=send, args=(build_message(i),)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_pool(app, count, workers, batch_size):
+    pool = EmailSenderPool(app, workers=workers, max_queue=count, batch_size=batch_size)
+    start = time.perf_counter()
+    futures = [pool.submit(build_message(i)) for i in range(count)]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=20)
+    args = parser.parse_args()
+
+    sink = SMTPSink(('127.0.0.1', 0), SMTPSinkHandler)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+
+    app = create_app('testing')
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=sink.server_address[1],
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_USERNAME=None,
+        MAIL_PASSWORD=None,
+        MAIL_SUPPRESS_SEND=False
+    )
+    mail.init_app(app)
+
+    with app.app_context():
+        results = {
+            'conexión por mensaje': bench_connection_per_message(app, args.messages),
+            f'pool ({args.workers} conexiones)': bench_pool(app, args.messages, args.workers, args.batch_size),
+        }
+
+    print(f'\n Envío de {args.messages} correos (recibidos por el servidor: {sink.received})')
+    for name, elapsed in results.items():
+        print(f'   {name:<28} {elapsed:7.3f}s  {args.messages / elapsed:8.1f} msg/s')
+    sink.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark de inicio de sesión por costo de bcrypt
+Lanza logins concurrentes contra /api/auth/login con el pool de hashing y reporta
+logins/s, latencias y respuestas 503 (pool saturado) para cada BCRYPT_ROUNDS.
+Ejecutar: python bench_login.py --rounds 8,10,12 --logins 200 --concurrency 16
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from app.modules.users.models import User
+
+PASSWORD = 'benchmark-password'
+
+
+def build_app(rounds, db_path, workers, max_pending):
+    app = create_app('testing', overrides={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'BCRYPT_ROUNDS': rounds,
+        'PASSWORD_HASH_WORKERS': workers,
+        'PASSWORD_HASH_MAX_PENDING': max_pending,
+    })
+    with app.app_context():
+        db.create_all()
+        user = User(email='bench@mafis.local', name='Benchmark', role='requester')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def bench(app, logins, concurrency):
+    """Reparte los logins entre `concurrency` clientes; devuelve (segundos, latencias, códigos)"""
+    latencies, statuses = [], []
+    lock = threading.Lock()
+    remaining = iter(range(logins))
+
+    def client():
+        http = app.test_client()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            response = http.post('/api/auth/login', json={'email': 'bench@mafis.local', 'password': PASSWORD})
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses.append(response.status_code)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', default='8,10,12', help='Costos de bcrypt separados por coma')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=0, help='Hilos de hashing (0 = uno por CPU)')
+    parser.add_argument('--max-pending', type=int, default=64)
+    args = parser.parse_args()
+
+    print(f'\n {args.logins} logins, {args.concurrency} clientes concurrentes, CPUs: {os.cpu_count()}')
+    print(f'   {"costo":>5} {"logins/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"200":>5} {"503":>5}')
+    for rounds in [int(value) for value in args.rounds.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = build_app(rounds, os.path.join(tmp, 'bench.db'), args.workers, args.max_pending)
+            elapsed, latencies, statuses = bench(app, args.logins, args.concurrency)
+            ok = statuses.count(200)
+            print(
+                f'   {rounds:>5} {ok / elapsed:9.1f} {statistics.median(latencies) * 1000:8.1f} '
+                f'{percentile(latencies, 0.95) * 1000:8.1f} {ok:>5} {statuses.count(503):>5}'
+            )
+            app.extensions['password_hasher'].shutdown()
+
+
+if __name__ == '__main__':
+    main()
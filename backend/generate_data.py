@@ -0,0 +1,295 @@
+"""
+Generador de datos sintéticos para pruebas de carga
+Crea usuarios, activos, reportes, órdenes de trabajo y suscripciones push en la base
+configurada (SQLALCHEMY_DATABASE_URI) con inserciones por lotes, y al final recalcula la
+carga de los técnicos y los acumulados de confiabilidad. Se puede ejecutar sobre una base
+con datos: los ids continúan desde los existentes.
+Ejecutar: python generate_data.py --assets 100000 --reports 1000000 --work-orders 500000 --users 5000 --subscriptions 2000
+"""
+import argparse
+import random
+import secrets
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from app import create_app
+from app.extensions import db
+from app.common.passwords import get_password_hasher
+from app.common.validators import (
+    OPEN_WORK_ORDER_STATUSES, VALID_ASSET_STATUSES, VALID_ASSET_TYPES, VALID_CRITICALITY, VALID_PRIORITIES
+)
+from app.modules.analytics.services import rebuild_rollups
+from app.modules.assets.models import Asset
+from app.modules.push.models import PushSubscription
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders import workload
+from app.modules.work_orders.models import WorkOrder
+
+PASSWORD = 'sintetico123'
+
+DEFAULT_COUNTS = {
+    'users': 5000,
+    'assets': 100000,
+    'reports': 1000000,
+    'work_orders': 500000,
+    'subscriptions': 2000,
+}
+
+# Every run with users creates at least one of each role
+ROLES = ('admin', 'technician', 'requester')
+# Share of the generated users per role; the rest are requesters
+ADMIN_SHARE = 0.01
+TECHNICIAN_SHARE = 0.10
+
+ASSET_KINDS = ['Bomba', 'Compresor', 'Aire acondicionado', 'Ascensor', 'Planta eléctrica', 'Tablero eléctrico',
+               'Caldera', 'Motor', 'Puerta', 'Baño', 'Luminaria', 'Red de datos', 'Impresora', 'Portátil']
+LOCATIONS = ['Bloque A', 'Bloque B', 'Bloque C', 'Sótano', 'Planta 1', 'Planta 2', 'Planta 3', 'Bodega',
+             'Laboratorio', 'Cafetería', 'Parqueadero', 'Oficina principal']
+FAULTS = ['no enciende', 'hace ruido', 'presenta fuga', 'se apaga solo', 'no enfría', 'olor a quemado',
+          'vibración excesiva', 'luz intermitente', 'sin presión', 'bloqueado', 'daño físico', 'falla intermitente']
+FIRST_NAMES = ['Ana', 'Carlos', 'Diana', 'Jorge', 'Laura', 'Luis', 'María', 'Pedro', 'Sofía', 'Andrés']
+LAST_NAMES = ['García', 'Rodríguez', 'Martínez', 'López', 'Gómez', 'Pérez', 'Sánchez', 'Ramírez', 'Torres']
+
+# Work order status mix (weights) and the report status each one implies
+WORK_ORDER_MIX = {'ABIERTO': 5, 'ASIGNADO': 15, 'EN PROGRESO': 10, 'COMPLETADO': 40, 'CERRADO': 30}
+REPORT_STATUS_FOR_ORDER = {
+    'ABIERTO': 'ABIERTO', 'ASIGNADO': 'EN PROGRESO', 'EN PROGRESO': 'EN PROGRESO',
+    'COMPLETADO': 'RESUELTO', 'CERRADO': 'CERRADO',
+}
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(model, rows):
+    if rows:
+        # Core executemany: the ORM would insert row by row to fetch primary keys
+        db.session.execute(insert(model), rows)
+        db.session.commit()
+        rows.clear()
+
+
+def _time_at(start, span, index, total):
+    """Evenly spread timestamps with jitter, so ids grow with time as in production"""
+    base = span * index / max(total, 1)
+    return start + timedelta(seconds=base + random.uniform(0, span / max(total, 1)))
+
+
+def generate_users(count, batch_size, start, span):
+    """Returns (admin ids, technician ids, requester ids) of the new users"""
+    first_id = _next_id(User)
+    password_hash = get_password_hasher().hash(PASSWORD)
+    admins = max(1, int(count * ADMIN_SHARE)) if count else 0
+    technicians = max(1, int(count * TECHNICIAN_SHARE)) if count else 0
+    ids = {'admin': [], 'technician': [], 'requester': []}
+
+    rows = []
+    for i in range(count):
+        user_id = first_id + i
+        role = 'admin' if i < admins else 'technician' if i < admins + technicians else 'requester'
+        ids[role].append(user_id)
+        created_at = _time_at(start, span / 4, i, count)
+        rows.append({
+            'id': user_id,
+            'email': f'{role}.{user_id}@sintetico.mafis.local',
+            'password_hash': password_hash,
+            'name': f'{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {user_id}',
+            'role': role,
+            'phone': f'300{user_id:07d}'[-10:],
+            'created_at': created_at,
+            'updated_at': created_at,
+            'is_active': True,
+            'token_version': 0,
+            'open_work_orders': 0,
+            'notify_email': random.random() < 0.8,
+            'notify_whatsapp': random.random() < 0.5,
+            'notify_push': random.random() < 0.7,
+        })
+        if len(rows) >= batch_size:
+            _insert(User, rows)
+    _insert(User, rows)
+    return ids['admin'], ids['technician'], ids['requester']
+
+
+def generate_assets(count, batch_size, start, span):
+    """Returns the id range of the new assets"""
+    first_id = _next_id(Asset)
+    rows = []
+    for i in range(count):
+        asset_id = first_id + i
+        kind = random.choice(ASSET_KINDS)
+        created_at = _time_at(start, span / 2, i, count)
+        rows.append({
+            'id': asset_id,
+            'name': f'{kind} {asset_id}',
+            'description': f'{kind} de uso general',
+            'type': random.choice(VALID_ASSET_TYPES),
+            'location': f'{random.choice(LOCATIONS)} - {random.randint(100, 399)}',
+            'serial_number': f'SN-{asset_id:08d}',
+            'status': random.choices(VALID_ASSET_STATUSES, weights=(85, 5, 10))[0],
+            'criticality': random.choice(VALID_CRITICALITY),
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+        if len(rows) >= batch_size:
+            _insert(Asset, rows)
+    _insert(Asset, rows)
+    return range(first_id, first_id + count)
+
+
+def generate_reports(count, work_orders, asset_ids, requester_ids, technician_ids, batch_size, start, span):
+    """
+    Reports plus the work orders of a random subset of them
+
+    Each order is written in the same batch as its report, created shortly after it, and
+    the report status follows the order status. A few assets get most of the reports,
+    as in a real plant, so per-asset history and rollups have hot spots.
+    """
+    work_orders = min(work_orders, count) if technician_ids else 0
+    first_report_id = _next_id(Report)
+    first_order_id = _next_id(WorkOrder)
+    with_order = set(random.sample(range(count), work_orders))
+    statuses, weights = list(WORK_ORDER_MIX), list(WORK_ORDER_MIX.values())
+
+    reports, orders = [], []
+    for i in range(count):
+        report_id = first_report_id + i
+        reported_at = _time_at(start, span, i, count)
+        order_status = random.choices(statuses, weights=weights)[0] if i in with_order else None
+        reports.append({
+            'id': report_id,
+            'asset_id': asset_ids[int(len(asset_ids) * random.random() ** 2)],
+            'requester_id': random.choice(requester_ids),
+            'description': f'{random.choice(ASSET_KINDS)} {random.choice(FAULTS)}',
+            'priority': random.choice(VALID_PRIORITIES),
+            'status': REPORT_STATUS_FOR_ORDER[order_status] if order_status else 'ABIERTO',
+            'created_at': reported_at,
+            'updated_at': reported_at,
+        })
+
+        if order_status:
+            created_at = reported_at + timedelta(minutes=random.randint(5, 240))
+            completion_date = None
+            if order_status not in OPEN_WORK_ORDER_STATUSES:
+                completion_date = created_at + timedelta(hours=random.expovariate(1 / 24))
+            orders.append({
+                'id': first_order_id + len(orders),
+                'report_id': report_id,
+                'technician_id': None if order_status == 'ABIERTO' else random.choice(technician_ids),
+                'status': order_status,
+                'scheduled_date': created_at + timedelta(days=1),
+                'completion_date': completion_date,
+                'notes': 'Orden generada automáticamente',
+                'created_at': created_at,
+                'updated_at': completion_date or created_at,
+            })
+
+        if len(reports) >= batch_size:
+            first_order_id += len(orders)
+            _insert(Report, reports)
+            _insert(WorkOrder, orders)
+    _insert(Report, reports)
+    _insert(WorkOrder, orders)
+    return count, work_orders
+
+
+def generate_subscriptions(count, user_ids, batch_size):
+    rows = []
+    for _ in range(count):
+        token = secrets.token_urlsafe(24)
+        rows.append({
+            'user_id': random.choice(user_ids),
+            'endpoint': f'https://fcm.googleapis.com/fcm/send/sintetico-{token}',
+            'p256dh': secrets.token_urlsafe(65),
+            'auth': secrets.token_urlsafe(16),
+            'created_at': datetime.utcnow(),
+        })
+        if len(rows) >= batch_size:
+            _insert(PushSubscription, rows)
+    _insert(PushSubscription, rows)
+
+
+def generate(counts, seed=42, batch_size=5000, days=730, log=print):
+    """
+    Fill the current app's database; call inside an app context
+
+    Args:
+        counts: Dict with users, assets, reports, work_orders and subscriptions
+        seed: Random seed, so two runs with the same counts build the same dataset
+        days: Reports are spread over this many days up to now
+
+    Returns:
+        Dict with the rows created per table
+
+    Raises:
+        ValueError: users is not 0 and cannot cover every role, or reports were asked
+            for with no requester to file them
+    """
+    if 0 < counts['users'] < len(ROLES):
+        raise ValueError(f'Se necesitan al menos {len(ROLES)} usuarios (uno por rol: {", ".join(ROLES)})')
+    if counts['reports'] and not counts['users'] and not User.query.filter_by(role='requester').first():
+        raise ValueError('No hay solicitantes para los reportes: genera usuarios o usa una base que los tenga')
+
+    random.seed(seed)
+    span = days * 86400
+    start = datetime.utcnow() - timedelta(seconds=span)
+    created = dict.fromkeys(DEFAULT_COUNTS, 0)
+
+    def step(name, fn, *args):
+        began = time.perf_counter()
+        result = fn(*args)
+        log(f'   {name}: {time.perf_counter() - began:.1f}s')
+        return result
+
+    admins, technicians, requesters = step('usuarios', generate_users, counts['users'], batch_size, start, span)
+    created['users'] = counts['users']
+    # Reports and orders need someone to point at, even when no users were requested
+    requesters = requesters or [row.id for row in User.query.with_entities(User.id).filter_by(role='requester')]
+    technicians = technicians or [row.id for row in User.query.with_entities(User.id).filter_by(role='technician')]
+    asset_ids = step('activos', generate_assets, counts['assets'], batch_size, start, span)
+    created['assets'] = len(asset_ids)
+
+    if counts['reports'] and asset_ids and requesters:
+        created['reports'], created['work_orders'] = step(
+            'reportes y órdenes', generate_reports, counts['reports'], counts['work_orders'],
+            asset_ids, requesters, technicians, batch_size, start, span
+        )
+
+    subscribers = admins + technicians + requesters
+    if counts['subscriptions'] and subscribers:
+        step('suscripciones push', generate_subscriptions, counts['subscriptions'], subscribers, batch_size)
+        created['subscriptions'] = counts['subscriptions']
+
+    step('carga de técnicos', workload.rebuild)
+    step('acumulados de confiabilidad', rebuild_rollups)
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for name, default in DEFAULT_COUNTS.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=default)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplica todas las cantidades (ej. 0.01)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--days', type=int, default=730, help='Días de historia de los reportes')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    counts = {name: int(getattr(args, name) * args.scale) for name in DEFAULT_COUNTS}
+
+    app = create_app()
+    with app.app_context():
+        print(f' Generando {counts} en {app.config["SQLALCHEMY_DATABASE_URI"]}')
+        try:
+            created = generate(counts, args.seed, args.batch_size, args.days)
+        except ValueError as e:
+            parser.error(str(e))
+
+    print(f'\n Creados: {created}')
+    print(f' Contraseña de los usuarios sintéticos: {PASSWORD}')
+
+
+if __name__ == '__main__':
+    main()
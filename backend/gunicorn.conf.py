@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for running MAFIS with several workers
+    gunicorn -c gunicorn.conf.py run:app
+
+Each gevent worker holds thousands of sockets; workers share emits through
+SOCKETIO_MESSAGE_QUEUE, so set it (e.g. redis://) whenever WEB_CONCURRENCY > 1.
+Clients connect over WebSocket only, so no sticky sessions are needed.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+_async_mode = os.environ.get('SOCKETIO_ASYNC_MODE', 'gevent')
+os.environ['SOCKETIO_ASYNC_MODE'] = _async_mode
+worker_class = {'gevent': 'gevent', 'eventlet': 'eventlet'}.get(_async_mode, 'gthread')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 5000))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))  # only used by gthread
+
+# WebSocket connections are long-lived; don't recycle workers under them
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    if workers > 1 and not os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+        server.log.warning(
+            'WEB_CONCURRENCY > 1 without SOCKETIO_MESSAGE_QUEUE: '
+            'notifications will only reach sockets on the worker that emitted them'
+        )
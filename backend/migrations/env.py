@@ -51,6 +51,20 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Keep autogenerate away from the full-text search index, which migrations manage
+    with raw DDL (app/modules/search/index.py) and the models do not declare:
+    SQLite FTS5 tables and their shadow tables (assets_fts, assets_fts_data, ...)
+    and the MySQL FULLTEXT indexes (ft_*).
+    """
+    if type_ == 'table' and '_fts' in name:
+        return False
+    if type_ == 'index' and name and name.startswith('ft_'):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +79,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +108,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,35 @@
+"""Add open work order counter to users
+
+Revision ID: 0b7e41d9c5a2
+Revises: f4a8d3b6c2e1
+Create Date: 2026-10-18 16:21:07.184392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7e41d9c5a2'
+down_revision = 'f4a8d3b6c2e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('open_work_orders', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_users_technician_load', ['role', 'is_active', 'open_work_orders', 'id'], unique=False)
+
+    # Backfill from the orders already assigned
+    op.execute(
+        "UPDATE users SET open_work_orders = ("
+        "SELECT COUNT(*) FROM work_orders WHERE work_orders.technician_id = users.id "
+        "AND work_orders.status IN ('ABIERTO', 'ASIGNADO', 'EN PROGRESO'))"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_technician_load')
+        batch_op.drop_column('open_work_orders')
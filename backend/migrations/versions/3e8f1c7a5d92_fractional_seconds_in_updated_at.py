@@ -0,0 +1,36 @@
+"""Keep fractional seconds in updated_at on MySQL
+
+Revision ID: 3e8f1c7a5d92
+Revises: 9d3f6a2e8b14
+Create Date: 2026-10-18 18:12:44.517302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8f1c7a5d92'
+down_revision = '9d3f6a2e8b14'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'assets', 'reports', 'work_orders')
+
+
+def upgrade():
+    # SQLite and PostgreSQL already store microseconds; MySQL DATETIME rounds to the second
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=sa.DateTime(),
+                        type_=mysql.DATETIME(fsp=6), existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', existing_type=mysql.DATETIME(fsp=6),
+                        type_=sa.DateTime(), existing_nullable=True)
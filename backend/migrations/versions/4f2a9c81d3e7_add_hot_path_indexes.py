@@ -0,0 +1,62 @@
+"""Add indexes for hot list filters and sorts
+
+Revision ID: 4f2a9c81d3e7
+Revises: bc011173c491
+Create Date: 2026-10-18 10:12:31.482915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c81d3e7'
+down_revision = 'bc011173c491'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.create_index('ix_reports_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reports_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reports_asset_id'), ['asset_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reports_requester_id'), ['requester_id'], unique=False)
+
+    with op.batch_alter_table('work_orders', schema=None) as batch_op:
+        batch_op.create_index('ix_work_orders_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_work_orders_technician_id_status', ['technician_id', 'status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_work_orders_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_work_orders_report_id'), ['report_id'], unique=False)
+
+    with op.batch_alter_table('push_subscriptions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_push_subscriptions_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_role'), ['role'], unique=False)
+
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_assets_type'), ['type'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('assets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_assets_type'))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_role'))
+
+    with op.batch_alter_table('push_subscriptions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_push_subscriptions_user_id'))
+
+    with op.batch_alter_table('work_orders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_work_orders_report_id'))
+        batch_op.drop_index(batch_op.f('ix_work_orders_created_at'))
+        batch_op.drop_index('ix_work_orders_technician_id_status')
+        batch_op.drop_index('ix_work_orders_status_created_at')
+
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reports_requester_id'))
+        batch_op.drop_index(batch_op.f('ix_reports_asset_id'))
+        batch_op.drop_index(batch_op.f('ix_reports_created_at'))
+        batch_op.drop_index('ix_reports_status_created_at')
@@ -0,0 +1,26 @@
+"""Add token version to users
+
+Revision ID: 7c3e5b1a9f20
+Revises: 4f2a9c81d3e7
+Create Date: 2026-10-18 11:04:52.317640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e5b1a9f20'
+down_revision = '4f2a9c81d3e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
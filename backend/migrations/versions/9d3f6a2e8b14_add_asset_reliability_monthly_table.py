@@ -0,0 +1,43 @@
+"""Add monthly asset reliability rollups
+
+Revision ID: 9d3f6a2e8b14
+Revises: 0b7e41d9c5a2
+Create Date: 2026-10-18 16:58:31.402719
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a2e8b14'
+down_revision = '0b7e41d9c5a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('asset_reliability_monthly',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('asset_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('failures', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failure_gaps', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failure_gap_seconds', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('last_failure_at', sa.DateTime(), nullable=True),
+    sa.Column('repairs', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('repair_seconds', sa.BigInteger(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['asset_id'], ['assets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('asset_id', 'month', name='uq_asset_reliability_asset_month')
+    )
+    with op.batch_alter_table('asset_reliability_monthly', schema=None) as batch_op:
+        batch_op.create_index('ix_asset_reliability_month_asset', ['month', 'asset_id'], unique=False)
+    # Existing history is rolled up with `flask analytics rebuild`
+
+
+def downgrade():
+    with op.batch_alter_table('asset_reliability_monthly', schema=None) as batch_op:
+        batch_op.drop_index('ix_asset_reliability_month_asset')
+
+    op.drop_table('asset_reliability_monthly')
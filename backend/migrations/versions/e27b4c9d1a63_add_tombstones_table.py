@@ -0,0 +1,35 @@
+"""Add tombstones table for delta sync
+
+Revision ID: e27b4c9d1a63
+Revises: c5d92e7a41f8
+Create Date: 2026-10-18 15:02:44.118309
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27b4c9d1a63'
+down_revision = 'c5d92e7a41f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_tombstones_deleted_at_entity', ['deleted_at', 'entity'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_tombstones_deleted_at_entity')
+
+    op.drop_table('tombstones')
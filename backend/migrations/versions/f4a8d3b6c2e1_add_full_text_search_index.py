@@ -0,0 +1,85 @@
+"""Add full-text search index over assets and reports
+
+Revision ID: f4a8d3b6c2e1
+Revises: e27b4c9d1a63
+Create Date: 2026-10-18 15:40:19.552870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8d3b6c2e1'
+down_revision = 'e27b4c9d1a63'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+        name, serial_number, location, description,
+        content='assets', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_ai AFTER INSERT ON assets BEGIN
+        INSERT INTO assets_fts(rowid, name, serial_number, location, description)
+        VALUES (new.id, new.name, new.serial_number, new.location, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_ad AFTER DELETE ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, name, serial_number, location, description)
+        VALUES ('delete', old.id, old.name, old.serial_number, old.location, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS assets_fts_au AFTER UPDATE OF name, serial_number, location, description ON assets BEGIN
+        INSERT INTO assets_fts(assets_fts, rowid, name, serial_number, location, description)
+        VALUES ('delete', old.id, old.name, old.serial_number, old.location, old.description);
+        INSERT INTO assets_fts(rowid, name, serial_number, location, description)
+        VALUES (new.id, new.name, new.serial_number, new.location, new.description);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(
+        description,
+        content='reports', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_ai AFTER INSERT ON reports BEGIN
+        INSERT INTO reports_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_ad AFTER DELETE ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reports_fts_au AFTER UPDATE OF description ON reports BEGIN
+        INSERT INTO reports_fts(reports_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO reports_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    "INSERT INTO assets_fts(assets_fts) VALUES ('rebuild')",
+    "INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    'DROP TRIGGER IF EXISTS assets_fts_ai',
+    'DROP TRIGGER IF EXISTS assets_fts_ad',
+    'DROP TRIGGER IF EXISTS assets_fts_au',
+    'DROP TABLE IF EXISTS assets_fts',
+    'DROP TRIGGER IF EXISTS reports_fts_ai',
+    'DROP TRIGGER IF EXISTS reports_fts_ad',
+    'DROP TRIGGER IF EXISTS reports_fts_au',
+    'DROP TABLE IF EXISTS reports_fts',
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_assets_search', 'assets', ['name', 'serial_number', 'location', 'description'], mysql_prefix='FULLTEXT')
+        op.create_index('ft_reports_description', 'reports', ['description'], mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(sa.text(statement))
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_reports_description', table_name='reports')
+        op.drop_index('ft_assets_search', table_name='assets')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(sa.text(statement))
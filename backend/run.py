@@ -4,6 +4,15 @@ from dotenv import load_dotenv
 # Load .env explicitly before creating app
 load_dotenv()
 
+# Cooperative servers must patch the standard library before anything else is imported
+_async_mode = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+if _async_mode == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+elif _async_mode == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
 from app import create_app
 from app.socket_extensions import socketio
 
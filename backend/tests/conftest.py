@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+PASSWORD = 'test-password'
+
+
+@pytest.fixture
+def app():
+    # A fresh in-memory database per test
+    app = create_app('testing', overrides={'JWT_SECRET_KEY': 'test-jwt-secret-key-with-enough-length-for-hs256'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    hasher = app.extensions.get('password_hasher')
+    if hasher:
+        hasher.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _user(email, name, role):
+    user = User(email=email, name=name, role=role)
+    user.set_password(PASSWORD)
+    return user
+
+
+@pytest.fixture
+def users(app):
+    """admin, technician, second technician and requester"""
+    people = {
+        'admin': _user('admin@test.local', 'Admin', 'admin'),
+        'technician': _user('tecnico@test.local', 'Técnico', 'technician'),
+        'technician2': _user('tecnico2@test.local', 'Técnico 2', 'technician'),
+        'requester': _user('solicitante@test.local', 'Solicitante', 'requester'),
+    }
+    db.session.add_all(people.values())
+    db.session.commit()
+    return people
+
+
+@pytest.fixture
+def login(client):
+    """login(user) -> Authorization headers for that user"""
+    def login(user):
+        response = client.post('/api/auth/login', json={'email': user.email, 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return {'Authorization': f'Bearer {response.get_json()["access_token"]}'}
+    return login
+
+
+@pytest.fixture
+def make_orders(users):
+    """make_orders(n) -> n assets, each with one report and one assigned work order"""
+    def make_orders(count, status='ASIGNADO'):
+        orders = []
+        for _ in range(count):
+            asset = Asset(name='Bomba de agua', type='EQUIPO', location='Bloque A')
+            db.session.add(asset)
+            db.session.flush()
+            report = Report(asset_id=asset.id, requester_id=users['requester'].id,
+                            description='La bomba hace ruido', priority='MEDIA')
+            db.session.add(report)
+            db.session.flush()
+            order = WorkOrder(report_id=report.id, technician_id=users['technician'].id, status=status)
+            db.session.add(order)
+            orders.append(order)
+        db.session.commit()
+        return orders
+    return make_orders
+
+
+@pytest.fixture
+def statements(app):
+    """(statement, parameters) run while the test executes; clear() it to start counting"""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield seen
+    event.remove(db.engine, 'before_cursor_execute', record)
@@ -0,0 +1,28 @@
+import io
+import pytest
+
+
+def upload(client, headers, content, filename='activos.csv'):
+    return client.post(
+        '/api/assets/import', headers=headers,
+        data={'file': (io.BytesIO(content), filename)}, content_type='multipart/form-data'
+    )
+
+
+def test_valid_csv_is_imported(client, users, login):
+    response = upload(client, login(users['admin']), b'name,type,location\nBomba 1,EQUIPO,Bodega\n')
+    assert response.status_code == 201
+    assert response.get_json()['inserted'] == 1
+
+
+@pytest.mark.parametrize('content, message', [
+    ('name,type,location\nCompresor,EQUIPO,Sótano\n'.encode('latin-1'), 'UTF-8'),
+    (b'name,type,location\n"' + b'x' * 200000 + b'",EQUIPO,Bodega\n', 'CSV mal formado'),
+])
+def test_unreadable_file_is_a_400_with_a_file_error(client, users, login, content, message):
+    response = upload(client, login(users['admin']), content)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['file_error'] is True
+    assert body['errors'][-1]['row'] is None
+    assert message in body['errors'][-1]['errors'][0]
@@ -0,0 +1,24 @@
+from datetime import datetime
+import bcrypt
+from app.common.passwords import hash_cost
+from app.extensions import db
+from app.modules.users.models import User
+from conftest import PASSWORD
+
+LAST_UPDATE = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_login_rehash_keeps_updated_at(app, client, users):
+    user = users['requester']
+    old_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(5)).decode('utf-8')
+    User.query.filter_by(id=user.id).update({User.password_hash: old_hash, User.updated_at: LAST_UPDATE})
+    db.session.commit()
+    db.session.expire_all()
+
+    response = client.post('/api/auth/login', json={'email': user.email, 'password': PASSWORD})
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    stored = db.session.get(User, user.id)
+    assert hash_cost(stored.password_hash) == app.config['BCRYPT_ROUNDS']
+    assert stored.updated_at == LAST_UPDATE
@@ -0,0 +1,13 @@
+import pytest
+from sqlalchemy.dialects import mysql
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+
+@pytest.mark.parametrize('model', [Asset, Report, User, WorkOrder])
+def test_updated_at_keeps_fractional_seconds_on_mysql(model):
+    # ETags compare max(updated_at); whole seconds would hide a second edit within one second
+    column_type = model.__table__.c.updated_at.type.compile(dialect=mysql.dialect())
+    assert column_type == 'DATETIME(6)'
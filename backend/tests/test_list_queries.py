@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', ['/api/reports/', '/api/work-orders/', '/api/work-orders/?limit=50'])
+def test_list_statement_count_does_not_grow_with_rows(client, users, login, make_orders, statements, path):
+    headers = login(users['admin'])
+
+    def count():
+        statements.clear()
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        return len(statements)
+
+    make_orders(5)
+    client.get(path, headers=headers)  # warm the token cache
+    small = count()
+
+    make_orders(5)
+    assert count() == small
@@ -0,0 +1,30 @@
+import time
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.common import metrics
+from app.extensions import db
+
+
+def test_failed_statement_does_not_skew_the_next_timing(app):
+    sql = metrics.RequestSQL()
+    token = metrics._current_request.set(sql)
+    try:
+        with db.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql('SELECT * FROM missing_table')
+            time.sleep(0.2)
+            conn.exec_driver_sql('SELECT 1')
+    finally:
+        metrics._current_request.reset(token)
+
+    # Only the statement that completed is counted, timed from its own start
+    assert sql.count == 1
+    assert 0 < sql.seconds < 0.2
+
+
+def test_request_sql_is_recorded_per_route(client, users, login):
+    headers = login(users['admin'])
+    client.get('/api/work-orders/workload', headers=headers)
+
+    body = client.get('/api/metrics').get_data(as_text=True)
+    assert 'http_request_sql_statements_count{method="GET",route="/api/work-orders/workload",status="200"} 1' in body
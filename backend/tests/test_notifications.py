@@ -0,0 +1,63 @@
+import json
+from concurrent.futures import Future
+import pytest
+from app.common import email_service
+from app.extensions import db
+from app.modules.notifications import services as notifications
+from app.modules.notifications.models import NotificationOutbox
+from app.modules.users.models import User
+
+
+class FakeSenderPool:
+    """Records every submitted message; recipients in `failing` get an SMTP error"""
+
+    def __init__(self):
+        self.sent = []
+        self.failing = set()
+
+    def submit(self, message):
+        future = Future()
+        recipient = message.recipients[0]
+        if recipient in self.failing:
+            future.set_exception(ConnectionError(f'rejected {recipient}'))
+        else:
+            self.sent.append(recipient)
+            future.set_result(None)
+        return future
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    pool = FakeSenderPool()
+    monkeypatch.setattr(email_service, 'get_sender_pool', lambda app=None: pool)
+    return pool
+
+
+def enqueue_row(event, **payload):
+    notifications.enqueue(event, **payload)
+    db.session.commit()
+    return NotificationOutbox.query.filter_by(event=event).order_by(NotificationOutbox.id.desc()).first()
+
+
+def test_new_report_email_retries_only_failed_admins(users, make_orders, sender):
+    second_admin = User(email='admin2@test.local', name='Admin 2', role='admin', password_hash='x')
+    db.session.add(second_admin)
+    db.session.commit()
+    report = make_orders(1)[0].report
+    sender.failing = {second_admin.email}
+
+    row = enqueue_row('email.new_report', report_id=report.id, requester_id=users['requester'].id)
+    assert notifications.deliver(row.id)
+    assert sender.sent == [users['admin'].email]
+
+    retry = NotificationOutbox.query.filter_by(event='email.new_report_admin').one()
+    assert json.loads(retry.payload)['admin_id'] == second_admin.id
+
+    # The retry row fails on its own, without resending to the admins who got the email
+    assert not notifications.deliver(retry.id)
+    assert db.session.get(NotificationOutbox, retry.id).attempts == 1
+    assert sender.sent == [users['admin'].email]
+
+    sender.failing = set()
+    assert notifications.deliver(retry.id)
+    assert sender.sent == [users['admin'].email, second_admin.email]
@@ -0,0 +1,124 @@
+import io
+import pytest
+from flask import jsonify
+from app.common.decorators import query_budget
+from app.common.query_guard import QueryBudgetExceeded
+from app.extensions import db
+from app.modules.reports.models import Report
+from app.modules.work_orders.models import WorkOrder
+
+# endpoint -> (role, method, path, body); path and body are filled from the dataset ids.
+# The guard raises QueryBudgetExceeded in testing, so a route over budget fails here.
+ROUTES = {
+    'assets.get_assets': ('admin', 'GET', '/api/assets', None),
+    'assets.get_asset': ('admin', 'GET', '/api/assets/{asset}', None),
+    'assets.get_asset_history': ('admin', 'GET', '/api/assets/{asset}/history', None),
+    'assets.import_assets': ('admin', 'POST', '/api/assets/import', 'csv'),
+    'reports.get_reports': ('admin', 'GET', '/api/reports', None),
+    'reports.create_report': ('requester', 'POST', '/api/reports',
+                              {'asset_id': '{asset}', 'description': 'Fuga de aceite', 'priority': 'ALTA'}),
+    'reports.get_report': ('admin', 'GET', '/api/reports/{report}', None),
+    'reports.bulk_update_report_status': ('admin', 'PATCH', '/api/reports/status',
+                                          {'ids': '{reports}', 'status': 'CERRADO'}),
+    'work_orders.get_work_orders': ('admin', 'GET', '/api/work-orders', None),
+    'work_orders.create_work_order': ('admin', 'POST', '/api/work-orders',
+                                      {'report_id': '{free_report}', 'auto_assign': True}),
+    'work_orders.get_work_order': ('admin', 'GET', '/api/work-orders/{order}', None),
+    'work_orders.assign_technician': ('admin', 'PATCH', '/api/work-orders/{order}/assign',
+                                      {'technician_id': '{technician2}'}),
+    'work_orders.update_status': ('technician', 'PATCH', '/api/work-orders/{order}/status',
+                                  {'status': 'COMPLETADO'}),
+    'work_orders.bulk_update_status': ('admin', 'PATCH', '/api/work-orders/status',
+                                       {'ids': '{orders}', 'status': 'EN PROGRESO'}),
+    'work_orders.get_workload': ('admin', 'GET', '/api/work-orders/workload', None),
+    'dashboard.get_summary': ('admin', 'GET', '/api/dashboard/summary', None),
+    'sync.get_changes': ('technician', 'GET', '/api/sync', None),
+    'search.search': ('admin', 'GET', '/api/search?q=bomba', None),
+    'analytics.get_asset_reliability': ('admin', 'GET', '/api/analytics/assets', None),
+}
+
+
+@pytest.fixture
+def dataset(users, make_orders):
+    orders = make_orders(3)
+    free_report = Report(asset_id=orders[0].report.asset_id, requester_id=users['requester'].id,
+                         description='El motor no enciende', priority='BAJA')
+    db.session.add(free_report)
+    db.session.commit()
+    return {
+        'asset': orders[0].report.asset_id,
+        'report': orders[0].report_id,
+        'reports': [order.report_id for order in orders],
+        'free_report': free_report.id,
+        'order': orders[0].id,
+        'orders': [order.id for order in orders],
+        'technician2': users['technician2'].id,
+    }
+
+
+def fill(value, ids):
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    if isinstance(value, str) and value.startswith('{') and value.endswith('}'):
+        return ids[value[1:-1]]
+    return value
+
+
+def test_every_budgeted_route_is_covered(app):
+    budgeted = {name for name, view in app.view_functions.items() if getattr(view, 'query_budget', None)}
+    assert budgeted == set(ROUTES)
+
+
+@pytest.mark.parametrize('endpoint', sorted(ROUTES))
+def test_route_stays_within_its_query_budget(client, users, login, dataset, endpoint):
+    role, method, path, body = ROUTES[endpoint]
+    kwargs = {'headers': login(users[role])}
+    if body == 'csv':
+        kwargs['data'] = {'file': (io.BytesIO(b'name,type,location\nBomba 9,EQUIPO,Bodega\n'), 'activos.csv')}
+    elif body is not None:
+        kwargs['json'] = fill(body, dataset)
+
+    response = client.open(path.format(**dataset), method=method, **kwargs)
+    assert response.status_code < 400, response.get_json()
+
+
+@pytest.fixture
+def probe(app, make_orders):
+    """Test client for throwaway routes that break their budget; one order per allowed repeat, plus one"""
+    make_orders(app.config['QUERY_GUARD_MAX_REPEATS'] + 1)
+    # Fresh identity map, so reading order.report really lazy-loads
+    db.session.expunge_all()
+
+    @app.route('/probe/two-statements')
+    @query_budget(1)
+    def two_statements():
+        return jsonify(orders=WorkOrder.query.count(), reports=Report.query.count())
+
+    def report_descriptions():
+        return jsonify([order.report.description for order in WorkOrder.query.all()])
+
+    @app.route('/probe/lazy-loads')
+    @query_budget()
+    def lazy_loads():
+        return report_descriptions()
+
+    @app.route('/probe/lazy-loads-allowed')
+    @query_budget(allow_repeats=True)
+    def lazy_loads_allowed():
+        return report_descriptions()
+
+    return app.test_client()
+
+
+def test_over_budget_route_raises(probe):
+    with pytest.raises(QueryBudgetExceeded, match='2 statements, budget is 1'):
+        probe.get('/probe/two-statements')
+
+
+def test_lazy_load_loop_raises(probe):
+    with pytest.raises(QueryBudgetExceeded, match='possible N\\+1'):
+        probe.get('/probe/lazy-loads')
+
+
+def test_allow_repeats_lets_a_loop_through(probe):
+    assert probe.get('/probe/lazy-loads-allowed').status_code == 200
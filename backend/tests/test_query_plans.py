@@ -0,0 +1,68 @@
+"""
+EXPLAIN QUERY PLAN over the statements the list endpoints actually run
+A plain 'SCAN <table>' (no index) means the query reads the whole table, which is
+what the hot path indexes exist to avoid.
+"""
+import re
+import pytest
+from app.extensions import db
+from app.modules.push.models import PushSubscription
+from app.modules.push.service import resolve_subscriptions
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def full_scans(statements):
+    connection = db.session.connection()
+    scans = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+            match = FULL_SCAN.match(row[-1])
+            if match:
+                scans.append((match.group(1), statement))
+    return scans
+
+
+@pytest.fixture
+def dataset(users, make_orders):
+    make_orders(3)
+    make_orders(2, status='COMPLETADO')
+    for i, user in enumerate(users.values()):
+        db.session.add(PushSubscription(user_id=user.id, endpoint=f'https://push.test/{i}', p256dh='key', auth='auth'))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('path', [
+    '/api/reports/',
+    '/api/reports/?status=ABIERTO',
+    '/api/work-orders/',
+    '/api/work-orders/?status=ASIGNADO',
+    '/api/work-orders/?limit=20',
+    '/api/users/?role=technician',
+    '/api/assets/?type=EQUIPO',
+    '/api/dashboard/summary',
+])
+def test_list_queries_use_indexes(client, users, login, dataset, statements, path):
+    headers = login(users['admin'])
+    statements.clear()
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert full_scans(statements) == []
+
+
+@pytest.mark.parametrize('role', ['technician', 'requester'])
+def test_scoped_lists_use_indexes(client, users, login, dataset, statements, role):
+    headers = login(users[role])
+    for path in ('/api/reports/', '/api/work-orders/', '/api/dashboard/summary'):
+        statements.clear()
+        assert client.get(path, headers=headers).status_code == 200
+        assert full_scans(statements) == [], path
+
+
+def test_push_subscription_lookup_uses_indexes(users, dataset, statements):
+    statements.clear()
+    resolve_subscriptions(user_ids=[users['technician'].id])
+    resolve_subscriptions(roles=['admin'])
+    assert full_scans(statements) == []
@@ -0,0 +1,70 @@
+import json
+import time
+import pytest
+import socketio
+from app.common.socket_bus import LocalPubSubManager, build_client_manager
+
+CHANNEL = 'test-socketio'
+
+
+class Worker:
+    """
+    One simulated worker process: a Socket.IO server on the shared channel.
+    Flask-SocketIO's test client refuses pub/sub managers, so sockets are registered
+    straight in the manager and outgoing packets are captured per socket.
+    """
+
+    def __init__(self):
+        self.server = socketio.Server(async_mode='threading',
+                                      client_manager=build_client_manager('local://', CHANNEL))
+        self.sent = {}
+        self.server._send_eio_packet = self._capture
+        # What the server does on its first connection: subscribe and start the listener
+        self.server.manager_initialized = True
+        self.server.manager.initialize()
+
+    def _capture(self, eio_sid, eio_pkt):
+        # Socket.IO EVENT packet: '2' followed by the JSON [event, data]
+        self.sent.setdefault(eio_sid, []).append(json.loads(eio_pkt.data[1:]))
+
+    def connect(self, eio_sid, room=None):
+        sid = self.server.manager.connect(eio_sid, '/')
+        if room:
+            self.server.manager.enter_room(sid, '/', room)
+        return eio_sid
+
+    def received(self, eio_sid, timeout=2):
+        """Events sent to one socket, waiting for the listener thread to deliver them"""
+        deadline = time.monotonic() + timeout
+        while not self.sent.get(eio_sid) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.sent.get(eio_sid, [])
+
+
+@pytest.fixture
+def workers():
+    yield Worker(), Worker()
+    LocalPubSubManager.reset()
+
+
+def test_emit_on_one_server_reaches_a_room_on_another(workers):
+    worker_a, worker_b = workers
+    member = worker_b.connect('socket-1', room='user:1')
+    bystander = worker_b.connect('socket-2')
+
+    worker_a.server.emit('notification', {'message': 'Orden asignada'}, to='user:1')
+
+    assert worker_b.received(member) == [['notification', {'message': 'Orden asignada'}]]
+    assert worker_b.received(bystander, timeout=0.2) == []
+
+
+def test_write_only_publisher_reaches_the_servers(workers):
+    worker_a, worker_b = workers
+    admin_a = worker_a.connect('socket-a', room='role:admin')
+    admin_b = worker_b.connect('socket-b', room='role:admin')
+
+    publisher = build_client_manager('local://', CHANNEL, write_only=True)
+    publisher.emit('notification', {'message': 'Nuevo reporte'}, namespace='/', room='role:admin')
+
+    assert worker_a.received(admin_a) == [['notification', {'message': 'Nuevo reporte'}]]
+    assert worker_b.received(admin_b) == [['notification', {'message': 'Nuevo reporte'}]]
@@ -0,0 +1,72 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app.common.auth import _token_versions, build_token_claims, bump_token_version, forget_token_version
+from app.extensions import db
+from app.socket_extensions import notify_role, notify_user, socketio
+
+
+@pytest.fixture
+def connect(app):
+    """connect(user) -> Socket.IO test client authenticated with a fresh token for user"""
+    clients = []
+
+    def connect(user=None, token=None):
+        if user is not None:
+            token = create_access_token(identity=str(user.id), additional_claims=build_token_claims(user))
+        client = socketio.test_client(app, auth={'token': token} if token else None)
+        clients.append(client)
+        return client
+
+    yield connect
+    for client in clients:
+        if client.is_connected():
+            client.disconnect()
+    # Versions are cached per process and user ids repeat across test databases
+    _token_versions.clear()
+
+
+def notifications(client):
+    return [event['args'][0]['message'] for event in client.get_received() if event['name'] == 'notification']
+
+
+def test_connect_without_token_is_refused(connect):
+    assert not connect().is_connected()
+
+
+def test_connect_with_invalid_token_is_refused(connect):
+    assert not connect(token='not-a-jwt').is_connected()
+
+
+def test_connect_with_revoked_token_is_refused(connect, users):
+    user = users['technician']
+    token = create_access_token(identity=str(user.id), additional_claims=build_token_claims(user))
+    bump_token_version(user)
+    db.session.commit()
+    forget_token_version(user.id)
+
+    assert not connect(token=token).is_connected()
+    assert connect(user).is_connected()
+
+
+def test_notify_user_reaches_only_that_user(connect, users):
+    technician = connect(users['technician'])
+    other = connect(users['technician2'])
+    admin = connect(users['admin'])
+
+    notify_user(users['technician'].id, 'Orden asignada')
+
+    assert notifications(technician) == ['Orden asignada']
+    assert notifications(other) == []
+    assert notifications(admin) == []
+
+
+def test_notify_role_reaches_only_that_role(connect, users):
+    admin = connect(users['admin'])
+    technician = connect(users['technician'])
+    requester = connect(users['requester'])
+
+    notify_role('admin', 'Nuevo reporte')
+
+    assert notifications(admin) == ['Nuevo reporte']
+    assert notifications(technician) == []
+    assert notifications(requester) == []
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.modules.assets.models import Asset
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+
+def age_rows(hours=1):
+    """Move every row out of the feed's overlap window"""
+    moment = datetime.utcnow() - timedelta(hours=hours)
+    for model in (Asset, Report, WorkOrder, User):
+        model.query.update({model.updated_at: moment}, synchronize_session=False)
+    db.session.commit()
+
+
+def pull(client, headers, **params):
+    """Follow next_cursor until the feed ends; returns (pages, sync_token)"""
+    pages = []
+    while True:
+        response = client.get('/api/sync/', headers=headers, query_string=params)
+        assert response.status_code == 200, response.get_json()
+        page = response.get_json()
+        pages.append(page)
+        if not page['has_more']:
+            return pages, page['sync_token']
+        assert page['sync_token'] is None
+        params = {'after': page['next_cursor'], 'limit': params.get('limit')}
+
+
+def ids(pages, collection):
+    return [row['id'] for page in pages for row in page[collection]]
+
+
+def test_snapshot_is_paged_without_gaps_or_repeats(client, users, login, make_orders):
+    orders = make_orders(7)
+    # Same updated_at on several rows, so the id tiebreak is exercised
+    same_moment = datetime.utcnow() - timedelta(hours=1)
+    Asset.query.update({Asset.updated_at: same_moment}, synchronize_session=False)
+    db.session.commit()
+
+    pages, token = pull(client, login(users['admin']), limit=3)
+
+    assert len(pages) > 3
+    assert all(len(page['assets']) + len(page['reports']) + len(page['work_orders']) <= 3 for page in pages)
+    assert sorted(ids(pages, 'assets')) == sorted({order.report.asset_id for order in orders})
+    assert len(ids(pages, 'assets')) == 7
+    assert len(ids(pages, 'reports')) == 7
+    assert sorted(ids(pages, 'work_orders')) == sorted(order.id for order in orders)
+    assert pages[0]['reset'] is True and token
+
+
+def test_delta_after_paging_returns_only_new_changes(client, users, login, make_orders):
+    headers = login(users['admin'])
+    make_orders(4)
+    age_rows()
+    _, token = pull(client, headers, limit=2)
+
+    asset = Asset.query.first()
+    asset.location = 'Bloque C'
+    db.session.commit()
+
+    pages, _ = pull(client, headers, since=token, limit=2)
+    assert pages[0]['reset'] is False
+    assert ids(pages, 'assets') == [asset.id]
+    # Its report embeds the asset name, so it changed too
+    assert ids(pages, 'reports') == [report.id for report in Report.query.filter_by(asset_id=asset.id)]
+
+
+def test_invalid_cursor_is_a_400(client, users, login):
+    response = client.get('/api/sync/?after=not-a-cursor', headers=login(users['admin']))
+    assert response.status_code == 400
@@ -0,0 +1,40 @@
+import pytest
+from app.extensions import db
+from app.modules.reports.models import Report
+from app.modules.users.models import User
+from app.modules.work_orders.models import WorkOrder
+
+
+@pytest.fixture
+def report(users, make_orders):
+    asset_id = make_orders(1)[0].report.asset_id
+    report = Report(asset_id=asset_id, requester_id=users['requester'].id,
+                    description='El motor no enciende', priority='BAJA')
+    db.session.add(report)
+    db.session.commit()
+    return report
+
+
+def open_orders(user_id):
+    db.session.expire_all()
+    return db.session.get(User, user_id).open_work_orders
+
+
+def test_explicit_technician_is_assigned_and_counted(client, users, login, report):
+    technician = users['technician2']
+    response = client.post('/api/work-orders', headers=login(users['admin']),
+                           json={'report_id': report.id, 'technician_id': technician.id})
+
+    assert response.status_code == 201
+    assert response.get_json()['status'] == 'ASIGNADO'
+    assert open_orders(technician.id) == 1
+
+
+@pytest.mark.parametrize('assignee', ['requester', 'missing'])
+def test_invalid_technician_is_rejected(client, users, login, report, assignee):
+    technician_id = users[assignee].id if assignee in users else 9999
+    response = client.post('/api/work-orders', headers=login(users['admin']),
+                           json={'report_id': report.id, 'technician_id': technician_id})
+
+    assert response.status_code == 400
+    assert WorkOrder.query.filter_by(report_id=report.id).count() == 0
@@ -0,0 +1,44 @@
+from datetime import datetime
+from app.extensions import db
+from app.modules.analytics.services import asset_reliability, rebuild_rollups
+from app.modules.work_orders.models import WorkOrder
+
+FIRST_COMPLETION = datetime(2026, 1, 5, 8, 0, 0)
+
+
+def complete_first(order):
+    order.completion_date = FIRST_COMPLETION
+    db.session.commit()
+    return order.id
+
+
+def completion_date(order_id):
+    db.session.expire_all()
+    return db.session.get(WorkOrder, order_id).completion_date
+
+
+def test_bulk_completion_keeps_the_date_of_completed_orders(client, users, login, make_orders):
+    done = complete_first(make_orders(1, status='COMPLETADO')[0])
+    open_order = make_orders(1)[0].id
+    # Fixtures insert rows directly; start the rollups from what is stored
+    rebuild_rollups()
+
+    response = client.patch('/api/work-orders/status', headers=login(users['admin']),
+                            json={'ids': [done, open_order], 'status': 'COMPLETADO'})
+    assert response.status_code == 200
+
+    assert completion_date(done) == FIRST_COMPLETION
+    assert completion_date(open_order) is not None
+    # The incremental rollup agrees with one rebuilt from the stored dates
+    incremental = asset_reliability()
+    rebuild_rollups()
+    assert asset_reliability() == incremental
+
+
+def test_completing_again_keeps_the_completion_date(client, users, login, make_orders):
+    done = complete_first(make_orders(1, status='COMPLETADO')[0])
+
+    response = client.patch(f'/api/work-orders/{done}/status', headers=login(users['technician']),
+                            json={'status': 'COMPLETADO'})
+    assert response.status_code == 200
+    assert completion_date(done) == FIRST_COMPLETION
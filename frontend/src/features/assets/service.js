@@ -24,3 +24,26 @@ export const deleteAsset = async (id) => {
   const response = await api.delete(`/assets/${id}`);
   return response.data;
 };
+
+export const importAssets = async (file, { dryRun = false } = {}) => {
+  const formData = new FormData();
+  formData.append('file', file);
+  const response = await api.post('/assets/import', formData, {
+    params: dryRun ? { dry_run: 1 } : undefined,
+    headers: { 'Content-Type': 'multipart/form-data' }
+  });
+  return response.data;
+};
+
+export const exportAssets = async (format = 'csv') => {
+  const response = await api.get('/assets/export', { params: { format }, responseType: 'blob' });
+  return response.data;
+};
+
+// One page of the asset's reports and work orders, newest first; pass next_cursor as after
+export const getAssetHistory = async (id, { after = null, limit = 20 } = {}) => {
+  const params = { limit };
+  if (after) params.after = after;
+  const response = await api.get(`/assets/${id}/history`, { params });
+  return response.data;
+};
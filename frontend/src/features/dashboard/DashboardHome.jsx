@@ -9,9 +9,7 @@ import {
   CubeIcon
 } from '@heroicons/react/24/outline';
 import useAuthStore from '../auth/store';
-import { getReports } from '../reports/service';
-import { getWorkOrders } from '../work_orders/service';
-import { getAssets } from '../assets/service';
+import { getDashboardSummary } from './service';
 import toast from 'react-hot-toast';
 import ReportsStatusChart from './charts/ReportsStatusChart';
 import WorkOrdersPieChart from './charts/WorkOrdersPieChart';
@@ -29,8 +27,8 @@ export default function DashboardHome() {
   });
   const [recentReports, setRecentReports] = useState([]);
   const [myRecentOrders, setMyRecentOrders] = useState([]);
-  const [reports, setReports] = useState([]);
-  const [orders, setOrders] = useState([]);
+  const [reportsByStatus, setReportsByStatus] = useState({});
+  const [ordersByStatus, setOrdersByStatus] = useState({});
   const [isLoading, setIsLoading] = useState(true);
 
   useEffect(() => {
@@ -39,41 +37,26 @@ export default function DashboardHome() {
 
   const loadDashboardData = async () => {
     try {
-      // Load data based on role
-      const [reportsData, ordersData, assetsData] = await Promise.all([
-        getReports().catch(() => []),
-        getWorkOrders().catch(() => []),
-        getAssets().catch(() => [])
-      ]);
+      // Counts and recent items come pre-aggregated and already scoped to the user's role
+      const summary = await getDashboardSummary();
 
-      // Filter data based on role
-      let filteredReports = reportsData;
-      if (user?.role === 'requester') {
-        // Requesters only see their own reports
-        filteredReports = reportsData.filter(r => r.requester_id === user.id);
-      }
+      setReportsByStatus(summary.reports.by_status);
+      setOrdersByStatus(summary.work_orders.by_status);
 
-      // Store full arrays for charts (admin/technician) or filtered (requester)
-      setReports(filteredReports);
-      setOrders(ordersData);
-
-      // Calculate stats
-      const openReports = filteredReports.filter(r => r.status === 'ABIERTO');
-      const myOrders = ordersData.filter(o => o.technician_id === user?.id);
-      const inProgressOrders = ordersData.filter(o => o.status === 'EN PROGRESO');
+      const myOrders = summary.technicians.find(t => t.id === user?.id);
 
       setStats({
-        totalReports: filteredReports.length,
-        openReports: openReports.length,
-        totalOrders: ordersData.length,
-        myOrders: myOrders.length,
-        totalAssets: assetsData.length,
-        inProgressOrders: inProgressOrders.length
+        totalReports: summary.reports.total,
+        openReports: summary.reports.by_status['ABIERTO'] || 0,
+        totalOrders: summary.work_orders.total,
+        myOrders: myOrders ? myOrders.open_orders : 0,
+        totalAssets: summary.assets.total,
+        inProgressOrders: summary.work_orders.by_status['EN PROGRESO'] || 0
       });
 
       // Recent data
-      setRecentReports(filteredReports.slice(0, 5));
-      setMyRecentOrders(myOrders.slice(0, 5));
+      setRecentReports(summary.recent_reports);
+      setMyRecentOrders(summary.recent_work_orders);
     } catch (error) {
       toast.error('Error al cargar datos del dashboard');
     } finally {
@@ -90,15 +73,15 @@ export default function DashboardHome() {
     // Prepare chart data
     const reportsChartData = {
       open: stats.openReports,
-      inProgress: reports.filter(r => r.status === 'EN PROGRESO').length,
-      resolved: reports.filter(r => r.status === 'RESUELTO').length,
-      closed: reports.filter(r => r.status === 'CERRADO').length
+      inProgress: reportsByStatus['EN PROGRESO'] || 0,
+      resolved: reportsByStatus['RESUELTO'] || 0,
+      closed: reportsByStatus['CERRADO'] || 0
     };
 
     const ordersChartData = {
-      assigned: orders.filter(o => o.status === 'ASIGNADO').length,
+      assigned: ordersByStatus['ASIGNADO'] || 0,
       inProgress: stats.inProgressOrders,
-      completed: orders.filter(o => o.status === 'COMPLETADO').length
+      completed: ordersByStatus['COMPLETADO'] || 0
     };
 
     // Mock trends data (in real app, calculate from historical data)
@@ -108,7 +91,7 @@ export default function DashboardHome() {
       { month: 'Mar', reports: 18, orders: 14 },
       { month: 'Abr', reports: 14, orders: 12 },
       { month: 'May', reports: 20, orders: 16 },
-      { month: 'Jun', reports: reports.length, orders: orders.length }
+      { month: 'Jun', reports: stats.totalReports, orders: stats.totalOrders }
     ];
 
     return (
@@ -234,7 +217,7 @@ export default function DashboardHome() {
               <div>
                 <div className="stat-label">Mis Órdenes Pendientes</div>
                 <div className="stat-value text-warning">
-                  {myRecentOrders.filter(o => o.status === 'ASIGNADO').length}
+                  {ordersByStatus['ASIGNADO'] || 0}
                 </div>
               </div>
               <div style={{ backgroundColor: '#fef3c7', padding: '12px', borderRadius: '50%' }}>
@@ -247,7 +230,7 @@ export default function DashboardHome() {
               <div>
                 <div className="stat-label">En Progreso</div>
                 <div className="stat-value text-primary">
-                  {myRecentOrders.filter(o => o.status === 'EN PROGRESO').length}
+                  {ordersByStatus['EN PROGRESO'] || 0}
                 </div>
               </div>
               <div style={{ backgroundColor: '#dbeafe', padding: '12px', borderRadius: '50%' }}>
@@ -260,7 +243,7 @@ export default function DashboardHome() {
               <div>
                 <div className="stat-label">Completadas Hoy</div>
                 <div className="stat-value text-success">
-                  {myRecentOrders.filter(o => o.status === 'COMPLETADO').length}
+                  {ordersByStatus['COMPLETADO'] || 0}
                 </div>
               </div>
               <div style={{ backgroundColor: '#dcfce7', padding: '12px', borderRadius: '50%' }}>
@@ -0,0 +1,12 @@
+import api from '../../lib/axios';
+
+export const getDashboardSummary = async () => {
+  const response = await api.get('/dashboard/summary');
+  return response.data;
+};
+
+// MTTR/MTBF per asset; from/to are 'YYYY-MM', assetId adds the monthly series
+export const getAssetReliability = async ({ from, to, assetId, limit } = {}) => {
+  const response = await api.get('/analytics/assets', { params: { from, to, asset_id: assetId, limit } });
+  return response.data;
+};
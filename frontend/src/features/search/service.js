@@ -0,0 +1,7 @@
+import api from '../../lib/axios';
+
+// Ranked matches over assets and reports; pass next_offset back as offset for the next page
+export const search = async (q, { type, limit, offset } = {}) => {
+  const response = await api.get('/search', { params: { q, type, limit, offset } });
+  return response.data;
+};
@@ -0,0 +1,22 @@
+import api from '../../lib/axios';
+
+const SYNC_TOKEN_KEY = 'syncToken';
+
+// One page of changes since the last stored token; a response with reset=true is a full snapshot.
+// While has_more is true, ask again with the page's next_cursor as after; only the last page has sync_token
+export const getChanges = async ({ after = null, limit } = {}) => {
+  const since = localStorage.getItem(SYNC_TOKEN_KEY);
+  const params = after ? { after } : since ? { since } : {};
+  if (limit) params.limit = limit;
+  const response = await api.get('/sync', { params });
+  return response.data;
+};
+
+// Store the token only after the client has applied the changes it came with
+export const commitSyncToken = (token) => {
+  localStorage.setItem(SYNC_TOKEN_KEY, token);
+};
+
+export const resetSync = () => {
+  localStorage.removeItem(SYNC_TOKEN_KEY);
+};
@@ -21,3 +21,16 @@ export const updateWorkOrderStatus = async (id, status) => {
   const response = await api.patch(`/work-orders/${id}/status`, { status });
   return response.data;
 };
+
+export const getWorkOrdersPage = async ({ status = null, after = null, limit = 50 } = {}) => {
+  const params = { limit };
+  if (status) params.status = status;
+  if (after) params.after = after;
+  const response = await api.get('/work-orders', { params });
+  return response.data;
+};
+
+export const getTechnicianWorkload = async () => {
+  const response = await api.get('/work-orders/workload');
+  return response.data;
+};
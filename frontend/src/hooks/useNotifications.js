@@ -13,9 +13,12 @@ export const useNotifications = () => {
   useEffect(() => {
     if (!user) return;
 
+    // The server authenticates the token and only routes this user's notifications here
     const socket = io(SOCKET_URL, {
-      transports: ['polling', 'websocket'],
-      withCredentials: true
+      // WebSocket only: with several server workers polling would need sticky sessions
+      transports: ['websocket'],
+      withCredentials: true,
+      auth: { token: localStorage.getItem('token') }
     });
 
     socket.on('connect', () => {
@@ -23,7 +26,7 @@ export const useNotifications = () => {
     });
 
     socket.on('notification', (data) => {
-      // Only show if it's for me or broadcast
+      // Server-side rooms already scope delivery; keep the guard for role broadcasts
       if (data.userId === user.id || !data.userId) {
         // Add to store
         addNotification({